@@ -1,7 +1,13 @@
 """Gridfinity tasks collection for gridfinity-invoke project."""
 
+import multiprocessing
+import os
 import sys
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, redirect_stdout
+from multiprocessing.process import BaseProcess
 from pathlib import Path
+from typing import Any, BinaryIO
 
 from invoke import Collection, task
 from invoke.context import Context
@@ -14,6 +20,9 @@ from invoke_collections.helpers import (
     prompt_with_default,
 )
 
+# --output value that streams files to stdout instead of writing them
+STDOUT_OUTPUT = "-"
+
 
 @task
 def bin(
@@ -22,55 +31,114 @@ def bin(
     width: int = 2,
     height: int = 3,
     output: str = "output/bin.stl",
+    tolerance: float = 0.0,
+    formats: str = "stl",
+    project: str = "",
+    defer: bool = False,
 ) -> None:
-    """{"desc": "Generate a Gridfinity bin and export to STL", "params": [{"name": "length", "type": "int", "desc": "Length in gridfinity units (1 unit = 42mm)", "example": "2"}, {"name": "width", "type": "int", "desc": "Width in gridfinity units", "example": "2"}, {"name": "height", "type": "int", "desc": "Height in gridfinity units (1 unit = 7mm)", "example": "3"}, {"name": "output", "type": "string", "desc": "Output path for the STL file", "example": "output/bin.stl"}], "returns": {}}"""  # noqa: E501
-    from gridfinity_invoke.generators import generate_bin
+    """{"desc": "Generate a Gridfinity bin and export to STL", "params": [{"name": "length", "type": "int", "desc": "Length in gridfinity units (1 unit = 42mm)", "example": "2"}, {"name": "width", "type": "int", "desc": "Width in gridfinity units", "example": "2"}, {"name": "height", "type": "int", "desc": "Height in gridfinity units (1 unit = 7mm)", "example": "3"}, {"name": "output", "type": "string", "desc": "Output path for the STL file, or - to stream it to stdout", "example": "output/bin.stl"}, {"name": "tolerance", "type": "float", "desc": "Tessellation tolerance relative to edge size (default: 0.001); re-exports reuse the cached render", "example": "0.01"}, {"name": "formats", "type": "string", "desc": "Comma-separated export formats: stl, step, 3mf, brep (rendered once)", "example": "stl,step,3mf"}, {"name": "project", "type": "string", "desc": "Project to add the component to (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "defer", "type": "bool", "desc": "Only add the component to the project; render it later with gf.render, gf.load or gf.export-archive", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.generators import (
+        STL_TOLERANCE,
+        generate_bin,
+        parse_formats,
+        prerender_bin,
+        render_bin_bytes,
+    )
+    from gridfinity_invoke.manifest import record_component
     from gridfinity_invoke.projects import (
         add_component_to_config,
-        get_active_project,
         get_project_path,
     )
 
+    if output == STDOUT_OUTPUT:
+        _stream_part(
+            f"{length}x{width}x{height} Gridfinity bin",
+            lambda fmt, tol: render_bin_bytes(length, width, height, fmt, tol),
+            tolerance,
+            formats,
+        )
+        return
+
     print_header(f"Generating {length}x{width}x{height} Gridfinity bin...")
 
     if length < 1 or width < 1 or height < 1:
         print_error("All dimensions must be positive integers >= 1")
         sys.exit(1)
 
+    if tolerance < 0:
+        print_error("Tolerance must be positive")
+        sys.exit(1)
+
+    try:
+        format_list = parse_formats(formats)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+
     # Check for active project
-    active_project = get_active_project()
+    active_project = _resolve_project(project)
 
     if active_project:
         # Project-aware behavior: prompt for name and save to project
         default_name = f"bin-{length}x{width}x{height}"
+        renders = _render_ahead(
+            [] if defer else [("bin", prerender_bin, (length, width, height))]
+        )
         component_name = prompt_with_default("Name", default_name)
+        _finish_renders(renders)
 
         # Save to project directory
         project_path = get_project_path(active_project)
         output_path = project_path / f"{component_name}.stl"
 
+        component = {
+            "name": component_name,
+            "type": "bin",
+            "length": length,
+            "width": width,
+            "height": height,
+        }
+        if tolerance:
+            component["tolerance"] = tolerance
+        if format_list != ["stl"]:
+            component["formats"] = format_list
+
+        if defer:
+            # Record the component now and render it when it's needed
+            add_component_to_config(active_project, component)
+            print_success(f"Deferred {component_name} in project: {active_project}")
+            print("  Run gf.render to render deferred components")
+            return
+
         try:
-            result_path = generate_bin(length, width, height, output_path)
-            print_success(f"Generated: {result_path}")
+            result_path = generate_bin(
+                length,
+                width,
+                height,
+                output_path,
+                tolerance or STL_TOLERANCE,
+                format_list,
+            )
+            _print_generated(result_path, format_list)
 
             # Add component to config
-            component = {
-                "name": component_name,
-                "type": "bin",
-                "length": length,
-                "width": width,
-                "height": height,
-            }
             add_component_to_config(active_project, component)
+            record_component(active_project, component)
             print_success(f"Added to project: {active_project}")
         except Exception as e:
             print_error(f"Generation failed: {e}")
             sys.exit(1)
     else:
+        if defer:
+            print_error("--defer needs a project - pass --project")
+            sys.exit(1)
+
         # Default behavior: save to output directory
         try:
-            result_path = generate_bin(length, width, height, output)
-            print_success(f"Generated: {result_path}")
+            result_path = generate_bin(
+                length, width, height, output, tolerance or STL_TOLERANCE, format_list
+            )
+            _print_generated(result_path, format_list)
         except Exception as e:
             print_error(f"Generation failed: {e}")
             sys.exit(1)
@@ -82,79 +150,315 @@ def baseplate(
     length: int = 4,
     width: int = 4,
     output: str = "output/baseplate.stl",
+    tolerance: float = 0.0,
+    formats: str = "stl",
+    project: str = "",
+    defer: bool = False,
 ) -> None:
-    """{"desc": "Generate a Gridfinity baseplate and export to STL", "params": [{"name": "length", "type": "int", "desc": "Length in gridfinity units (1 unit = 42mm)", "example": "4"}, {"name": "width", "type": "int", "desc": "Width in gridfinity units", "example": "4"}, {"name": "output", "type": "string", "desc": "Output path for the STL file", "example": "output/baseplate.stl"}], "returns": {}}"""  # noqa: E501
-    from gridfinity_invoke.generators import generate_baseplate
+    """{"desc": "Generate a Gridfinity baseplate and export to STL", "params": [{"name": "length", "type": "int", "desc": "Length in gridfinity units (1 unit = 42mm)", "example": "4"}, {"name": "width", "type": "int", "desc": "Width in gridfinity units", "example": "4"}, {"name": "output", "type": "string", "desc": "Output path for the STL file, or - to stream it to stdout", "example": "output/baseplate.stl"}, {"name": "tolerance", "type": "float", "desc": "Tessellation tolerance relative to edge size (default: 0.001); re-exports reuse the cached render", "example": "0.01"}, {"name": "formats", "type": "string", "desc": "Comma-separated export formats: stl, step, 3mf, brep (rendered once)", "example": "stl,step,3mf"}, {"name": "project", "type": "string", "desc": "Project to add the component to (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "defer", "type": "bool", "desc": "Only add the component to the project; render it later with gf.render, gf.load or gf.export-archive", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.generators import (
+        STL_TOLERANCE,
+        generate_baseplate,
+        parse_formats,
+        prerender_baseplate,
+        render_baseplate_bytes,
+    )
+    from gridfinity_invoke.manifest import record_component
     from gridfinity_invoke.projects import (
         add_component_to_config,
-        get_active_project,
         get_project_path,
     )
 
+    if output == STDOUT_OUTPUT:
+        _stream_part(
+            f"{length}x{width} Gridfinity baseplate",
+            lambda fmt, tol: render_baseplate_bytes(length, width, fmt, tol),
+            tolerance,
+            formats,
+        )
+        return
+
     print_header(f"Generating {length}x{width} Gridfinity baseplate...")
 
     if length < 1 or width < 1:
         print_error("All dimensions must be positive integers >= 1")
         sys.exit(1)
 
+    if tolerance < 0:
+        print_error("Tolerance must be positive")
+        sys.exit(1)
+
+    try:
+        format_list = parse_formats(formats)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+
     # Check for active project
-    active_project = get_active_project()
+    active_project = _resolve_project(project)
 
     if active_project:
         # Project-aware behavior: prompt for name and save to project
         default_name = f"baseplate-{length}x{width}"
+        renders = _render_ahead(
+            [] if defer else [("baseplate", prerender_baseplate, (length, width))]
+        )
         component_name = prompt_with_default("Name", default_name)
+        _finish_renders(renders)
 
         # Save to project directory
         project_path = get_project_path(active_project)
         output_path = project_path / f"{component_name}.stl"
 
+        component = {
+            "name": component_name,
+            "type": "baseplate",
+            "length": length,
+            "width": width,
+        }
+        if tolerance:
+            component["tolerance"] = tolerance
+        if format_list != ["stl"]:
+            component["formats"] = format_list
+
+        if defer:
+            # Record the component now and render it when it's needed
+            add_component_to_config(active_project, component)
+            print_success(f"Deferred {component_name} in project: {active_project}")
+            print("  Run gf.render to render deferred components")
+            return
+
         try:
-            result_path = generate_baseplate(length, width, output_path)
-            print_success(f"Generated: {result_path}")
+            result_path = generate_baseplate(
+                length, width, output_path, tolerance or STL_TOLERANCE, format_list
+            )
+            _print_generated(result_path, format_list)
 
             # Add component to config
-            component = {
-                "name": component_name,
-                "type": "baseplate",
-                "length": length,
-                "width": width,
-            }
             add_component_to_config(active_project, component)
+            record_component(active_project, component)
             print_success(f"Added to project: {active_project}")
         except Exception as e:
             print_error(f"Generation failed: {e}")
             sys.exit(1)
     else:
+        if defer:
+            print_error("--defer needs a project - pass --project")
+            sys.exit(1)
+
         # Default behavior: save to output directory
         try:
-            result_path = generate_baseplate(length, width, output)
-            print_success(f"Generated: {result_path}")
+            result_path = generate_baseplate(
+                length, width, output, tolerance or STL_TOLERANCE, format_list
+            )
+            _print_generated(result_path, format_list)
+        except Exception as e:
+            print_error(f"Generation failed: {e}")
+            sys.exit(1)
+
+
+def _resolve_project(project: str) -> str | None:
+    """Resolve the project a task works on, exiting if it does not exist.
+
+    Args:
+        project: Project requested with --project, or empty to fall back to
+            GF_PROJECT and then the active project file
+
+    Returns:
+        Project name, or None if no project is active
+    """
+    from gridfinity_invoke.projects import get_active_project, get_project_path
+
+    active_project = get_active_project(project)
+    if (
+        active_project
+        and not (get_project_path(active_project) / "config.json").exists()
+    ):
+        print_error(f"Project '{active_project}' does not exist!")
+        sys.exit(1)
+    return active_project
+
+
+def _render_ahead(
+    renders: Iterable[tuple[str, Callable[..., None], tuple[Any, ...]]],
+) -> list[tuple[str, BaseProcess]]:
+    """Start rendering solids into the BREP cache while prompts wait.
+
+    The geometry never depends on the answers (a name, whether to split), so
+    rendering starts as soon as the dimensions are valid and generation
+    afterwards loads the solids from the cache. Each render gets its own
+    process, so variants the answers rule out can be stopped.
+
+    Args:
+        renders: (group, render function, arguments) for each solid; see
+            _finish_renders for groups
+
+    Returns:
+        Started (group, process) pairs, for _finish_renders
+    """
+    context = multiprocessing.get_context()
+    started: list[tuple[str, BaseProcess]] = []
+    for group, render, args in renders:
+        # Daemons, so an aborted task never waits for a render
+        process = context.Process(
+            target=_render_quietly, args=(render, *args), daemon=True
+        )
+        process.start()
+        started.append((group, process))
+    return started
+
+
+def _finish_renders(
+    renders: list[tuple[str, BaseProcess]], wanted: Iterable[str] | None = None
+) -> None:
+    """Wait for the renders still needed and stop the rest.
+
+    Args:
+        renders: Processes from _render_ahead
+        wanted: Groups whose solids will be generated (default: all)
+    """
+    from gridfinity_invoke.atomic import remove_temp_files
+    from gridfinity_invoke.workspace import current_workspace
+
+    wanted = None if wanted is None else set(wanted)
+    for group, process in renders:
+        if wanted is not None and group not in wanted:
+            process.terminate()
+            process.join()
+            # A render stopped while saving leaves its temporary file behind
+            if process.pid is not None:
+                remove_temp_files(current_workspace().brep_cache_dir, process.pid)
+        process.join()
+
+
+def _render_quietly(render: Callable[..., None], *args: object) -> None:
+    """Run a background render, leaving any error for generation to report."""
+    try:
+        render(*args)
+    except Exception:
+        pass
+
+
+def _print_generated(path: Path, formats: list[str]) -> None:
+    """Print each file written for the requested export formats."""
+    for fmt in formats:
+        print_success(f"Generated: {path.with_suffix(f'.{fmt}')}")
+
+
+@contextmanager
+def _messages_to_stderr() -> Iterator[BinaryIO]:
+    """Send task messages to stderr, yielding the binary stdout for file data."""
+    stdout = sys.stdout.buffer
+    with redirect_stdout(sys.stderr):
+        yield stdout
+    stdout.flush()
+
+
+def _stream_part(
+    description: str,
+    render: Callable[[str, float], memoryview],
+    tolerance: float,
+    formats: str,
+) -> None:
+    """Render a single part and write it to stdout, bypassing any project.
+
+    Args:
+        description: Part description for status messages
+        render: Renders the part given a format and tessellation tolerance
+        tolerance: Tessellation tolerance from the task (0 for the default)
+        formats: Formats from the task; exactly one is allowed
+    """
+    from gridfinity_invoke.generators import STL_TOLERANCE, parse_formats
+
+    with _messages_to_stderr() as stdout:
+        print_header(f"Streaming {description} to stdout...")
+
+        if tolerance < 0:
+            print_error("Tolerance must be positive")
+            sys.exit(1)
+
+        try:
+            format_list = parse_formats(formats)
+        except ValueError as e:
+            print_error(str(e))
+            sys.exit(1)
+        if len(format_list) != 1:
+            print_error("Streaming to stdout supports a single format")
+            sys.exit(1)
+
+        try:
+            buffer = render(format_list[0], tolerance or STL_TOLERANCE)
+        except ValueError as e:
+            print_error(str(e))
+            sys.exit(1)
         except Exception as e:
             print_error(f"Generation failed: {e}")
             sys.exit(1)
 
+        stdout.write(buffer)
+        print_success(f"Streamed {len(buffer)} bytes of {format_list[0].upper()}")
+
 
 @task(name="drawer-fit")
 def drawer_fit(
     ctx: Context,
-    width: float,
-    depth: float,
+    width: float = 0.0,
+    depth: float = 0.0,
     output: str = "output/drawer-fit",
+    preview: bool = False,
+    outline: str = "",
+    rects: str = "",
+    formats: str = "stl",
+    project: str = "",
+    defer: bool = False,
 ) -> None:
-    """{"desc": "Generate a complete drawer-fit solution from drawer dimensions", "params": [{"name": "width", "type": "float", "desc": "Drawer width (X dimension) in millimeters", "example": "500"}, {"name": "depth", "type": "float", "desc": "Drawer depth (Y dimension) in millimeters", "example": "400"}, {"name": "output", "type": "string", "desc": "Output path prefix for STL files", "example": "output/drawer-fit"}], "returns": {}}"""  # noqa: E501
+    """{"desc": "Generate a complete drawer-fit solution from drawer dimensions", "params": [{"name": "width", "type": "float", "desc": "Drawer width (X dimension) in millimeters", "example": "500"}, {"name": "depth", "type": "float", "desc": "Drawer depth (Y dimension) in millimeters", "example": "400"}, {"name": "output", "type": "string", "desc": "Output path prefix for STL files, or - to stream the pieces to stdout as a tar archive", "example": "output/drawer-fit"}, {"name": "preview", "type": "bool", "desc": "Also write an assembly preview STL of all pieces in place", "example": "true"}, {"name": "outline", "type": "string", "desc": "Polygon drawer outline as X,Y points in mm, instead of width/depth", "example": "0,0;500,0;500,200;300,200;300,400;0,400"}, {"name": "rects", "type": "string", "desc": "Drawer as X,Y,WIDTH,DEPTH rectangles in mm, instead of width/depth", "example": "0,0,500,200;0,200,300,200"}, {"name": "formats", "type": "string", "desc": "Comma-separated export formats: stl, step, 3mf, brep (not with outline/rects)", "example": "stl,step"}, {"name": "project", "type": "string", "desc": "Project to add the component to (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "defer", "type": "bool", "desc": "Only add the component to the project (width/depth drawers); render it later with gf.render, gf.load or gf.export-archive", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.generators import parse_formats
+
+    try:
+        format_list = parse_formats(formats)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    if outline or rects:
+        if format_list != ["stl"]:
+            print_error("--formats is only supported for width/depth drawers")
+            sys.exit(1)
+        if output == STDOUT_OUTPUT:
+            print_error("--output - is only supported for width/depth drawers")
+            sys.exit(1)
+        if defer:
+            print_error("--defer is only supported for width/depth drawers")
+            sys.exit(1)
+        _drawer_fit_outline(outline, rects, output, preview, project)
+        return
+
+    if output == STDOUT_OUTPUT:
+        if preview:
+            print_error("--preview is not supported with --output -")
+            sys.exit(1)
+        _drawer_fit_stream(float(width), float(depth), format_list)
+        return
+
+    # The assembly preview is built from the STL pieces, so write those first
+    if preview:
+        format_list = ["stl"] + [fmt for fmt in format_list if fmt != "stl"]
+
     from gridfinity_invoke.config import ensure_printer_config
     from gridfinity_invoke.generators import (
-        GRIDFINITY_UNIT_MM,
-        MIN_SPACER_GAP_MM,
         calculate_baseplate_splits,
+        generate_drawer_assembly,
         generate_drawer_fit,
-        generate_split_baseplates,
+        generate_split_drawer_fit,
         get_max_units,
+        prerender_baseplate,
+        prerender_spacers,
     )
+    from gridfinity_invoke.manifest import record_component
+    from gridfinity_invoke.planning import GRIDFINITY_UNIT_MM, MIN_SPACER_GAP_MM
     from gridfinity_invoke.projects import (
         add_component_to_config,
-        get_active_project,
         get_project_path,
     )
 
@@ -198,6 +502,20 @@ def drawer_fit(
     needs_split = units_width > max_units_x or units_depth > max_units_y
     should_split = False
 
+    # Check for active project
+    active_project = _resolve_project(project)
+
+    # Render every variant the prompts below can choose while they wait
+    variants: list[tuple[str, Callable[..., None], tuple[Any, ...]]] = []
+    if not defer and (needs_split or active_project):
+        variants.append(("spacers", prerender_spacers, (width, depth)))
+        if needs_split:
+            pieces = calculate_baseplate_splits(units_width, units_depth)
+            for size in dict.fromkeys(pieces):
+                variants.append(("pieces", prerender_baseplate, size))
+        variants.append(("whole", prerender_baseplate, (units_width, units_depth)))
+    renders = _render_ahead(variants)
+
     # Print bed constraint warnings and interactive splitting prompt
     if needs_split:
         from gridfinity_invoke.config import get_print_bed_dimensions
@@ -229,9 +547,6 @@ def drawer_fit(
 
         print()
 
-    # Check for active project
-    active_project = get_active_project()
-
     if active_project:
         # Project-aware behavior: prompt for name and save to project
         default_name = f"drawer-fit-{int(width)}x{int(depth)}mm"
@@ -239,288 +554,295 @@ def drawer_fit(
 
         # Save to project directory
         project_path = get_project_path(active_project)
+        piece_dir = project_path
+        piece_base_name = f"{component_name}-baseplate"
+        baseplate_path = project_path / f"{component_name}-baseplate.stl"
+        spacer_path = project_path / f"{component_name}-spacers.stl"
+        assembly_path = project_path / f"{component_name}-assembly.stl"
+    else:
+        # Default behavior: save to output directory
+        output_path = Path(output)
+        piece_dir = output_path.parent
+        piece_base_name = "baseplate"
+        baseplate_path = output_path.parent / f"{output_path.name}-baseplate.stl"
+        spacer_path = output_path.parent / f"{output_path.name}-spacers.stl"
+        assembly_path = output_path.parent / f"{output_path.name}-assembly.stl"
 
-        try:
-            if should_split:
-                # Generate split baseplates
-                print_header("Generating split baseplates...")
-                splits = calculate_baseplate_splits(units_width, units_depth)
-                baseplate_paths = generate_split_baseplates(
-                    splits, project_path, f"{component_name}-baseplate"
+    _finish_renders(renders, ["spacers", "pieces" if should_split else "whole"])
+
+    if defer:
+        if not active_project:
+            print_error("--defer needs a project - pass --project")
+            sys.exit(1)
+
+        # Record the component now and render it when it's needed
+        component = {
+            "name": component_name,
+            "type": "drawer-fit",
+            "width_mm": width,
+            "depth_mm": depth,
+            "units_width": units_width,
+            "units_depth": units_depth,
+        }
+        if should_split:
+            component["split_count"] = len(
+                calculate_baseplate_splits(units_width, units_depth)
+            )
+        if format_list != ["stl"]:
+            component["formats"] = format_list
+        add_component_to_config(active_project, component)
+        print_success(f"Deferred {component_name} in project: {active_project}")
+        print("  Run gf.render to render deferred components")
+        return
+
+    try:
+        if should_split:
+            # Generate split baseplates
+            print_header("Generating split baseplates...")
+            result, baseplate_paths = generate_split_drawer_fit(
+                width, depth, piece_dir, piece_base_name, spacer_path, format_list
+            )
+            splits = calculate_baseplate_splits(units_width, units_depth)
+
+            # Display generated pieces
+            for path, (split_w, split_d) in zip(baseplate_paths, splits):
+                print_success(f"  Generated {path.name} ({split_w}x{split_d} units)")
+        else:
+            # Generate single baseplate (original behavior)
+            if needs_split:
+                print_warning("Proceeding with single oversized baseplate...")
+                print()
+
+            result = generate_drawer_fit(
+                width, depth, baseplate_path, spacer_path, format_list
+            )
+            splits = [(result.units_width, result.units_depth)]
+            baseplate_paths = [result.baseplate_path]
+
+        # Display calculation summary
+        _display_drawer_fit_summary(result, width, depth, MIN_SPACER_GAP_MM)
+
+        # Check spacer dimensions against print bed
+        if result.spacer_path:
+            from gridfinity_invoke.config import get_print_bed_dimensions
+
+            bed_width, bed_depth = get_print_bed_dimensions()
+            if width > bed_width or depth > bed_depth:
+                print_warning(
+                    f"Warning: Spacer dimensions may exceed print bed "
+                    f"({bed_width}x{bed_depth}mm)"
                 )
+                print()
 
-                # Display generated pieces
-                for i, (path, (split_w, split_d)) in enumerate(
-                    zip(baseplate_paths, splits), start=1
-                ):
-                    print_success(
-                        f"  Generated {path.name} ({split_w}x{split_d} units)"
-                    )
-
-                # Generate spacers for full drawer dimensions
-                spacer_path = project_path / f"{component_name}-spacers.stl"
-                from gridfinity_invoke.generators import DrawerFitResult
-
-                # Calculate gaps for spacer generation
-                actual_width_mm = float(units_width * GRIDFINITY_UNIT_MM)
-                actual_depth_mm = float(units_depth * GRIDFINITY_UNIT_MM)
-                gap_x_mm = width - actual_width_mm
-                gap_y_mm = depth - actual_depth_mm
-                per_side_gap_x = gap_x_mm / 2
-                per_side_gap_y = gap_y_mm / 2
-
-                spacer_result_path = None
-                if (
-                    per_side_gap_x > MIN_SPACER_GAP_MM
-                    or per_side_gap_y > MIN_SPACER_GAP_MM
-                ):
-                    from cqgridfinity import GridfinityDrawerSpacer
-
-                    spacer_path.parent.mkdir(parents=True, exist_ok=True)
-                    spacer = GridfinityDrawerSpacer(dr_width=width, dr_depth=depth)
-                    spacer_obj = spacer.render_half_set()
-                    if spacer_obj is not None:
-                        spacer_obj.val().exportStl(
-                            str(spacer_path)
-                        )  # pyrefly: ignore[missing-attribute]
-                        spacer_result_path = spacer_path
-
-                # Create result object for display
-                result = DrawerFitResult(
-                    baseplate_path=baseplate_paths[0],  # First piece for compatibility
-                    spacer_path=spacer_result_path,
-                    units_width=units_width,
-                    units_depth=units_depth,
-                    actual_width_mm=actual_width_mm,
-                    actual_depth_mm=actual_depth_mm,
-                    gap_x_mm=gap_x_mm,
-                    gap_y_mm=gap_y_mm,
+        if not should_split:
+            if needs_split:
+                print_success(
+                    f"Generated baseplate: {result.baseplate_path} "
+                    f"(WARNING: exceeds print bed)"
                 )
+            else:
+                print_success(f"Generated baseplate: {result.baseplate_path}")
 
-                # Display calculation summary
-                _display_drawer_fit_summary(result, width, depth, MIN_SPACER_GAP_MM)
-
-                # Check spacer dimensions against print bed
-                if result.spacer_path:
-                    from gridfinity_invoke.config import get_print_bed_dimensions
-
-                    bed_width, bed_depth = get_print_bed_dimensions()
-                    if width > bed_width or depth > bed_depth:
-                        print_warning(
-                            f"Warning: Spacer dimensions may exceed print bed "
-                            f"({bed_width}x{bed_depth}mm)"
-                        )
-                        print()
-
-                if result.spacer_path:
-                    print_success(f"Generated spacers: {result.spacer_path}")
-                    print("  (half-set - print twice for complete spacer set)")
-                else:
-                    print("No spacers generated (gaps below 4mm threshold)")
-
-                # Add component to config with split_count
-                component = {
-                    "name": component_name,
-                    "type": "drawer-fit",
-                    "width_mm": width,
-                    "depth_mm": depth,
-                    "units_width": result.units_width,
-                    "units_depth": result.units_depth,
-                    "split_count": len(splits),
-                }
-                add_component_to_config(active_project, component)
-                print_success(f"Added to project: {active_project}")
+        if result.spacer_path:
+            print_success(f"Generated spacers: {result.spacer_path}")
+            print("  (half-set - print twice for complete spacer set)")
+        else:
+            print("No spacers generated (gaps below 4mm threshold)")
 
-            else:
-                # Generate single baseplate (original behavior)
-                if needs_split:
-                    print_warning("Proceeding with single oversized baseplate...")
-                    print()
-
-                baseplate_path = project_path / f"{component_name}-baseplate.stl"
-                spacer_path = project_path / f"{component_name}-spacers.stl"
-
-                result = generate_drawer_fit(width, depth, baseplate_path, spacer_path)
-
-                # Display calculation summary
-                _display_drawer_fit_summary(result, width, depth, MIN_SPACER_GAP_MM)
-
-                # Check spacer dimensions against print bed
-                if result.spacer_path:
-                    from gridfinity_invoke.config import get_print_bed_dimensions
-
-                    bed_width, bed_depth = get_print_bed_dimensions()
-                    if width > bed_width or depth > bed_depth:
-                        print_warning(
-                            f"Warning: Spacer dimensions may exceed print bed "
-                            f"({bed_width}x{bed_depth}mm)"
-                        )
-                        print()
-
-                if needs_split:
-                    print_success(
-                        f"Generated baseplate: {result.baseplate_path} "
-                        f"(WARNING: exceeds print bed)"
-                    )
-                else:
-                    print_success(f"Generated baseplate: {result.baseplate_path}")
-
-                if result.spacer_path:
-                    print_success(f"Generated spacers: {result.spacer_path}")
-                    print("  (half-set - print twice for complete spacer set)")
-                else:
-                    print("No spacers generated (gaps below 4mm threshold)")
-
-                # Add component to config
-                component = {
-                    "name": component_name,
-                    "type": "drawer-fit",
-                    "width_mm": width,
-                    "depth_mm": depth,
-                    "units_width": result.units_width,
-                    "units_depth": result.units_depth,
-                }
-                add_component_to_config(active_project, component)
-                print_success(f"Added to project: {active_project}")
+        if len(format_list) > 1:
+            print(f"  Each file also exported as: {', '.join(format_list[1:])}")
 
-        except ValueError as e:
-            print_error(f"Invalid dimensions: {e}")
-            sys.exit(1)
-        except Exception as e:
-            print_error(f"Generation failed: {e}")
-            sys.exit(1)
-    else:
-        # Default behavior: save to output directory
-        output_path = Path(output)
+        if preview:
+            generate_drawer_assembly(result, splits, baseplate_paths, assembly_path)
+            print_success(f"Generated assembly preview: {assembly_path}")
 
-        try:
+        if active_project:
+            # Add component to config, recording split_count for split baseplates
+            component = {
+                "name": component_name,
+                "type": "drawer-fit",
+                "width_mm": width,
+                "depth_mm": depth,
+                "units_width": result.units_width,
+                "units_depth": result.units_depth,
+            }
             if should_split:
-                # Generate split baseplates
-                print_header("Generating split baseplates...")
-                splits = calculate_baseplate_splits(units_width, units_depth)
-                baseplate_paths = generate_split_baseplates(
-                    splits, output_path.parent, "baseplate"
-                )
+                component["split_count"] = len(splits)
+            if format_list != ["stl"]:
+                component["formats"] = format_list
+            add_component_to_config(active_project, component)
+            record_component(active_project, component)
+            print_success(f"Added to project: {active_project}")
 
-                # Display generated pieces
-                for i, (path, (split_w, split_d)) in enumerate(
-                    zip(baseplate_paths, splits), start=1
-                ):
-                    print_success(
-                        f"  Generated {path.name} ({split_w}x{split_d} units)"
-                    )
-
-                # Generate spacers
-                spacer_path = output_path.parent / f"{output_path.name}-spacers.stl"
-                from gridfinity_invoke.generators import DrawerFitResult
-
-                # Calculate gaps for spacer generation
-                actual_width_mm = float(units_width * GRIDFINITY_UNIT_MM)
-                actual_depth_mm = float(units_depth * GRIDFINITY_UNIT_MM)
-                gap_x_mm = width - actual_width_mm
-                gap_y_mm = depth - actual_depth_mm
-                per_side_gap_x = gap_x_mm / 2
-                per_side_gap_y = gap_y_mm / 2
-
-                spacer_result_path = None
-                if (
-                    per_side_gap_x > MIN_SPACER_GAP_MM
-                    or per_side_gap_y > MIN_SPACER_GAP_MM
-                ):
-                    from cqgridfinity import GridfinityDrawerSpacer
-
-                    spacer_path.parent.mkdir(parents=True, exist_ok=True)
-                    spacer = GridfinityDrawerSpacer(dr_width=width, dr_depth=depth)
-                    spacer_obj = spacer.render_half_set()
-                    if spacer_obj is not None:
-                        spacer_obj.val().exportStl(
-                            str(spacer_path)
-                        )  # pyrefly: ignore[missing-attribute]
-                        spacer_result_path = spacer_path
-
-                # Create result object for display
-                result = DrawerFitResult(
-                    baseplate_path=baseplate_paths[0],
-                    spacer_path=spacer_result_path,
-                    units_width=units_width,
-                    units_depth=units_depth,
-                    actual_width_mm=actual_width_mm,
-                    actual_depth_mm=actual_depth_mm,
-                    gap_x_mm=gap_x_mm,
-                    gap_y_mm=gap_y_mm,
-                )
+    except ValueError as e:
+        print_error(f"Invalid dimensions: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Generation failed: {e}")
+        sys.exit(1)
 
-                # Display calculation summary
-                _display_drawer_fit_summary(result, width, depth, MIN_SPACER_GAP_MM)
 
-                # Check spacer dimensions against print bed
-                if result.spacer_path:
-                    from gridfinity_invoke.config import get_print_bed_dimensions
+def _drawer_fit_stream(width: float, depth: float, formats: list[str]) -> None:
+    """Stream drawer-fit pieces to stdout as a tar archive, bypassing any project.
 
-                    bed_width, bed_depth = get_print_bed_dimensions()
-                    if width > bed_width or depth > bed_depth:
-                        print_warning(
-                            f"Warning: Spacer dimensions may exceed print bed "
-                            f"({bed_width}x{bed_depth}mm)"
-                        )
-                        print()
+    Pieces are rendered and written one at a time. There is no prompt: the
+    baseplate is split automatically if it exceeds the print bed.
 
-                if result.spacer_path:
-                    print_success(f"Generated spacers: {result.spacer_path}")
-                    print("  (half-set - print twice for complete spacer set)")
-                else:
-                    print("No spacers generated (gaps below 4mm threshold)")
+    Args:
+        width: Drawer width in mm
+        depth: Drawer depth in mm
+        formats: Export formats for each piece
+    """
+    import calendar
+    import io
+    import tarfile
 
-            else:
-                # Generate single baseplate (original behavior)
-                if needs_split:
-                    print_warning("Proceeding with single oversized baseplate...")
-                    print()
+    from gridfinity_invoke.generators import (
+        calculate_baseplate_splits,
+        get_max_units,
+        iter_drawer_fit_files,
+    )
+    from gridfinity_invoke.mesh import ZIP_TIMESTAMP
+    from gridfinity_invoke.planning import fit_drawer
 
-                baseplate_path = (
-                    output_path.parent / f"{output_path.name}-baseplate.stl"
-                )
-                spacer_path = output_path.parent / f"{output_path.name}-spacers.stl"
-
-                result = generate_drawer_fit(width, depth, baseplate_path, spacer_path)
-
-                # Display calculation summary
-                _display_drawer_fit_summary(result, width, depth, MIN_SPACER_GAP_MM)
-
-                # Check spacer dimensions against print bed
-                if result.spacer_path:
-                    from gridfinity_invoke.config import get_print_bed_dimensions
-
-                    bed_width, bed_depth = get_print_bed_dimensions()
-                    if width > bed_width or depth > bed_depth:
-                        print_warning(
-                            f"Warning: Spacer dimensions may exceed print bed "
-                            f"({bed_width}x{bed_depth}mm)"
-                        )
-                        print()
-
-                if needs_split:
-                    print_success(
-                        f"Generated baseplate: {result.baseplate_path} "
-                        f"(WARNING: exceeds print bed)"
-                    )
-                else:
-                    print_success(f"Generated baseplate: {result.baseplate_path}")
-
-                if result.spacer_path:
-                    print_success(f"Generated spacers: {result.spacer_path}")
-                    print("  (half-set - print twice for complete spacer set)")
-                else:
-                    print("No spacers generated (gaps below 4mm threshold)")
+    with _messages_to_stderr() as stdout:
+        print_header(f"Streaming drawer-fit pieces for {width}x{depth}mm drawer...")
 
+        try:
+            units_width, units_depth, *_ = fit_drawer(width, depth)
         except ValueError as e:
-            print_error(f"Invalid dimensions: {e}")
+            print_error(str(e))
             sys.exit(1)
+        max_units_x, max_units_y = get_max_units()
+        split_count = 0
+        if units_width > max_units_x or units_depth > max_units_y:
+            split_count = len(calculate_baseplate_splits(units_width, units_depth))
+            print_warning(
+                f"Baseplate ({units_width}x{units_depth} units) exceeds print bed, "
+                f"splitting into {split_count} pieces"
+            )
+
+        try:
+            with tarfile.open(fileobj=stdout, mode="w|") as tar:
+                for name, buffer in iter_drawer_fit_files(
+                    width, depth, split_count, formats
+                ):
+                    info = tarfile.TarInfo(name)
+                    info.size = len(buffer)
+                    # Fixed, like 3MF entries, so the same drawer streams the same bytes
+                    info.mtime = calendar.timegm(ZIP_TIMESTAMP)
+                    info.mode = 0o644
+                    tar.addfile(info, io.BytesIO(buffer))
+                    print_success(f"Streamed {name}")
         except Exception as e:
             print_error(f"Generation failed: {e}")
             sys.exit(1)
 
 
+def _drawer_fit_outline(
+    outline: str, rects: str, output: str, preview: bool, project: str
+) -> None:
+    """Generate split baseplates for an L-shaped or multi-rectangle drawer.
+
+    Args:
+        outline: Polygon outline string for parse_outline, or empty
+        rects: Rectangle list string for parse_rects, or empty
+        output: Output path prefix for STL files
+        preview: Also write an assembly preview STL
+        project: Project requested with --project, or empty
+    """
+    from gridfinity_invoke.config import ensure_printer_config
+    from gridfinity_invoke.generators import (
+        generate_outline_assembly,
+        generate_outline_fit,
+    )
+    from gridfinity_invoke.manifest import record_component
+    from gridfinity_invoke.planning import (
+        GRIDFINITY_UNIT_MM,
+        parse_outline,
+        parse_rects,
+        polygon_to_outline_grid,
+        rects_to_outline_grid,
+    )
+    from gridfinity_invoke.projects import (
+        add_component_to_config,
+        get_project_path,
+    )
+
+    if outline and rects:
+        print_error("Use either --outline or --rects, not both")
+        sys.exit(1)
+
+    try:
+        if outline:
+            grid = polygon_to_outline_grid(parse_outline(outline))
+        else:
+            grid = rects_to_outline_grid(parse_rects(rects))
+    except ValueError as e:
+        print_error(f"Invalid outline: {e}")
+        sys.exit(1)
+
+    print_header("Generating drawer-fit solution for drawer outline...")
+    print()
+
+    ensure_printer_config()
+    print()
+
+    active_project = _resolve_project(project)
+    if active_project:
+        component_name = prompt_with_default("Name", "drawer-fit-outline")
+        piece_dir = get_project_path(active_project)
+        piece_base_name = f"{component_name}-baseplate"
+        assembly_path = piece_dir / f"{component_name}-assembly.stl"
+    else:
+        output_path = Path(output)
+        piece_dir = output_path.parent
+        piece_base_name = f"{output_path.name}-baseplate"
+        assembly_path = output_path.parent / f"{output_path.name}-assembly.stl"
+
+    try:
+        result = generate_outline_fit(grid, piece_dir, piece_base_name)
+
+        for path, piece in zip(result.baseplate_paths, result.pieces):
+            print_success(
+                f"  Generated {path.name} ({piece.units_width}x{piece.units_depth} "
+                f"units at {piece.x},{piece.y})"
+            )
+
+        cell_count = int(grid.cells.sum())
+        covered_mm2 = cell_count * GRIDFINITY_UNIT_MM**2
+        print()
+        print(f"Rectangles: {len(grid.rects)}")
+        for rect in grid.rects:
+            print(f"  {rect.units_width}x{rect.units_depth} units at {rect.x},{rect.y}")
+        print(
+            f"Coverage: {cell_count} units "
+            f"({covered_mm2 / grid.outline_area_mm2:.0%} of outline area)"
+        )
+        print("Spacers: not generated for irregular outlines")
+        print()
+
+        if preview:
+            generate_outline_assembly(result, assembly_path)
+            print_success(f"Generated assembly preview: {assembly_path}")
+
+        if active_project:
+            component = {
+                "name": component_name,
+                "type": "drawer-fit",
+                "outline" if outline else "rects": outline or rects,
+                "rects_units": [list(rect) for rect in grid.rects],
+                "split_count": len(result.pieces),
+            }
+            add_component_to_config(active_project, component)
+            record_component(active_project, component)
+            print_success(f"Added to project: {active_project}")
+
+    except Exception as e:
+        print_error(f"Generation failed: {e}")
+        sys.exit(1)
+
+
 def _display_drawer_fit_summary(
     result: "DrawerFitResult",  # noqa: F821
     width: float,
@@ -563,6 +885,262 @@ def _display_drawer_fit_summary(
     print()
 
 
+@task
+def layout(
+    ctx: Context,
+    bins: str,
+    drawer: str = "",
+    width: int = 0,
+    depth: int = 0,
+    fill: bool = True,
+    fill_height: int = 3,
+    project: str = "",
+) -> None:
+    """{"desc": "Pack a mix of bins into a drawer grid and save the placements", "params": [{"name": "bins", "type": "string", "desc": "Bins to place as LENGTHxWIDTHxHEIGHT[:COUNT], comma separated", "example": "2x2x3:4,1x1x3:6"}, {"name": "drawer", "type": "string", "desc": "Drawer-fit component in the project to lay out", "example": "kitchen-drawer"}, {"name": "width", "type": "int", "desc": "Grid width in gridfinity units (if no drawer given)", "example": "12"}, {"name": "depth", "type": "int", "desc": "Grid depth in gridfinity units (if no drawer given)", "example": "10"}, {"name": "fill", "type": "bool", "desc": "Fill leftover space with as few extra bins as possible", "example": "true"}, {"name": "fill_height", "type": "int", "desc": "Height in units for filler bins", "example": "3"}, {"name": "project", "type": "string", "desc": "Project to read the drawer from and save the layout to (default: GF_PROJECT, then the active project)", "example": "my-project"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.generators import get_max_units
+    from gridfinity_invoke.layout import (
+        format_layout_map,
+        parse_bin_specs,
+        solve_layout,
+    )
+    from gridfinity_invoke.projects import (
+        add_component_to_config,
+        load_project_config,
+    )
+
+    try:
+        bin_specs = parse_bin_specs(bins)
+    except ValueError as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    active_project = _resolve_project(project)
+
+    if drawer:
+        # Take the grid size from a drawer-fit component in the active project
+        if not active_project:
+            print_error("No active project - use --width/--depth instead of --drawer")
+            sys.exit(1)
+        components = load_project_config(active_project).get("components", [])
+        matches = [
+            c for c in components if c["name"] == drawer and c["type"] == "drawer-fit"
+        ]
+        if not matches:
+            print_error(f"Drawer-fit '{drawer}' not found in project {active_project}")
+            sys.exit(1)
+        try:
+            width, depth, blocked = _drawer_layout_grid(matches[0])
+        except ValueError as e:
+            print_error(f"Invalid drawer-fit '{drawer}': {e}")
+            sys.exit(1)
+    else:
+        blocked = frozenset()
+
+    if width < 1 or depth < 1:
+        print_error("Grid dimensions must be positive integers >= 1")
+        sys.exit(1)
+
+    print_header(f"Laying out {len(bin_specs)} bin(s) in a {width}x{depth} grid...")
+
+    fill_max = get_max_units() if fill else None
+    result = solve_layout(width, depth, bin_specs, fill_max, fill_height, blocked)
+
+    print()
+    for row in format_layout_map(result):
+        print(f"  {row}")
+    print()
+
+    placed = [p for p in result.placements if not p.fill]
+    fillers = [p for p in result.placements if p.fill]
+    print_success(f"Placed {len(placed)} of {len(bin_specs)} requested bin(s)")
+    if fillers:
+        print_success(f"Added {len(fillers)} filler bin(s) for leftover space")
+    for bin_spec in result.unplaced:
+        print_warning(
+            f"Warning: No room for {bin_spec.length}x{bin_spec.width}x"
+            f"{bin_spec.height} bin"
+        )
+
+    if active_project:
+        default_name = f"{drawer}-layout" if drawer else f"layout-{width}x{depth}"
+        component_name = prompt_with_default("Name", default_name)
+
+        component = {
+            "name": component_name,
+            "type": "layout",
+            "drawer": drawer or None,
+            "units_width": width,
+            "units_depth": depth,
+            "placements": [p._asdict() for p in result.placements],
+        }
+        add_component_to_config(active_project, component)
+        print_success(f"Added to project: {active_project}")
+
+
+def _drawer_layout_grid(
+    component: dict[str, Any],
+) -> tuple[int, int, frozenset[tuple[int, int]]]:
+    """Get the grid a drawer-fit component's bins are laid out in.
+
+    Outline drawers are laid out on the bounding grid of their cells, with
+    the cells outside the outline blocked.
+
+    Args:
+        component: Drawer-fit component from a project config
+
+    Returns:
+        (units_width, units_depth, blocked (x, y) cells)
+
+    Raises:
+        ValueError: If the component is invalid
+    """
+    from gridfinity_invoke.components import (
+        DrawerFitComponent,
+        OutlineFitComponent,
+        parse_component,
+    )
+    from gridfinity_invoke.planning import (
+        GRIDFINITY_UNIT_MM,
+        parse_outline,
+        parse_rects,
+        polygon_to_outline_grid,
+        rects_to_outline_grid,
+    )
+
+    drawer = parse_component(component)
+    if isinstance(drawer, DrawerFitComponent):
+        width = drawer.units_width or int(drawer.width_mm // GRIDFINITY_UNIT_MM)
+        depth = drawer.units_depth or int(drawer.depth_mm // GRIDFINITY_UNIT_MM)
+        return width, depth, frozenset()
+    if not isinstance(drawer, OutlineFitComponent):
+        raise ValueError(f"'{drawer.name}' is a {drawer.TYPE}, not a drawer-fit")
+
+    rects = drawer.rects_units
+    if not rects:
+        if drawer.outline is not None:
+            grid = polygon_to_outline_grid(parse_outline(drawer.outline))
+        else:
+            grid = rects_to_outline_grid(parse_rects(drawer.rects or ""))
+        rects = tuple(grid.rects)
+    cells = {
+        (x + dx, y + dy)
+        for x, y, units_width, units_depth in rects
+        for dx in range(units_width)
+        for dy in range(units_depth)
+    }
+    width = max((x + units_width for x, _, units_width, _ in rects), default=0)
+    depth = max((y + units_depth for _, y, _, units_depth in rects), default=0)
+    blocked = frozenset(
+        (x, y) for x in range(width) for y in range(depth) if (x, y) not in cells
+    )
+    return width, depth, blocked
+
+
+@task
+def cabinet(
+    ctx: Context,
+    csv: str,
+    output: str = "output/cabinet",
+    workers: int = 0,
+) -> None:
+    """{"desc": "Generate drawer-fit solutions for a whole cabinet from a CSV of drawer measurements", "params": [{"name": "csv", "type": "string", "desc": "CSV file with name, width and depth (mm) columns", "example": "drawers.csv"}, {"name": "output", "type": "string", "desc": "Output directory for drawer folders and the print list", "example": "output/cabinet"}, {"name": "workers", "type": "int", "desc": "Number of parallel render processes (default: CPU count)", "example": "4"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.cabinet import generate_cabinet, read_drawer_csv
+    from gridfinity_invoke.config import ensure_printer_config
+    from gridfinity_invoke.generators import get_max_units
+
+    print_header(f"Generating cabinet from {csv}...")
+    print()
+
+    # Ensure printer config exists (prompt if missing, log if exists)
+    ensure_printer_config()
+    print()
+
+    try:
+        drawers = read_drawer_csv(csv)
+    except FileNotFoundError:
+        print_error(f"CSV file not found: {csv}")
+        sys.exit(1)
+    except ValueError as e:
+        print_error(f"Invalid CSV: {e}")
+        sys.exit(1)
+
+    if not drawers:
+        print_error("No drawers found in CSV")
+        sys.exit(1)
+
+    try:
+        result = generate_cabinet(
+            drawers, Path(output), get_max_units(), workers=workers or None
+        )
+    except ValueError as e:
+        print_error(f"Invalid dimensions: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Generation failed: {e}")
+        sys.exit(1)
+
+    plans = result.plans
+    for i, drawer in enumerate(drawers):
+        spacers = "spacers" if plans.needs_spacers[i] else "no spacers"
+        print(
+            f"  {drawer.name}: {drawer.width_mm:g}x{drawer.depth_mm:g}mm -> "
+            f"{plans.units_width[i]}x{plans.units_depth[i]} units, "
+            f"{plans.piece_count[i]} piece(s), {spacers}"
+        )
+    print()
+
+    print_header("Print list")
+    for entry in result.print_list:
+        print(f"  {entry.quantity:>3} x {entry.file} ({entry.description})")
+    print()
+
+    print_success(f"Generated {len(drawers)} drawer folder(s) in {output}")
+    print_success(f"Print list: {result.print_list_path}")
+
+
+@task(name="fit-table")
+def fit_table(
+    ctx: Context,
+    widths: str = "100:1000:1",
+    depths: str = "100:1000:1",
+    beds: str = "",
+    output: str = "output/fit-table.csv",
+) -> None:
+    """{"desc": "Write a drawer-fit sizing table over ranges of drawer and print bed sizes", "params": [{"name": "widths", "type": "string", "desc": "Drawer width range in mm as START:STOP:STEP", "example": "100:1000:1"}, {"name": "depths", "type": "string", "desc": "Drawer depth range in mm as START:STOP:STEP", "example": "100:1000:1"}, {"name": "beds", "type": "string", "desc": "Print bed sizes in mm, comma separated (default: configured printer)", "example": "225x225,256x256"}, {"name": "output", "type": "string", "desc": "Output file (.csv or .parquet)", "example": "output/fit-table.csv"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.config import get_print_bed_dimensions
+    from gridfinity_invoke.planning import (
+        calculate_fit_table,
+        parse_range,
+        write_fit_table,
+    )
+
+    try:
+        width_values = parse_range(widths)
+        depth_values = parse_range(depths)
+        if beds:
+            bed_sizes = []
+            for bed in beds.split(","):
+                bed_width, bed_depth = (int(v) for v in bed.lower().split("x"))
+                bed_sizes.append((bed_width, bed_depth))
+        else:
+            bed_sizes = [get_print_bed_dimensions()]
+    except ValueError as e:
+        print_error(f"Invalid input: {e}")
+        sys.exit(1)
+
+    rows = len(width_values) * len(depth_values) * len(bed_sizes)
+    print_header(f"Calculating {rows} drawer-fit combination(s)...")
+
+    try:
+        table = calculate_fit_table(width_values, depth_values, bed_sizes)
+        output_path = write_fit_table(table, output)
+    except (ValueError, ImportError) as e:
+        print_error(str(e))
+        sys.exit(1)
+
+    print_success(f"Fit table written to: {output_path}")
+
+
 @task(name="new-project")
 def new_project(ctx: Context, name: str) -> None:
     """{"desc": "Create a new Gridfinity project", "params": [{"name": "name", "type": "string", "desc": "Project name", "example": "my-project"}], "returns": {}}"""  # noqa: E501
@@ -594,16 +1172,16 @@ def new_project(ctx: Context, name: str) -> None:
 
 
 @task
-def load(ctx: Context, project: str) -> None:
-    """{"desc": "Load a Gridfinity project and regenerate all STL files", "params": [{"name": "project", "type": "string", "desc": "Project name to load", "example": "my-project"}], "returns": {}}"""  # noqa: E501
-    from gridfinity_invoke.generators import (
-        generate_baseplate,
-        generate_bin,
-        generate_drawer_fit,
-    )
+def load(
+    ctx: Context, project: str, preview: bool = False, changed: bool = False
+) -> None:
+    """{"desc": "Load a Gridfinity project and regenerate all STL files", "params": [{"name": "project", "type": "string", "desc": "Project name to load", "example": "my-project"}, {"name": "preview", "type": "bool", "desc": "Also write assembly preview STLs for drawer-fit components", "example": "true"}, {"name": "changed", "type": "bool", "desc": "Only regenerate components changed since the last load", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.components import load_components
+    from gridfinity_invoke.manifest import record_component
     from gridfinity_invoke.projects import (
+        changed_components,
+        compact_project,
         get_project_path,
-        load_project_config,
         set_active_project,
     )
 
@@ -616,43 +1194,34 @@ def load(ctx: Context, project: str) -> None:
         print_error(f"Project '{project}' does not exist!")
         sys.exit(1)
 
-    # Load config
+    # Load and validate config
     try:
-        config = load_project_config(project)
+        components = load_components(project)
     except FileNotFoundError:
         print_error(f"Project config not found for '{project}'!")
         sys.exit(1)
+    except ValueError as e:
+        print_error(f"Invalid project config: {e}")
+        sys.exit(1)
 
-    # Regenerate all STL files
-    components = config.get("components", [])
+    # Regenerate all STL files, or those the journal says have changed
+    if changed:
+        changed_names = changed_components(project)
+        components = [c for c in components if c.name in changed_names]
     print_header(f"Regenerating {len(components)} component(s)...")
 
     for component in components:
-        component_name = component["name"]
-        component_type = component["type"]
-
-        if component_type == "bin":
-            length = component["length"]
-            width = component["width"]
-            height = component["height"]
-            output_path = project_path / f"{component_name}.stl"
-            print(f"  Generating bin: {component_name} ({length}x{width}x{height})")
-            generate_bin(length, width, height, output_path)
-        elif component_type == "baseplate":
-            length = component["length"]
-            width = component["width"]
-            output_path = project_path / f"{component_name}.stl"
-            print(f"  Generating baseplate: {component_name} ({length}x{width})")
-            generate_baseplate(length, width, output_path)
-        elif component_type == "drawer-fit":
-            width_mm = component["width_mm"]
-            depth_mm = component["depth_mm"]
-            baseplate_path = project_path / f"{component_name}-baseplate.stl"
-            spacer_path = project_path / f"{component_name}-spacers.stl"
-            print(
-                f"  Generating drawer-fit: {component_name} ({width_mm}x{depth_mm}mm)"
-            )
-            generate_drawer_fit(width_mm, depth_mm, baseplate_path, spacer_path)
+        description = component.describe()
+        if description:
+            print(f"  Generating {component.TYPE}: {component.name} ({description})")
+        assembly_path = component.generate(project_path, preview)
+        if assembly_path:
+            print(f"  Generated assembly preview: {assembly_path.name}")
+
+        record_component(project, component.to_dict())
+
+    # Every change is now generated, so fold the journal into config.json
+    compact_project(project)
 
     # Set as active project
     set_active_project(project)
@@ -661,34 +1230,400 @@ def load(ctx: Context, project: str) -> None:
     print_success(f"Active project set to: {project}")
 
 
+@task
+def watch(
+    ctx: Context, project: str = "", preview: bool = False, poll: bool = False
+) -> None:
+    """{"desc": "Watch a project's config and regenerate components as they change", "params": [{"name": "project", "type": "string", "desc": "Project to watch (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "preview", "type": "bool", "desc": "Also write assembly preview STLs for drawer-fit components", "example": "true"}, {"name": "poll", "type": "bool", "desc": "Poll for changes instead of using inotify", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.projects import get_active_project
+    from gridfinity_invoke.watch import watch_project
+
+    project = get_active_project(project) or ""
+    if not project:
+        print_error("No active project - pass --project")
+        sys.exit(1)
+
+    def report(message: str, error: bool) -> None:
+        if error:
+            print_error(message)
+        else:
+            print(f"  {message}", flush=True)
+
+    print_header(f"Watching project: {project} (Ctrl+C to stop)")
+    try:
+        watch_project(project, report, preview=preview, use_inotify=not poll)
+    except FileNotFoundError:
+        print_error(f"Project config not found for '{project}'!")
+        sys.exit(1)
+    except ValueError as e:
+        print_error(f"Invalid project config: {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print_success("Stopped watching")
+
+
+@task
+def render(ctx: Context, project: str = "", jobs: int = 0) -> None:
+    """{"desc": "Render a project's deferred or out-of-date components in parallel", "params": [{"name": "project", "type": "string", "desc": "Project to render (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "jobs", "type": "int", "desc": "Number of components to render at once (default: CPU count)", "example": "4"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.projects import get_active_project, get_project_path
+
+    project = get_active_project(project) or ""
+    if not project:
+        print_error("No active project - pass --project")
+        sys.exit(1)
+
+    print_header(f"Rendering project: {project}")
+
+    if not get_project_path(project).exists():
+        print_error(f"Project '{project}' does not exist!")
+        sys.exit(1)
+
+    if not _render_pending(project, jobs):
+        print_success("Nothing to render - every component is up to date")
+
+
+def _render_pending(project: str, jobs: int = 0) -> int:
+    """Render the components a project's manifest doesn't have yet.
+
+    Each one is recorded in the manifest as soon as it finishes, so an
+    interrupted run keeps the components it completed.
+
+    Args:
+        project: Project name
+        jobs: Number of worker processes (default: CPU count)
+
+    Returns:
+        Number of components rendered
+    """
+    from gridfinity_invoke.components import generate_components, parse_component
+    from gridfinity_invoke.manifest import pending_components, record_component
+    from gridfinity_invoke.projects import get_project_path
+
+    try:
+        pending = {c["name"]: c for c in pending_components(project)}
+        components = [parse_component(c) for c in pending.values()]
+    except FileNotFoundError:
+        print_error(f"Project config not found for '{project}'!")
+        sys.exit(1)
+    except ValueError as e:
+        print_error(f"Invalid project config: {e}")
+        sys.exit(1)
+    if not components:
+        return 0
+
+    print(f"  Rendering {len(components)} pending component(s)...", flush=True)
+    try:
+        for component in generate_components(
+            components, get_project_path(project), workers=jobs or None
+        ):
+            record_component(project, pending[component.name])
+            print(f"  Rendered {component.TYPE}: {component.name}", flush=True)
+    except Exception as e:
+        print_error(f"Render failed: {e}")
+        sys.exit(1)
+    print_success(f"Rendered {len(components)} component(s)")
+    return len(components)
+
+
+@task
+def verify(ctx: Context, project: str = "") -> None:
+    """{"desc": "Check a project's output files against its manifest", "params": [{"name": "project", "type": "string", "desc": "Project name to verify (default: GF_PROJECT, then the active project)", "example": "my-project"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.manifest import verify_manifest
+    from gridfinity_invoke.projects import get_active_project, get_project_path
+
+    project = get_active_project(project) or ""
+    if not project:
+        print_error("No active project - pass --project")
+        sys.exit(1)
+
+    print_header(f"Verifying project: {project}")
+
+    if not get_project_path(project).exists():
+        print_error(f"Project '{project}' does not exist!")
+        sys.exit(1)
+
+    try:
+        result = verify_manifest(project)
+    except FileNotFoundError:
+        print_error(f"No manifest for '{project}' - run gf.load to create one")
+        sys.exit(1)
+
+    for name in result.modified:
+        print_error(f"  Modified: {name}")
+    for name in result.missing:
+        print_error(f"  Missing: {name}")
+
+    if result.modified or result.missing:
+        print_error(
+            f"{len(result.modified)} modified and {len(result.missing)} missing "
+            f"of {result.checked} file(s)"
+        )
+        sys.exit(1)
+
+    print_success(f"All {result.checked} file(s) match the manifest")
+    if result.rehashed:
+        print(f"  {len(result.rehashed)} file(s) had new mtimes but same contents")
+
+
+@task
+def gc(
+    ctx: Context, project: str = "", all: bool = False, delete: bool = False
+) -> None:
+    """{"desc": "List or delete project files that no component produces", "params": [{"name": "project", "type": "string", "desc": "Project to clean (default: GF_PROJECT, then the active project)", "example": "my-project"}, {"name": "all", "type": "bool", "desc": "Clean every project", "example": "true"}, {"name": "delete", "type": "bool", "desc": "Delete the orphaned files instead of only listing them", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.cleanup import find_orphans, remove_orphans
+    from gridfinity_invoke.projects import get_active_project
+    from gridfinity_invoke.workspace import current_workspace
+
+    if all:
+        projects_dir = current_workspace().projects_dir
+        names = sorted(
+            entry.name
+            for entry in (os.scandir(projects_dir) if projects_dir.exists() else [])
+            if entry.is_dir() and not entry.name.startswith(".")
+        )
+    else:
+        project = get_active_project(project) or ""
+        if not project:
+            print_error("No active project - pass --project or --all")
+            sys.exit(1)
+        names = [project]
+
+    total_files = 0
+    total_bytes = 0
+    for name in names:
+        try:
+            orphans = find_orphans(name)
+        except FileNotFoundError:
+            print_error(f"Project '{name}' does not exist!")
+            sys.exit(1)
+        if not orphans:
+            continue
+
+        print_header(f"{name}: {len(orphans)} orphaned file(s)")
+        for orphan in orphans:
+            print(f"  {orphan.path.name} ({_format_size(orphan.size)})")
+        total_files += len(orphans)
+        if delete:
+            total_bytes += remove_orphans(name, orphans)
+        else:
+            total_bytes += sum(orphan.size for orphan in orphans)
+
+    if not total_files:
+        print_success("No orphaned files found")
+    elif delete:
+        print_success(
+            f"Deleted {total_files} file(s), reclaimed {_format_size(total_bytes)}"
+        )
+    else:
+        print_success(
+            f"{total_files} orphaned file(s), {_format_size(total_bytes)} "
+            f"- run with --delete to remove them"
+        )
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count with a binary unit, e.g. 1.5 MiB."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            break
+        value /= 1024
+    return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+
+
+@task(name="export-archive")
+def export_archive(
+    ctx: Context, project: str, output: str = "", format: str = "zip"
+) -> None:
+    """{"desc": "Export a project's outputs, config and manifest as a zip or a single 3MF", "params": [{"name": "project", "type": "string", "desc": "Project name to export", "example": "my-project"}, {"name": "output", "type": "string", "desc": "Archive path (default: output/<project>.<format>), or - to stream it to stdout", "example": "output/my-project.zip"}, {"name": "format", "type": "string", "desc": "Archive format: zip (all output files) or 3mf (one object per STL)", "example": "3mf"}], "returns": {}}"""  # noqa: E501
+    if output == STDOUT_OUTPUT:
+        with _messages_to_stderr() as stdout:
+            _export_archive(project, format, stdout)
+        return
+
+    from gridfinity_invoke.atomic import atomic_output
+
+    # Errors exit inside the block, which discards the partial archive
+    output_path = Path(output or f"output/{project}.{format}")
+    with atomic_output(output_path) as temp_path, temp_path.open("wb") as f:
+        _export_archive(project, format, f)
+    print_success(f"Archive written to: {output_path}")
+
+
+def _export_archive(project: str, archive_format: str, stream: BinaryIO) -> None:
+    """Validate a project and write its archive to a stream.
+
+    Args:
+        project: Project name
+        archive_format: One of ARCHIVE_FORMATS
+        stream: Binary stream to write the archive to
+    """
+    from gridfinity_invoke.archive import (
+        ARCHIVE_FORMATS,
+        write_project_3mf,
+        write_project_zip,
+    )
+    from gridfinity_invoke.projects import get_project_path, load_project_config
+
+    print_header(f"Exporting project: {project}")
+
+    if archive_format not in ARCHIVE_FORMATS:
+        print_error(
+            f"Unknown archive format '{archive_format}' "
+            f"(use {' or '.join(ARCHIVE_FORMATS)})"
+        )
+        sys.exit(1)
+
+    project_path = get_project_path(project)
+    if not project_path.exists():
+        print_error(f"Project '{project}' does not exist!")
+        sys.exit(1)
+    try:
+        config = load_project_config(project)
+    except FileNotFoundError:
+        print_error(f"Project config not found for '{project}'!")
+        sys.exit(1)
+
+    # Deferred components are rendered into the project once, in parallel
+    _render_pending(project)
+
+    writer = write_project_3mf if archive_format == "3mf" else write_project_zip
+    try:
+        entries = writer(project, project_path, config, stream)
+    except Exception as e:
+        print_error(f"Export failed: {e}")
+        sys.exit(1)
+
+    rendered = sum(entry.rendered for entry in entries)
+    print_success(f"Archived {len(entries)} file(s) from {project}")
+    if rendered:
+        print(f"  {rendered} missing file(s) rendered on the fly")
+
+
+PROJECT_SORT_KEYS = ("name", "modified", "size", "components")
+
+
 @task(name="list-projects")
-def list_projects(ctx: Context) -> None:
-    """{"desc": "List all Gridfinity projects", "params": [], "returns": {}}"""
-    from gridfinity_invoke.projects import PROJECTS_DIR, get_active_project
+def list_projects(
+    ctx: Context,
+    long: bool = False,
+    filter: str = "",
+    sort: str = "name",
+    json: bool = False,
+) -> None:
+    """{"desc": "List all Gridfinity projects from the project index", "params": [{"name": "long", "type": "bool", "desc": "Also show component count, size on disk and when the config last changed", "example": "true"}, {"name": "filter", "type": "string", "desc": "Only list projects whose name matches this glob", "example": "kitchen-*"}, {"name": "sort", "type": "string", "desc": "Sort by name, modified, size or components (newest or largest first except name)", "example": "modified"}, {"name": "json", "type": "bool", "desc": "Print the project summaries as JSON", "example": "true"}], "returns": {}}"""  # noqa: E501
+    from datetime import datetime
+    from fnmatch import fnmatch
+    from json import dumps
 
-    print_header("Gridfinity Projects")
+    from gridfinity_invoke.projects import (
+        ProjectSummary,
+        get_active_project,
+        list_project_summaries,
+    )
 
-    # Check if projects directory exists
-    if not PROJECTS_DIR.exists():
-        print("No projects found")
+    if sort not in PROJECT_SORT_KEYS:
+        print_error(
+            f"Unknown sort key '{sort}', "
+            f"expected one of: {', '.join(PROJECT_SORT_KEYS)}"
+        )
+        sys.exit(1)
+
+    # Names come straight from the index; other details need mtime checks
+    summaries = list_project_summaries(check_configs=long or json or sort != "name")
+    if filter:
+        summaries = [s for s in summaries if fnmatch(s.name, filter)]
+    if sort != "name":
+        summaries.sort(key=lambda s: getattr(s, sort) or 0, reverse=True)
+
+    active_project = get_active_project()
+
+    def modified(summary: ProjectSummary) -> str | None:
+        if summary.modified is None:
+            return None
+        timestamp = datetime.fromtimestamp(summary.modified).astimezone()
+        return timestamp.isoformat(timespec="seconds")
+
+    if json:
+        print(
+            dumps(
+                [
+                    {
+                        **summary._asdict(),
+                        "modified": modified(summary),
+                        "active": summary.name == active_project,
+                    }
+                    for summary in summaries
+                ],
+                indent=2,
+            )
+        )
         return
 
-    # List all project directories
-    projects = [d for d in PROJECTS_DIR.iterdir() if d.is_dir()]
+    print_header("Gridfinity Projects")
 
-    if not projects:
+    if not summaries:
         print("No projects found")
         return
 
-    # Get active project
-    active_project = get_active_project()
-
     # Print projects with active indicator
-    for project in sorted(projects, key=lambda p: p.name):
-        if project.name == active_project:
-            print(f"  * {project.name} (active)")
+    name_width = max(len(summary.name) for summary in summaries)
+    for summary in summaries:
+        marker = "*" if summary.name == active_project else " "
+        suffix = " (active)" if summary.name == active_project else ""
+        if long:
+            when = (modified(summary) or "-")[:16].replace("T", " ")
+            print(
+                f"  {marker} {summary.name:<{name_width}}  "
+                f"{summary.components:>3} component(s)  "
+                f"{_format_size(summary.size):>10}  {when}{suffix}"
+            )
         else:
-            print(f"    {project.name}")
+            print(f"  {marker} {summary.name}{suffix}")
+
+
+@task
+def shell(ctx: Context) -> None:
+    """{"desc": "Interactive shell running gf tasks in one warm process, with tab completion", "params": [], "returns": {}}"""  # noqa: E501
+    from invoke_collections.shell import GfShell
+
+    GfShell(gf).cmdloop()
+
+
+@task
+def serve(
+    ctx: Context,
+    port: int = 8765,
+    host: str = "127.0.0.1",
+    workers: int = 0,
+    queue: int = 64,
+) -> None:
+    """{"desc": "Run a local HTTP service that generates components from JSON specs", "params": [{"name": "port", "type": "int", "desc": "Port to listen on (default: 8765)", "example": "8765"}, {"name": "host", "type": "string", "desc": "Address to listen on (default: 127.0.0.1)", "example": "127.0.0.1"}, {"name": "workers", "type": "int", "desc": "Number of render processes (default: CPU count)", "example": "4"}, {"name": "queue", "type": "int", "desc": "Most jobs queued or running at once (default: 64)", "example": "64"}], "returns": {}}"""  # noqa: E501
+    from gridfinity_invoke.service import GenerationServer, GenerationService
+
+    if queue < 1:
+        print_error("--queue must be at least 1")
+        sys.exit(1)
+
+    service = GenerationService(workers=workers or None, queue_size=queue)
+    try:
+        server = GenerationServer((host, port), service)
+    except OSError as e:
+        service.close()
+        print_error(f"Could not listen on {host}:{port}: {e}")
+        sys.exit(1)
+
+    print_header(f"Serving on http://{host}:{server.server_port} (Ctrl+C to stop)")
+    print("  POST /jobs                    queue a component spec")
+    print("  GET  /jobs/<id>?wait=30       job status")
+    print("  GET  /jobs/<id>/files/<name>  download a finished file")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print_success("Stopped serving")
+    finally:
+        server.server_close()
+        service.close()
 
 
 @task
@@ -765,7 +1700,17 @@ gf = Collection("gf")
 gf.add_task(bin)
 gf.add_task(baseplate)
 gf.add_task(drawer_fit)
+gf.add_task(layout)
+gf.add_task(cabinet)
+gf.add_task(fit_table)
 gf.add_task(new_project)
 gf.add_task(load)
+gf.add_task(watch)
+gf.add_task(render)
+gf.add_task(export_archive)
+gf.add_task(verify)
+gf.add_task(gc)
 gf.add_task(list_projects)
 gf.add_task(config)
+gf.add_task(shell)
+gf.add_task(serve)
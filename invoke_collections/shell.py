@@ -0,0 +1,136 @@
+"""Interactive shell that runs gf tasks in one warm process.
+
+Each `invoke gf.*` command starts Python and imports cadquery and OCP before
+doing any work, which often takes longer than the work itself once a part is
+in the BREP cache. The shell pays that once, keeps recently used solids (and
+the meshes made from them) in memory between commands, and runs tasks typed
+as they would be on the command line, with or without the gf. prefix.
+"""
+
+import cmd
+import shlex
+import time
+from typing import TextIO
+
+from invoke import Collection, Program
+
+from invoke_collections.helpers import format_task_help, print_error
+
+# Solids kept in memory between commands
+SHELL_MEMORY_CACHE_SIZE = 32
+
+# Tasks that make no sense inside the shell
+EXCLUDED_TASKS = ("shell",)
+
+
+class GfShell(cmd.Cmd):
+    """Read-eval loop over the tasks of a collection, with tab completion."""
+
+    intro = "gf shell - run tasks like: bin --length=2 --width=1 (help, exit)"
+    prompt = "gf> "
+
+    def __init__(
+        self,
+        collection: Collection,
+        stdin: TextIO | None = None,
+        stdout: TextIO | None = None,
+    ) -> None:
+        super().__init__(stdin=stdin, stdout=stdout)
+        self.collection = collection
+        self.program = Program(namespace=collection, name="gf", binary="gf")
+
+    @property
+    def task_names(self) -> list[str]:
+        """Names of the tasks the shell can run."""
+        return sorted(
+            name for name in self.collection.tasks if name not in EXCLUDED_TASKS
+        )
+
+    def preloop(self) -> None:
+        """Import the CAD libraries and keep solids in memory."""
+        from gridfinity_invoke import brep_cache, generators  # noqa: F401
+
+        brep_cache.MEMORY_CACHE_SIZE = SHELL_MEMORY_CACHE_SIZE
+        try:
+            import readline
+        except ImportError:
+            pass
+        else:
+            # Task names and options contain - and =, so only split on spaces
+            readline.set_completer_delims(" \t\n")
+
+    def postloop(self) -> None:
+        """Free the solids kept in memory."""
+        from gridfinity_invoke import brep_cache
+
+        brep_cache.MEMORY_CACHE_SIZE = 0
+        brep_cache.clear_memory_cache()
+
+    def default(self, line: str) -> None:
+        """Run a task, reporting how long it took."""
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            print_error(f"Invalid command: {e}")
+            return
+        name = args[0].removeprefix("gf.")
+        if name not in self.task_names:
+            print_error(f"Unknown task '{name}' - type help for a list")
+            return
+
+        start = time.monotonic()
+        try:
+            self.program.run(["gf", name, *args[1:]], exit=False)
+        except SystemExit:
+            pass  # Tasks print their errors before exiting
+        except Exception as e:
+            print_error(f"{name} failed: {e}")
+        print(f"({time.monotonic() - start:.2f}s)")
+
+    def emptyline(self) -> bool:
+        """Do nothing, rather than repeating the last command."""
+        return False
+
+    def do_help(self, arg: str) -> None:
+        """List the tasks, or show one task's options."""
+        if arg:
+            self.default(f"{arg} --help")
+            return
+        for name in self.task_names:
+            print(format_task_help(name, self.collection.tasks[name].__doc__))
+        print("exit - leave the shell")
+
+    def do_exit(self, arg: str) -> bool:
+        """Leave the shell."""
+        return True
+
+    do_quit = do_exit
+
+    def do_EOF(self, arg: str) -> bool:
+        """Leave the shell on end of input."""
+        print()
+        return True
+
+    def completenames(self, text: str, *ignored: object) -> list[str]:
+        """Complete task names."""
+        names = [*self.task_names, "help", "exit"]
+        return [name for name in names if name.startswith(text)]
+
+    def completedefault(
+        self, text: str, line: str, begidx: int, endidx: int
+    ) -> list[str]:
+        """Complete the options of the task being typed."""
+        name = line.split()[0].removeprefix("gf.")
+        if name not in self.task_names:
+            return []
+        options = [
+            f"--{argument.names[0]}" + ("" if argument.kind is bool else "=")
+            for argument in self.collection.tasks[name].get_arguments()
+        ]
+        return [option for option in options if option.startswith(text)]
+
+    def complete_help(
+        self, text: str, line: str, begidx: int, endidx: int
+    ) -> list[str]:
+        """Complete task names after help."""
+        return [name for name in self.task_names if name.startswith(text)]
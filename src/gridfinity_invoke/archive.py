@@ -0,0 +1,198 @@
+"""Streaming project archives for handing a project to the print room.
+
+A project is archived either as a zip of its output files or as a single
+3MF holding every mesh as a separate object. Both include the project's
+config.json and a manifest.json listing what was archived.
+
+Archives are written with a streaming zip writer: each file is compressed
+straight from disk (or from an in-memory render if it is missing) to the
+output stream in fixed-size chunks, so memory use does not grow with the
+size of the project and the output can be a pipe.
+"""
+
+import json
+import shutil
+import time
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+import numpy as np
+
+from gridfinity_invoke.mesh import (
+    THREEMF_MODEL_PATH,
+    THREEMF_RELS,
+    parse_stl,
+    read_stl,
+    write_3mf_model,
+)
+from gridfinity_invoke.outputs import component_outputs, render_component
+
+ARCHIVE_FORMATS = ("zip", "3mf")
+MANIFEST_NAME = "manifest.json"
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 3MF content types, with JSON added for the config and manifest parts
+ARCHIVE_3MF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" '
+    'ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '<Default Extension="json" ContentType="application/json"/>'
+    "</Types>"
+)
+ARCHIVE_3MF_METADATA_DIR = "Metadata"
+
+
+class ArchiveEntry(NamedTuple):
+    """A component output added to a project archive."""
+
+    name: str  # File name (zip) or object name (3MF)
+    component: str
+    rendered: bool  # True if rendered on the fly because the file was missing
+    size: int | None  # File size in bytes; None for 3MF objects
+
+
+def write_project_zip(
+    project: str, project_path: Path, config: dict[str, Any], stream: BinaryIO
+) -> list[ArchiveEntry]:
+    """Write a zip of every component output, the config and a manifest.
+
+    Files are stored under a folder named after the project. Outputs that
+    exist on disk are copied in chunks; components with missing outputs are
+    rendered in memory one file at a time.
+
+    Args:
+        project: Project name
+        project_path: Project directory
+        config: Project configuration
+        stream: Binary output stream; it does not need to be seekable
+
+    Returns:
+        The archived component outputs, in archive order
+    """
+    entries = []
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:
+        for component in config.get("components", []):
+            names = component_outputs(component)
+            paths = [project_path / name for name in names]
+            if all(path.is_file() for path in paths):
+                for path in paths:
+                    info = zipfile.ZipInfo.from_file(
+                        path, f"{project}/{path.name}", strict_timestamps=False
+                    )
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with path.open("rb") as src, zf.open(info, "w") as dest:
+                        shutil.copyfileobj(src, dest, COPY_CHUNK_SIZE)
+                    entries.append(
+                        ArchiveEntry(
+                            path.name, component["name"], False, info.file_size
+                        )
+                    )
+            else:
+                for name, buffer in render_component(component):
+                    _write_member(zf, f"{project}/{name}", buffer)
+                    entries.append(
+                        ArchiveEntry(name, component["name"], True, len(buffer))
+                    )
+
+        _write_member(zf, f"{project}/config.json", _json_bytes(config))
+        _write_member(
+            zf,
+            f"{project}/{MANIFEST_NAME}",
+            _json_bytes(_manifest(project, "zip", entries)),
+        )
+    return entries
+
+
+def write_project_3mf(
+    project: str, project_path: Path, config: dict[str, Any], stream: BinaryIO
+) -> list[ArchiveEntry]:
+    """Write a single 3MF with one mesh object per component STL.
+
+    Objects are named after their STL file and left at their own origins,
+    for the slicer to arrange. Meshes are read (or rendered, if the STL is
+    missing) and written one object at a time. The config and manifest are
+    stored as JSON parts under Metadata/.
+
+    Args:
+        project: Project name
+        project_path: Project directory
+        config: Project configuration
+        stream: Binary output stream; it does not need to be seekable
+
+    Returns:
+        The archived mesh objects, in object order
+    """
+    entries: list[ArchiveEntry] = []
+
+    def objects() -> Iterator[tuple[str, np.ndarray]]:
+        for component in config.get("components", []):
+            names = component_outputs(component, ["stl"])
+            paths = [project_path / name for name in names]
+            if all(path.is_file() for path in paths):
+                for path in paths:
+                    entries.append(
+                        ArchiveEntry(path.stem, component["name"], False, None)
+                    )
+                    yield path.stem, read_stl(path)
+            else:
+                for name, buffer in render_component(component, ["stl"]):
+                    stem = Path(name).stem
+                    entries.append(ArchiveEntry(stem, component["name"], True, None))
+                    yield stem, parse_stl(buffer, name)
+
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:
+        _write_member(zf, "[Content_Types].xml", ARCHIVE_3MF_CONTENT_TYPES.encode())
+        _write_member(zf, "_rels/.rels", THREEMF_RELS.encode())
+        # The model size is unknown until written, so allow it to exceed 4GB
+        info = _member_info(THREEMF_MODEL_PATH)
+        with zf.open(info, "w", force_zip64=True) as model:
+            write_3mf_model(model, objects())
+
+        _write_member(
+            zf, f"{ARCHIVE_3MF_METADATA_DIR}/config.json", _json_bytes(config)
+        )
+        _write_member(
+            zf,
+            f"{ARCHIVE_3MF_METADATA_DIR}/{MANIFEST_NAME}",
+            _json_bytes(_manifest(project, "3mf", entries)),
+        )
+    return entries
+
+
+def _manifest(
+    project: str, archive_format: str, entries: list[ArchiveEntry]
+) -> dict[str, Any]:
+    """Build the manifest describing an archive's contents."""
+    return {
+        "project": project,
+        "format": archive_format,
+        "files": [
+            {key: value for key, value in entry._asdict().items() if value is not None}
+            for entry in entries
+        ],
+    }
+
+
+def _json_bytes(data: dict[str, Any]) -> bytes:
+    """Encode a JSON document the way project configs are saved."""
+    return json.dumps(data, indent=2).encode()
+
+
+def _member_info(name: str) -> zipfile.ZipInfo:
+    """Create a compressed zip member stamped with the current time."""
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _write_member(zf: zipfile.ZipFile, name: str, data: bytes | memoryview) -> None:
+    """Write an in-memory file to a zip member."""
+    info = _member_info(name)
+    info.file_size = len(data)
+    with zf.open(info, "w") as dest:
+        dest.write(data)
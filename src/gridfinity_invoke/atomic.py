@@ -0,0 +1,83 @@
+"""Atomic output files that are only replaced when their contents change.
+
+Exports are written to a temporary file in the destination directory and
+then either discarded (if identical to the existing file) or moved into
+place with os.replace. Readers such as slicers watching the output folder
+never see a partial file, and unchanged files keep their modification time.
+
+Temporary files are hidden and named .<name>.<pid>.<random><suffix>, so the
+files of a process killed mid-write can be found with remove_temp_files.
+"""
+
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+COMPARE_CHUNK_SIZE = 1024 * 1024
+
+# mkstemp creates owner-only files; outputs get normal umask permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_output(path: str | Path) -> Iterator[Path]:
+    """Write a file atomically, leaving it untouched if nothing changed.
+
+    Yields a temporary path in the same directory. When the block finishes,
+    the temporary file replaces path, unless path already has exactly the
+    same contents, in which case it is discarded. If the block raises, the
+    temporary file is removed and path is left as it was.
+
+    Args:
+        path: Final output path
+
+    Yields:
+        Temporary path to write to (same directory and suffix as path)
+
+    Examples:
+        >>> with atomic_output("output/bin.stl") as temp_path:
+        ...     temp_path.write_bytes(data)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.{os.getpid()}.", suffix=path.suffix
+    )
+    os.close(fd)
+    temp_path = Path(temp_name)
+    temp_path.chmod(0o666 & ~_UMASK)
+    try:
+        yield temp_path
+        if path.is_file() and same_contents(temp_path, path):
+            temp_path.unlink()
+        else:
+            os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def remove_temp_files(directory: str | Path, pid: int) -> None:
+    """Remove temporary files a process killed mid-write left in a directory.
+
+    Args:
+        directory: Directory the process wrote to
+        pid: Process id of the stopped process
+    """
+    for temp_path in Path(directory).glob(f".*.{pid}.*"):
+        temp_path.unlink(missing_ok=True)
+
+
+def same_contents(a: str | Path, b: str | Path) -> bool:
+    """Check if two files have identical contents, comparing sizes first."""
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            chunk = fa.read(COMPARE_CHUNK_SIZE)
+            if chunk != fb.read(COMPARE_CHUNK_SIZE):
+                return False
+            if not chunk:
+                return True
@@ -0,0 +1,199 @@
+"""Checkpoint cache of rendered CAD solids.
+
+Rendering a component is by far the slowest step of generation, while
+tessellation and export are cheap. Rendered solids are saved as BREP files
+keyed by the component parameters and library versions, so re-exporting at a
+different tolerance or format only reloads the solid.
+
+Solids are always returned as loaded from their BREP file. Repeated renders
+of the same component can differ in floating-point noise, which is enough to
+flip a few triangles when meshing, so the checkpoint is the one version of
+the solid that every export meshes.
+
+The cache lives in the current workspace (see workspace.py). Loading an
+entry marks it as used, and each new entry drops the least recently used
+ones once the cache holds more than BREP_CACHE_MAX_BYTES, so entries left
+behind by old library versions don't pile up.
+
+Long-running processes such as gf.shell can also keep the most recently used
+solids in memory by setting MEMORY_CACHE_SIZE, so repeated exports skip even
+the BREP load and reuse the meshes already made from the same solid object
+(see generators.tessellate). Memory-cached solids are shared, so only turn
+it on in single-threaded processes.
+
+cadquery is imported only when a solid is loaded or rendered, since the
+workspace and manifest code import this module for its paths and versions.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.workspace import current_workspace
+
+if TYPE_CHECKING:
+    import cadquery as cq
+
+# Cache directory of the default workspace, and its size limit
+BREP_CACHE_DIR = Path(".gf-cache") / "brep"
+BREP_CACHE_MAX_BYTES = 2 * 1024**3
+
+# Libraries whose version changes the rendered geometry
+CACHE_KEY_PACKAGES = ("cqgridfinity", "cadquery")
+
+# Solids kept in memory, least recently used dropped first; 0 turns it off
+MEMORY_CACHE_SIZE = 0
+
+_memory_cache: "OrderedDict[Path, cq.Shape]" = OrderedDict()
+
+
+def cache_key(kind: str, params: dict[str, Any]) -> str:
+    """Build the cache key for a rendered component.
+
+    Args:
+        kind: Component kind, e.g. "bin" or "baseplate"
+        params: JSON-serializable render parameters
+
+    Returns:
+        Hex digest identifying the component, parameters and library versions
+    """
+    payload = json.dumps(
+        {"kind": kind, "params": params, "versions": library_versions()},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@functools.cache
+def library_versions() -> dict[str, str | None]:
+    """Get the installed version of each library that affects geometry.
+
+    Versions are looked up once per process; don't modify the result.
+
+    Returns:
+        Version string for each of CACHE_KEY_PACKAGES, or None if missing
+    """
+    versions: dict[str, str | None] = {}
+    for package in CACHE_KEY_PACKAGES:
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def render_cached(
+    kind: str,
+    params: dict[str, Any],
+    render: Callable[[], "cq.Workplane | cq.Shape | None"],
+) -> "cq.Shape | None":
+    """Load a rendered solid from the cache, rendering and saving it on a miss.
+
+    On a miss the solid is saved and then reloaded, so the first export
+    meshes exactly the same solid as later ones. Unreadable cache entries are
+    treated as misses and overwritten.
+
+    Args:
+        kind: Component kind, e.g. "bin" or "baseplate"
+        params: JSON-serializable render parameters
+        render: Renders the component; may return None if there is nothing
+            to render (None results are not cached)
+
+    Returns:
+        The rendered shape, or None if render returned None
+    """
+    import cadquery as cq
+
+    cache_dir = current_workspace().brep_cache_dir
+    path = cache_dir / f"{cache_key(kind, params)}.brep"
+    if path in _memory_cache:
+        _memory_cache.move_to_end(path)
+        return _memory_cache[path]
+
+    if path.exists():
+        try:
+            cached = cq.Shape.importBrep(str(path))
+        except ValueError:
+            pass  # Unreadable, or pruned by another process since
+        else:
+            _touch(path)
+            return _remember(path, cached)
+
+    result = render()
+    if result is None:
+        return None
+    shape = result.val() if isinstance(result, cq.Workplane) else result
+    if not isinstance(shape, cq.Shape):
+        raise TypeError(f"Render of {kind} gave {type(shape).__name__}, not a shape")
+
+    # Written atomically so concurrent renders never see partial files
+    try:
+        with atomic_output(path) as temp_path:
+            shape.exportBrep(str(temp_path))
+    except OSError:
+        return shape
+    prune_cache(cache_dir, BREP_CACHE_MAX_BYTES, keep=path)
+    return _remember(path, cq.Shape.importBrep(str(path)))
+
+
+def prune_cache(cache_dir: Path, max_bytes: int, keep: Path | None = None) -> int:
+    """Delete the least recently used cache entries beyond a total size.
+
+    Args:
+        cache_dir: BREP cache directory
+        max_bytes: Total size of entries to keep
+        keep: Entry never to delete, such as one just written
+
+    Returns:
+        Number of bytes deleted
+    """
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".brep") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+    except FileNotFoundError:
+        return 0
+
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted += size
+    return deleted
+
+
+def clear_memory_cache() -> None:
+    """Drop every solid kept in memory."""
+    _memory_cache.clear()
+
+
+def _touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # Read-only caches still work, just without pruning by use
+
+
+def _remember(path: Path, shape: "cq.Shape") -> "cq.Shape":
+    """Keep a solid loaded from the cache in memory, if that is turned on."""
+    if MEMORY_CACHE_SIZE > 0:
+        _memory_cache[path] = shape
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return shape
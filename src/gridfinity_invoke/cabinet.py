@@ -0,0 +1,200 @@
+"""Cabinet-scale drawer-fit generation for Gridfinity projects.
+
+Plans every drawer in a tool chest from one CSV of measurements, renders each
+distinct baseplate piece and spacer set once, and writes a folder per drawer
+plus a combined print list with quantities.
+"""
+
+import csv
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.generators import generate_unique_pieces, link_piece
+from gridfinity_invoke.planning import DrawerPlans, drawer_pieces, plan_drawers
+
+PIECES_DIR_NAME = "pieces"
+PRINT_LIST_NAME = "print-list.csv"
+
+# Names in the output directory that drawer folders can't use
+RESERVED_NAMES = (PIECES_DIR_NAME, PRINT_LIST_NAME)
+
+
+class DrawerMeasurement(NamedTuple):
+    """One drawer's name and inside dimensions."""
+
+    name: str
+    width_mm: float
+    depth_mm: float
+
+
+class PrintListEntry(NamedTuple):
+    """One distinct file to print and how many copies are needed."""
+
+    file: str  # Relative to the cabinet output directory
+    description: str
+    quantity: int
+
+
+class CabinetResult(NamedTuple):
+    """Result from generate_cabinet."""
+
+    plans: DrawerPlans
+    drawer_dirs: list[Path]
+    print_list: list[PrintListEntry]
+    print_list_path: Path
+
+
+def read_drawer_csv(path: str | Path) -> list[DrawerMeasurement]:
+    """Read drawer measurements from a CSV file.
+
+    The CSV needs width and depth columns (millimeters) and may have a name
+    column. Unnamed drawers are called drawer-1, drawer-2, etc. Each name
+    becomes a folder in the output directory, so it must be a plain file
+    name (no path separators or leading dot) and not one of RESERVED_NAMES.
+
+    Args:
+        path: Path to the CSV file.
+
+    Returns:
+        List of drawer measurements in file order.
+
+    Raises:
+        ValueError: If columns are missing, values are not numbers, or
+            drawer names are invalid or repeated.
+    """
+    drawers: list[DrawerMeasurement] = []
+    with Path(path).open(newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower() for name in reader.fieldnames or []}
+        if not {"width", "depth"} <= fields:
+            raise ValueError("CSV must have 'width' and 'depth' columns")
+
+        for line, row in enumerate(reader, start=2):
+            row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+            name = row.get("name") or f"drawer-{len(drawers) + 1}"
+            if name.startswith(".") or "/" in name or "\\" in name:
+                raise ValueError(
+                    f"Line {line}: drawer name '{name}' must be a plain folder name"
+                )
+            if name.lower() in RESERVED_NAMES:
+                raise ValueError(f"Line {line}: drawer name '{name}' is reserved")
+            try:
+                width_mm = float(row["width"])
+                depth_mm = float(row["depth"])
+            except ValueError:
+                raise ValueError(
+                    f"Line {line}: width and depth must be numbers"
+                ) from None
+            drawers.append(DrawerMeasurement(name, width_mm, depth_mm))
+
+    duplicates = [n for n, c in Counter(d.name for d in drawers).items() if c > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate drawer names: {', '.join(duplicates)}")
+
+    return drawers
+
+
+def generate_cabinet(
+    drawers: list[DrawerMeasurement],
+    output_dir: str | Path,
+    max_units: tuple[int, int],
+    workers: int | None = None,
+) -> CabinetResult:
+    """Generate split baseplates and spacers for every drawer in a cabinet.
+
+    All drawers are planned in a single vectorized pass. Identical baseplate
+    pieces and spacer sets are rendered once into {output_dir}/pieces/ and
+    linked into each drawer's folder as {name}-baseplate-N.stl (or
+    {name}-baseplate.stl for a single piece) and {name}-spacers.stl.
+
+    Args:
+        drawers: Drawer measurements
+        output_dir: Directory for the per-drawer folders and print list
+        max_units: Maximum printable (units_x, units_y)
+        workers: Number of render processes (default: CPU count)
+
+    Returns:
+        CabinetResult with plans, drawer folders and the print list
+
+    Raises:
+        ValueError: If any drawer is smaller than a 1x1 baseplate
+    """
+    output_dir = Path(output_dir)
+    pieces_dir = output_dir / PIECES_DIR_NAME
+
+    plans = plan_drawers(
+        [d.width_mm for d in drawers], [d.depth_mm for d in drawers], *max_units
+    )
+
+    pieces_per_drawer = [drawer_pieces(plans, i) for i in range(len(drawers))]
+    baseplate_counts = Counter(p for pieces in pieces_per_drawer for p in pieces)
+    spacer_counts = Counter(
+        (d.width_mm, d.depth_mm)
+        for d, needed in zip(drawers, plans.needs_spacers)
+        if needed
+    )
+
+    cache = generate_unique_pieces(
+        baseplate_counts, spacer_counts, pieces_dir, workers=workers
+    )
+
+    drawer_dirs = []
+    for drawer, pieces in zip(drawers, pieces_per_drawer):
+        drawer_dir = output_dir / drawer.name
+        drawer_dir.mkdir(parents=True, exist_ok=True)
+
+        if len(pieces) == 1:
+            link_piece(
+                cache.baseplates[pieces[0]], drawer_dir / f"{drawer.name}-baseplate.stl"
+            )
+        else:
+            for i, piece in enumerate(pieces, start=1):
+                link_piece(
+                    cache.baseplates[piece],
+                    drawer_dir / f"{drawer.name}-baseplate-{i}.stl",
+                )
+
+        spacer_path = cache.spacers.get((drawer.width_mm, drawer.depth_mm))
+        if spacer_path is not None:
+            link_piece(spacer_path, drawer_dir / f"{drawer.name}-spacers.stl")
+
+        drawer_dirs.append(drawer_dir)
+
+    print_list = [
+        PrintListEntry(
+            file=cache.baseplates[size].relative_to(output_dir).as_posix(),
+            description=f"{size[0]}x{size[1]} baseplate",
+            quantity=count,
+        )
+        for size, count in sorted(baseplate_counts.items())
+    ]
+    for size, count in sorted(spacer_counts.items()):
+        spacer_path = cache.spacers[size]
+        if spacer_path is None:
+            continue
+        # Each spacer STL is a half-set, so print it twice per drawer
+        print_list.append(
+            PrintListEntry(
+                file=spacer_path.relative_to(output_dir).as_posix(),
+                description=f"spacer half-set for {size[0]:g}x{size[1]:g}mm drawer",
+                quantity=count * 2,
+            )
+        )
+
+    print_list_path = output_dir / PRINT_LIST_NAME
+    with (
+        atomic_output(print_list_path) as temp_path,
+        temp_path.open("w", newline="") as f,
+    ):
+        writer = csv.writer(f)
+        writer.writerow(PrintListEntry._fields)
+        writer.writerows(print_list)
+
+    return CabinetResult(
+        plans=plans,
+        drawer_dirs=drawer_dirs,
+        print_list=print_list,
+        print_list_path=print_list_path,
+    )
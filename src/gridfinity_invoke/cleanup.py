@@ -0,0 +1,122 @@
+"""Garbage collection of orphaned project outputs.
+
+Renamed or replaced components, and drawer-fits that change how their
+baseplate is split, leave their old files behind in the project directory.
+The expected files of a project are derived from its config, and anything
+else in the directory is an orphan, except hidden temporary files of
+writes that may still be in progress.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from gridfinity_invoke.manifest import MANIFEST_NAME, load_manifest, save_manifest
+from gridfinity_invoke.outputs import component_outputs
+from gridfinity_invoke.projects import (
+    JOURNAL_NAME,
+    get_project_path,
+    load_project_config,
+    update_project_index,
+)
+from gridfinity_invoke.workspace import Workspace
+
+# Project files that are not component outputs
+PROJECT_METADATA_FILES = ("config.json", JOURNAL_NAME, MANIFEST_NAME)
+
+# Hidden files younger than this may be another process's write in progress
+# (atomic_output writes to .<name>.<random> before replacing the file)
+TEMP_FILE_GRACE_SECONDS = 60 * 60
+
+
+class Orphan(NamedTuple):
+    """A file in a project directory that no component produces."""
+
+    path: Path
+    size: int
+
+
+def expected_files(config: dict[str, Any]) -> set[str]:
+    """Get the names of every file a project directory should contain.
+
+    Drawer-fit assembly previews are included, since gf.load writes them
+    on request.
+
+    Args:
+        config: Project configuration
+
+    Returns:
+        File names relative to the project directory
+    """
+    expected = set(PROJECT_METADATA_FILES)
+    for component in config.get("components", []):
+        expected.update(component_outputs(component))
+        if component["type"] == "drawer-fit":
+            expected.add(f"{component['name']}-assembly.stl")
+    return expected
+
+
+def find_orphans(project: str, workspace: Workspace | None = None) -> list[Orphan]:
+    """Find files in a project directory that its config does not produce.
+
+    Only the top level of the directory is scanned, with os.scandir so file
+    sizes come from the directory listing where the OS provides them. Hidden
+    files modified in the last TEMP_FILE_GRACE_SECONDS are skipped, so a
+    render running at the same time keeps its temporary files.
+
+    Args:
+        project: Project name
+        workspace: Workspace holding the project
+
+    Returns:
+        Orphaned files sorted by name
+
+    Raises:
+        FileNotFoundError: If the project or its config doesn't exist
+    """
+    expected = expected_files(load_project_config(project, workspace))
+    orphans = []
+    cutoff = time.time() - TEMP_FILE_GRACE_SECONDS
+    with os.scandir(get_project_path(project, workspace)) as entries:
+        for entry in entries:
+            if entry.name in expected or not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if entry.name.startswith(".") and stat.st_mtime > cutoff:
+                continue
+            orphans.append(Orphan(Path(entry.path), stat.st_size))
+    return sorted(orphans, key=lambda orphan: orphan.path.name)
+
+
+def remove_orphans(
+    project: str, orphans: list[Orphan], workspace: Workspace | None = None
+) -> int:
+    """Delete orphaned files and drop them from the project manifest.
+
+    Args:
+        project: Project name
+        orphans: Files from find_orphans
+        workspace: Workspace holding the project
+
+    Returns:
+        Bytes reclaimed
+    """
+    reclaimed = 0
+    for orphan in orphans:
+        try:
+            orphan.path.unlink()
+        except FileNotFoundError:
+            continue
+        reclaimed += orphan.size
+
+    manifest = load_manifest(project, workspace)
+    removed = {orphan.path.name for orphan in orphans}
+    if removed & manifest["files"].keys():
+        for name in removed:
+            manifest["files"].pop(name, None)
+        save_manifest(project, manifest, workspace)
+    if reclaimed:
+        update_project_index(project, workspace)
+
+    return reclaimed
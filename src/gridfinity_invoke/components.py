@@ -0,0 +1,670 @@
+"""Typed project components.
+
+Project configs store components as JSON objects. parse_component turns
+each one into an immutable dataclass of its type, validating it once, so
+code working on a loaded project never needs dict lookups or type checks.
+Components are hashable by value and to_dict gives back the canonical JSON
+object, with defaults left out as the tasks write them.
+
+COMPONENT_TYPES maps each "type" in the config to its parser; a new
+component type is a frozen dataclass with from_dict, to_dict, describe,
+outputs, render and generate, plus an entry there.
+
+Parsing and listing outputs don't need the CAD libraries, so the generators
+are only imported when rendering.
+
+generate_components renders many components at once in a process pool, for
+projects whose components were added with --defer and rendered later.
+"""
+
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+from gridfinity_invoke.layout import Placement
+from gridfinity_invoke.mesh import EXPORT_FORMATS
+from gridfinity_invoke.planning import (
+    OutlineGrid,
+    fit_drawer,
+    parse_outline,
+    parse_rects,
+    polygon_to_outline_grid,
+    rects_to_outline_grid,
+)
+from gridfinity_invoke.projects import load_project_config
+from gridfinity_invoke.workspace import Workspace, current_workspace, use_workspace
+
+DEFAULT_FORMATS = ("stl",)
+
+
+@dataclass(frozen=True, slots=True)
+class BinComponent:
+    """A bin, in gridfinity units."""
+
+    TYPE: ClassVar[str] = "bin"
+
+    name: str
+    length: int
+    width: int
+    height: int
+    tolerance: float | None = None  # None for the default STL_TOLERANCE
+    formats: tuple[str, ...] = DEFAULT_FORMATS
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BinComponent":
+        """Validate and build a bin from its config."""
+        return cls(
+            name=data["name"],
+            length=_units(data, "length"),
+            width=_units(data, "width"),
+            height=_units(data, "height"),
+            tolerance=_tolerance(data),
+            formats=_formats(data),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the config object for this bin."""
+        data = {
+            "name": self.name,
+            "type": self.TYPE,
+            "length": self.length,
+            "width": self.width,
+            "height": self.height,
+        }
+        return _with_export_options(data, self.tolerance, self.formats)
+
+    def describe(self) -> str | None:
+        """Describe the bin for progress messages."""
+        return f"{self.length}x{self.width}x{self.height}"
+
+    def outputs(self, formats: Sequence[str] | None = None) -> list[str]:
+        """Get the file names the bin writes, in render order."""
+        return [f"{self.name}.{fmt}" for fmt in formats or self.formats]
+
+    def render(
+        self, formats: Sequence[str] | None = None
+    ) -> Iterator[tuple[str, memoryview]]:
+        """Render the bin's files in memory, one file at a time."""
+        from gridfinity_invoke.generators import STL_TOLERANCE, render_bin_bytes
+
+        for fmt in formats or self.formats:
+            yield (
+                f"{self.name}.{fmt}",
+                render_bin_bytes(
+                    self.length,
+                    self.width,
+                    self.height,
+                    fmt,
+                    self.tolerance or STL_TOLERANCE,
+                ),
+            )
+
+    def generate(self, project_path: Path, preview: bool = False) -> Path | None:
+        """Write the bin's files to the project directory."""
+        from gridfinity_invoke.generators import STL_TOLERANCE, generate_bin
+
+        generate_bin(
+            self.length,
+            self.width,
+            self.height,
+            project_path / f"{self.name}.stl",
+            self.tolerance or STL_TOLERANCE,
+            self.formats,
+        )
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class BaseplateComponent:
+    """A baseplate, in gridfinity units."""
+
+    TYPE: ClassVar[str] = "baseplate"
+
+    name: str
+    length: int
+    width: int
+    tolerance: float | None = None  # None for the default STL_TOLERANCE
+    formats: tuple[str, ...] = DEFAULT_FORMATS
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BaseplateComponent":
+        """Validate and build a baseplate from its config."""
+        return cls(
+            name=data["name"],
+            length=_units(data, "length"),
+            width=_units(data, "width"),
+            tolerance=_tolerance(data),
+            formats=_formats(data),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the config object for this baseplate."""
+        data = {
+            "name": self.name,
+            "type": self.TYPE,
+            "length": self.length,
+            "width": self.width,
+        }
+        return _with_export_options(data, self.tolerance, self.formats)
+
+    def describe(self) -> str | None:
+        """Describe the baseplate for progress messages."""
+        return f"{self.length}x{self.width}"
+
+    def outputs(self, formats: Sequence[str] | None = None) -> list[str]:
+        """Get the file names the baseplate writes, in render order."""
+        return [f"{self.name}.{fmt}" for fmt in formats or self.formats]
+
+    def render(
+        self, formats: Sequence[str] | None = None
+    ) -> Iterator[tuple[str, memoryview]]:
+        """Render the baseplate's files in memory, one file at a time."""
+        from gridfinity_invoke.generators import STL_TOLERANCE, render_baseplate_bytes
+
+        for fmt in formats or self.formats:
+            yield (
+                f"{self.name}.{fmt}",
+                render_baseplate_bytes(
+                    self.length, self.width, fmt, self.tolerance or STL_TOLERANCE
+                ),
+            )
+
+    def generate(self, project_path: Path, preview: bool = False) -> Path | None:
+        """Write the baseplate's files to the project directory."""
+        from gridfinity_invoke.generators import STL_TOLERANCE, generate_baseplate
+
+        generate_baseplate(
+            self.length,
+            self.width,
+            project_path / f"{self.name}.stl",
+            self.tolerance or STL_TOLERANCE,
+            self.formats,
+        )
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class DrawerFitComponent:
+    """A baseplate and spacers fitted to a rectangular drawer."""
+
+    TYPE: ClassVar[str] = "drawer-fit"
+
+    name: str
+    width_mm: float
+    depth_mm: float
+    units_width: int | None = None
+    units_depth: int | None = None
+    split_count: int = 0  # Number of baseplate pieces, 0 if not split
+    formats: tuple[str, ...] = DEFAULT_FORMATS
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "DrawerFitComponent":
+        """Validate and build a rectangular drawer-fit from its config."""
+        return cls(
+            name=data["name"],
+            width_mm=_millimeters(data, "width_mm"),
+            depth_mm=_millimeters(data, "depth_mm"),
+            units_width=_optional_units(data, "units_width"),
+            units_depth=_optional_units(data, "units_depth"),
+            split_count=_optional_units(data, "split_count") or 0,
+            formats=_formats(data),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the config object for this drawer-fit."""
+        data: dict[str, Any] = {
+            "name": self.name,
+            "type": self.TYPE,
+            "width_mm": self.width_mm,
+            "depth_mm": self.depth_mm,
+        }
+        if self.units_width is not None:
+            data["units_width"] = self.units_width
+        if self.units_depth is not None:
+            data["units_depth"] = self.units_depth
+        if self.split_count:
+            data["split_count"] = self.split_count
+        return _with_export_options(data, None, self.formats)
+
+    def describe(self) -> str | None:
+        """Describe the drawer-fit for progress messages."""
+        return f"{self.width_mm}x{self.depth_mm}mm"
+
+    def outputs(self, formats: Sequence[str] | None = None) -> list[str]:
+        """Get the file names the drawer-fit writes, in render order.
+
+        The assembly preview isn't included, since it's only written on
+        request.
+        """
+        if self.split_count:
+            stems = [f"baseplate-{i}" for i in range(1, self.split_count + 1)]
+        else:
+            stems = ["baseplate"]
+        if fit_drawer(self.width_mm, self.depth_mm).needs_spacers:
+            stems.append("spacers")
+        return [
+            f"{self.name}-{stem}.{fmt}"
+            for stem in stems
+            for fmt in formats or self.formats
+        ]
+
+    def render(
+        self, formats: Sequence[str] | None = None
+    ) -> Iterator[tuple[str, memoryview]]:
+        """Render the drawer-fit's files in memory, one piece at a time."""
+        from gridfinity_invoke.generators import iter_drawer_fit_files
+
+        for file_name, buffer in iter_drawer_fit_files(
+            self.width_mm,
+            self.depth_mm,
+            self.split_count,
+            formats or self.formats,
+        ):
+            yield f"{self.name}-{file_name}", buffer
+
+    def generate(self, project_path: Path, preview: bool = False) -> Path | None:
+        """Write the baseplate and spacer files, and optionally a preview."""
+        from gridfinity_invoke.generators import (
+            calculate_baseplate_splits,
+            generate_drawer_assembly,
+            generate_drawer_fit,
+            generate_split_drawer_fit,
+        )
+
+        spacer_path = project_path / f"{self.name}-spacers.stl"
+        formats = self.formats
+        if preview:
+            # The assembly preview is built from the STL pieces
+            formats = ("stl", *(fmt for fmt in formats if fmt != "stl"))
+        if self.split_count:
+            result, baseplate_paths = generate_split_drawer_fit(
+                self.width_mm,
+                self.depth_mm,
+                project_path,
+                f"{self.name}-baseplate",
+                spacer_path,
+                formats,
+            )
+            splits = calculate_baseplate_splits(result.units_width, result.units_depth)
+        else:
+            result = generate_drawer_fit(
+                self.width_mm,
+                self.depth_mm,
+                project_path / f"{self.name}-baseplate.stl",
+                spacer_path,
+                formats,
+            )
+            splits = [(result.units_width, result.units_depth)]
+            baseplate_paths = [result.baseplate_path]
+
+        if not preview:
+            return None
+        assembly_path = project_path / f"{self.name}-assembly.stl"
+        return generate_drawer_assembly(result, splits, baseplate_paths, assembly_path)
+
+
+@dataclass(frozen=True, slots=True)
+class OutlineFitComponent:
+    """Baseplate pieces fitted to an L-shaped or multi-rectangle drawer."""
+
+    TYPE: ClassVar[str] = "drawer-fit"
+
+    name: str
+    outline: str | None  # Polygon outline, if given as one
+    rects: str | None  # Rectangle list, if given as one
+    split_count: int
+    rects_units: tuple[tuple[int, int, int, int], ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "OutlineFitComponent":
+        """Validate and build an outline drawer-fit from its config."""
+        outline, rects = data.get("outline"), data.get("rects")
+        if (outline is None) == (rects is None):
+            raise ValueError("needs exactly one of 'outline' and 'rects'")
+        text = outline if outline is not None else rects
+        if not isinstance(text, str):
+            raise ValueError("'outline' and 'rects' must be strings")
+        (parse_outline if outline is not None else parse_rects)(text)
+        return cls(
+            name=data["name"],
+            outline=outline,
+            rects=rects,
+            split_count=_units(data, "split_count"),
+            rects_units=tuple(
+                _rect_units(rect) for rect in data.get("rects_units", [])
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the config object for this drawer-fit."""
+        data: dict[str, Any] = {"name": self.name, "type": self.TYPE}
+        if self.outline is not None:
+            data["outline"] = self.outline
+        else:
+            data["rects"] = self.rects
+        data["rects_units"] = [list(rect) for rect in self.rects_units]
+        data["split_count"] = self.split_count
+        return data
+
+    def describe(self) -> str | None:
+        """Describe the drawer-fit for progress messages."""
+        return "outline"
+
+    def outputs(self, formats: Sequence[str] | None = None) -> list[str]:
+        """Get the file names the drawer-fit writes, in render order.
+
+        Pieces are always numbered, even if there is only one. The assembly
+        preview isn't included, since it's only written on request.
+        """
+        return [
+            f"{self.name}-baseplate-{i}.{fmt}"
+            for i in range(1, self.split_count + 1)
+            for fmt in formats or DEFAULT_FORMATS
+        ]
+
+    def render(
+        self, formats: Sequence[str] | None = None
+    ) -> Iterator[tuple[str, memoryview]]:
+        """Render the drawer-fit's pieces in memory, one file at a time."""
+        from gridfinity_invoke.generators import outline_pieces, render_baseplate_bytes
+
+        for i, piece in enumerate(outline_pieces(self._grid().rects), start=1):
+            for fmt in formats or DEFAULT_FORMATS:
+                yield (
+                    f"{self.name}-baseplate-{i}.{fmt}",
+                    render_baseplate_bytes(piece.units_width, piece.units_depth, fmt),
+                )
+
+    def generate(self, project_path: Path, preview: bool = False) -> Path | None:
+        """Write the baseplate pieces, and optionally an assembly preview."""
+        from gridfinity_invoke.generators import (
+            generate_outline_assembly,
+            generate_outline_fit,
+        )
+
+        grid = self._grid()
+        result = generate_outline_fit(grid, project_path, f"{self.name}-baseplate")
+        if not preview:
+            return None
+        assembly_path = project_path / f"{self.name}-assembly.stl"
+        return generate_outline_assembly(result, assembly_path)
+
+    def _grid(self) -> OutlineGrid:
+        """Fit the drawer's outline or rectangles to the gridfinity grid."""
+        if self.outline is not None:
+            return polygon_to_outline_grid(parse_outline(self.outline))
+        return rects_to_outline_grid(parse_rects(self.rects or ""))
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutComponent:
+    """Bin placements in a drawer grid; it has no files of its own."""
+
+    TYPE: ClassVar[str] = "layout"
+
+    name: str
+    drawer: str | None  # Drawer-fit component the grid size came from
+    units_width: int
+    units_depth: int
+    placements: tuple[Placement, ...]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LayoutComponent":
+        """Validate and build a layout from its config."""
+        drawer = data.get("drawer")
+        if drawer is not None and not isinstance(drawer, str):
+            raise ValueError("'drawer' must be a component name")
+        try:
+            placements = tuple(Placement(**p) for p in data.get("placements", []))
+        except TypeError as e:
+            raise ValueError(f"invalid placement: {e}") from e
+        return cls(
+            name=data["name"],
+            drawer=drawer,
+            units_width=_units(data, "units_width"),
+            units_depth=_units(data, "units_depth"),
+            placements=placements,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the config object for this layout."""
+        return {
+            "name": self.name,
+            "type": self.TYPE,
+            "drawer": self.drawer,
+            "units_width": self.units_width,
+            "units_depth": self.units_depth,
+            "placements": [p._asdict() for p in self.placements],
+        }
+
+    def describe(self) -> str | None:
+        """Layouts have no files, so nothing is reported when generating."""
+        return None
+
+    def outputs(self, formats: Sequence[str] | None = None) -> list[str]:
+        """Layouts have no files."""
+        return []
+
+    def render(
+        self, formats: Sequence[str] | None = None
+    ) -> Iterator[tuple[str, memoryview]]:
+        """Layouts have no files to render."""
+        return iter(())
+
+    def generate(self, project_path: Path, preview: bool = False) -> Path | None:
+        """Layouts have no files to generate."""
+        return None
+
+
+Component = (
+    BinComponent
+    | BaseplateComponent
+    | DrawerFitComponent
+    | OutlineFitComponent
+    | LayoutComponent
+)
+
+
+def _drawer_fit_from_dict(
+    data: dict[str, Any],
+) -> DrawerFitComponent | OutlineFitComponent:
+    """Build a drawer-fit component, which is either rectangular or an outline."""
+    if "outline" in data or "rects" in data:
+        return OutlineFitComponent.from_dict(data)
+    return DrawerFitComponent.from_dict(data)
+
+
+# Parsers for each component "type" in project configs
+COMPONENT_TYPES: dict[str, Callable[[dict[str, Any]], Component]] = {
+    BinComponent.TYPE: BinComponent.from_dict,
+    BaseplateComponent.TYPE: BaseplateComponent.from_dict,
+    "drawer-fit": _drawer_fit_from_dict,
+    LayoutComponent.TYPE: LayoutComponent.from_dict,
+}
+
+
+def parse_component(data: dict[str, Any]) -> Component:
+    """Validate a component from a project config and build its typed form.
+
+    Keys a component type doesn't use are ignored.
+
+    Args:
+        data: Component object from a project config
+
+    Returns:
+        The typed component
+
+    Raises:
+        ValueError: If the component is missing fields, has an unknown type
+            or has invalid values
+    """
+    name = data.get("name")
+    if not isinstance(name, str) or not name:
+        raise ValueError("Component without a name")
+    component_type = data.get("type")
+    parser = (
+        COMPONENT_TYPES.get(component_type) if isinstance(component_type, str) else None
+    )
+    if parser is None:
+        raise ValueError(
+            f"Component '{name}': unknown type {component_type!r}, "
+            f"expected one of {', '.join(COMPONENT_TYPES)}"
+        )
+    try:
+        return parser(data)
+    except KeyError as e:
+        raise ValueError(f"Component '{name}': missing {e}") from None
+    except ValueError as e:
+        raise ValueError(f"Component '{name}': {e}") from None
+
+
+def load_components(
+    project: str, workspace: Workspace | None = None
+) -> list[Component]:
+    """Load and validate every component of a project.
+
+    Args:
+        project: Project name
+        workspace: Workspace holding the project
+
+    Returns:
+        Components in config order
+
+    Raises:
+        FileNotFoundError: If the project or config doesn't exist
+        ValueError: If a component is invalid, or two share a name
+    """
+    components = [
+        parse_component(data)
+        for data in load_project_config(project, workspace).get("components", [])
+    ]
+    names = [component.name for component in components]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate component names: {', '.join(duplicates)}")
+    return components
+
+
+def generate_components(
+    components: Iterable[Component],
+    project_path: Path,
+    preview: bool = False,
+    workers: int | None = None,
+    workspace: Workspace | None = None,
+) -> Iterator[Component]:
+    """Render components in parallel, yielding each one as it finishes.
+
+    Renders run in a process pool since CAD rendering is CPU bound. If one
+    fails, renders that haven't started are cancelled.
+
+    Args:
+        components: Components to render
+        project_path: Project directory to write the files to
+        preview: Also write drawer-fit assembly previews
+        workers: Number of worker processes (default: CPU count)
+        workspace: Workspace whose printer config and cache to use
+
+    Yields:
+        Each component once its files are written, in completion order
+
+    Raises:
+        Exception: The first error raised by a render
+    """
+    components = list(components)
+    if not components:
+        return
+    workspace = workspace or current_workspace()
+
+    max_workers = min(workers or os.cpu_count() or 1, len(components))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_generate_in, workspace, component, project_path, preview): (
+                component
+            )
+            for component in components
+        }
+        try:
+            for future in as_completed(futures):
+                future.result()
+                yield futures[future]
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def _generate_in(
+    workspace: Workspace, component: Component, project_path: Path, preview: bool
+) -> None:
+    """Render a component in a worker process, in the caller's workspace."""
+    with use_workspace(workspace):
+        component.generate(project_path, preview)
+
+
+def _units(data: dict[str, Any], key: str) -> int:
+    """Get a positive whole number of units (or pieces) from a config."""
+    value = data[key]
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"'{key}' must be a positive integer, got {value!r}")
+    return value
+
+
+def _optional_units(data: dict[str, Any], key: str) -> int | None:
+    """Get a positive whole number of units from a config, if it's there."""
+    return None if data.get(key) is None else _units(data, key)
+
+
+def _millimeters(data: dict[str, Any], key: str) -> float:
+    """Get a positive length in millimeters from a config."""
+    value = data[key]
+    if not isinstance(value, int | float) or isinstance(value, bool) or value <= 0:
+        raise ValueError(f"'{key}' must be a positive number, got {value!r}")
+    return float(value)
+
+
+def _tolerance(data: dict[str, Any]) -> float | None:
+    """Get the optional tessellation tolerance from a config."""
+    value = data.get("tolerance")
+    if value is None:
+        return None
+    if not isinstance(value, int | float) or isinstance(value, bool) or value <= 0:
+        raise ValueError(f"'tolerance' must be a positive number, got {value!r}")
+    return float(value)
+
+
+def _formats(data: dict[str, Any]) -> tuple[str, ...]:
+    """Get the export formats from a config, defaulting to STL only."""
+    formats = data.get("formats", list(DEFAULT_FORMATS))
+    if (
+        not isinstance(formats, list)
+        or not formats
+        or any(fmt not in EXPORT_FORMATS for fmt in formats)
+    ):
+        raise ValueError(
+            f"'formats' must be a list of {', '.join(EXPORT_FORMATS)}, got {formats!r}"
+        )
+    return tuple(formats)
+
+
+def _rect_units(value: object) -> tuple[int, int, int, int]:
+    """Get an x, y, width, depth rectangle in units from a config."""
+    if (
+        not isinstance(value, list)
+        or len(value) != 4
+        or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)
+    ):
+        raise ValueError(f"'rects_units' entries must be 4 integers, got {value!r}")
+    x, y, width, depth = value
+    return (x, y, width, depth)
+
+
+def _with_export_options(
+    data: dict[str, Any], tolerance: float | None, formats: tuple[str, ...]
+) -> dict[str, Any]:
+    """Add tolerance and formats to a config object unless they're defaults."""
+    if tolerance is not None:
+        data["tolerance"] = tolerance
+    if formats != DEFAULT_FORMATS:
+        data["formats"] = list(formats)
+    return data
@@ -1,67 +1,100 @@
 """Printer configuration module for Gridfinity projects.
 
-Handles printer bed dimensions and configuration persistence.
+Handles printer bed dimensions and configuration persistence. Each function
+works on the given workspace, or the current one (see workspace.py).
 """
 
 import json
 from pathlib import Path
+from typing import Any
 
-# Configuration file and defaults
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.workspace import Workspace, current_workspace
+
+# Configuration file of the default workspace, and defaults
 CONFIG_FILE = Path(".gf-config")
 DEFAULT_BED_WIDTH = 225
 DEFAULT_BED_DEPTH = 225
 
 
-def load_printer_config() -> dict:
+def load_printer_config(workspace: Workspace | None = None) -> dict[str, Any]:
     """Load printer configuration from .gf-config file.
 
+    The parsed file is cached on the workspace and only read again when its
+    mtime or size changes.
+
+    Args:
+        workspace: Workspace to read from (default: the current workspace).
+
     Returns:
         Dictionary with print_bed_width_mm and print_bed_depth_mm keys.
         Returns defaults if file doesn't exist.
     """
+    workspace = workspace or current_workspace()
     try:
-        config_data = json.loads(CONFIG_FILE.read_text())
-        return config_data
+        stat = workspace.config_file.stat()
     except FileNotFoundError:
         return {
             "print_bed_width_mm": DEFAULT_BED_WIDTH,
             "print_bed_depth_mm": DEFAULT_BED_DEPTH,
         }
 
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = workspace.printer_config_cache
+    if cached is None or cached[0] != signature:
+        config_data = json.loads(workspace.config_file.read_text())
+        workspace.printer_config_cache = cached = (signature, config_data)
+    return dict(cached[1])
+
 
-def save_printer_config(config: dict) -> None:
+def save_printer_config(
+    config: dict[str, Any], workspace: Workspace | None = None
+) -> None:
     """Save printer configuration to .gf-config file.
 
     Args:
         config: Dictionary with printer configuration values.
+        workspace: Workspace to save to (default: the current workspace).
     """
-    CONFIG_FILE.write_text(json.dumps(config, indent=2))
+    workspace = workspace or current_workspace()
+    with atomic_output(workspace.config_file) as temp_path:
+        temp_path.write_text(json.dumps(config, indent=2))
+    # Don't rely on the mtime alone: a rewrite can land in the same tick
+    workspace.printer_config_cache = None
 
 
-def get_print_bed_dimensions() -> tuple[int, int]:
+def get_print_bed_dimensions(workspace: Workspace | None = None) -> tuple[int, int]:
     """Get print bed dimensions from configuration.
 
+    Args:
+        workspace: Workspace to read from (default: the current workspace).
+
     Returns:
         Tuple of (width_mm, depth_mm) as integers.
     """
-    config = load_printer_config()
+    config = load_printer_config(workspace)
     return (
         config["print_bed_width_mm"],
         config["print_bed_depth_mm"],
     )
 
 
-def ensure_printer_config() -> None:
+def ensure_printer_config(workspace: Workspace | None = None) -> None:
     """Ensure printer configuration exists, prompting user if missing.
 
     If .gf-config file doesn't exist, interactively prompts the user
     for printer dimensions and saves them to the config file.
     If config already exists, uses it silently and logs a message.
+
+    Args:
+        workspace: Workspace to check (default: the current workspace).
     """
+    workspace = workspace or current_workspace()
+
     # Check if config file exists
-    if CONFIG_FILE.exists():
+    if workspace.config_file.exists():
         # Config exists, use it silently
-        config = load_printer_config()
+        config = load_printer_config(workspace)
         width = config["print_bed_width_mm"]
         depth = config["print_bed_depth_mm"]
         print(f"Using printer config: {width}mm x {depth}mm print bed")
@@ -94,7 +127,7 @@ def ensure_printer_config() -> None:
         "print_bed_width_mm": width,
         "print_bed_depth_mm": depth,
     }
-    save_printer_config(config)
+    save_printer_config(config, workspace)
 
     print()
     print_success("Configuration saved to .gf-config")
@@ -1,15 +1,67 @@
 """Gridfinity component generation using cqgridfinity."""
 
+import io
+import os
+import shutil
+import tempfile
+import weakref
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import NamedTuple
-
-from cqgridfinity import GridfinityBaseplate, GridfinityBox, GridfinityDrawerSpacer
-
+from typing import Any, NamedTuple, TypeVar
+
+import cadquery as cq
+import numpy as np
+from cqgridfinity import (
+    GR_BASE_HEIGHT,
+    GridfinityBaseplate,
+    GridfinityBox,
+    GridfinityDrawerSpacer,
+)
+from OCP.BRep import BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.Interface import Interface_Static
+from OCP.STEPControl import STEPControl_AsIs, STEPControl_Writer
+from OCP.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS, TopoDS_Shape
+
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.brep_cache import render_cached
 from gridfinity_invoke.config import get_print_bed_dimensions
-
-# Gridfinity standard constants
-GRIDFINITY_UNIT_MM = 42  # 1 gridfinity unit = 42mm
-MIN_SPACER_GAP_MM = 4  # cqgridfinity threshold for spacer generation
+from gridfinity_invoke.mesh import (
+    EXPORT_FORMATS,
+    MESH_FORMATS,
+    box_triangles,
+    read_stl,
+    stl_buffer,
+    threemf_buffer,
+    translate,
+    write_buffer,
+    write_stl,
+)
+from gridfinity_invoke.planning import (
+    GRIDFINITY_UNIT_MM,
+    MIN_SPACER_GAP_MM,
+    DrawerFit,
+    GridRect,
+    OutlineGrid,
+    fit_drawer,
+)
+from gridfinity_invoke.workspace import Workspace, current_workspace, use_workspace
+
+# Tessellation settings for STL export (same as cadquery's exportStl defaults)
+STL_TOLERANCE = 1e-3  # Linear deflection, relative to each edge's size
+STL_ANGULAR_TOLERANCE = 0.1  # Angular deflection in radians
+
+T = TypeVar("T")
+
+# Meshes of each live solid by (tolerance, angular tolerance)
+_meshes: weakref.WeakKeyDictionary[cq.Shape, dict[tuple[float, float], np.ndarray]] = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def get_max_units() -> tuple[int, int]:
@@ -24,6 +76,223 @@ def get_max_units() -> tuple[int, int]:
     return (max_units_x, max_units_y)
 
 
+def tessellate(
+    shape: cq.Workplane | cq.Shape,
+    tolerance: float = STL_TOLERANCE,
+    angular_tolerance: float = STL_ANGULAR_TOLERANCE,
+) -> np.ndarray:
+    """Mesh a rendered shape into triangles.
+
+    Faces are meshed in parallel by OCP's BRepMesh_IncrementalMesh, then each
+    face's triangulation is collected with reversed faces flipped so every
+    triangle winds outward. OCP only exposes triangulations node by node, so
+    collecting them costs a little more than cadquery's exportStl, which
+    writes them from C++; what this buys is control over the tolerances and
+    a mesh that can be exported in any format without meshing again.
+
+    Meshes are remembered for as long as the shape object lives, so exporting
+    the same solid again (say, one kept in memory by gf.shell) at the same
+    tolerance doesn't mesh it twice.
+
+    Args:
+        shape: Rendered workplane (e.g. from render()) or shape
+        tolerance: Linear deflection, relative to each edge's size
+        angular_tolerance: Angular deflection in radians
+
+    Returns:
+        Read-only array of shape (n, 3, 3) holding the three vertices of each
+        triangle
+    """
+    solid = _as_shape(shape)
+    meshes = _meshes.setdefault(solid, {})
+    key = (tolerance, angular_tolerance)
+    if key not in meshes:
+        meshes[key] = _mesh(solid.wrapped, tolerance, angular_tolerance)
+    return meshes[key]
+
+
+def export_stl(
+    shape: cq.Workplane | cq.Shape,
+    output_path: str | Path,
+    tolerance: float = STL_TOLERANCE,
+    angular_tolerance: float = STL_ANGULAR_TOLERANCE,
+) -> Path:
+    """Mesh a rendered shape and write it as a binary STL file.
+
+    Args:
+        shape: Rendered workplane (e.g. from render()) or shape
+        output_path: Path to write the STL file
+        tolerance: Linear deflection, relative to each edge's size
+        angular_tolerance: Angular deflection in radians
+
+    Returns:
+        Path to the written STL file
+    """
+    return write_stl(output_path, tessellate(shape, tolerance, angular_tolerance))
+
+
+def parse_formats(text: str) -> list[str]:
+    """Parse a format list such as "stl,step,3mf".
+
+    Raises:
+        ValueError: If a format is not one of EXPORT_FORMATS or none are given
+    """
+    formats: list[str] = []
+    for name in text.split(","):
+        name = name.strip().lower().lstrip(".")
+        if not name:
+            continue
+        if name not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown format '{name}', expected one of {', '.join(EXPORT_FORMATS)}"
+            )
+        if name not in formats:
+            formats.append(name)
+    if not formats:
+        raise ValueError("At least one format is required")
+    return formats
+
+
+def serialize_shape(
+    shape: cq.Workplane | cq.Shape,
+    formats: Sequence[str] = ("stl",),
+    tolerance: float = STL_TOLERANCE,
+) -> list[memoryview]:
+    """Serialize a rendered shape to in-memory files in one or more formats.
+
+    STL and 3MF share a single tessellation. The buffers can be written to
+    a socket or archive as they are, without a temporary file.
+
+    Args:
+        shape: Rendered workplane (e.g. from render()) or shape
+        formats: Formats from EXPORT_FORMATS
+        tolerance: Linear tessellation deflection for mesh formats
+
+    Returns:
+        File contents, in the order of formats
+
+    Raises:
+        ValueError: If a format is not one of EXPORT_FORMATS
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format '{unknown[0]}'")
+
+    solid = _as_shape(shape)
+    triangles = np.zeros((0, 3, 3))
+    if any(fmt in MESH_FORMATS for fmt in formats):
+        triangles = tessellate(solid, tolerance)
+
+    serializers: dict[str, Callable[[], memoryview]] = {
+        "stl": lambda: stl_buffer(triangles),
+        "3mf": lambda: threemf_buffer(triangles),
+        "step": lambda: _step_buffer(solid),
+        "brep": lambda: _brep_buffer(solid),
+    }
+    return [serializers[fmt]() for fmt in formats]
+
+
+def export_shape(
+    shape: cq.Workplane | cq.Shape,
+    output_path: str | Path,
+    formats: Sequence[str] = ("stl",),
+    tolerance: float = STL_TOLERANCE,
+) -> list[Path]:
+    """Write a rendered shape in one or more formats.
+
+    Each format is written next to output_path with its own extension, so
+    "bin.stl" with formats ("stl", "step") gives bin.stl and bin.step. Files
+    are serialized by serialize_shape, one after another, since OCP's STEP
+    and BREP writers hold the GIL and gain nothing from threads. Every file
+    is written atomically and left untouched if unchanged.
+
+    Args:
+        shape: Rendered workplane (e.g. from render()) or shape
+        output_path: Output path; its extension is replaced per format
+        formats: Formats from EXPORT_FORMATS
+        tolerance: Linear tessellation deflection for mesh formats
+
+    Returns:
+        Written file paths, in the order of formats
+
+    Raises:
+        ValueError: If a format is not one of EXPORT_FORMATS
+    """
+    buffers = serialize_shape(shape, formats, tolerance)
+    output_path = Path(output_path)
+    return [
+        write_buffer(output_path.with_suffix(f".{fmt}"), buffer)
+        for fmt, buffer in zip(formats, buffers)
+    ]
+
+
+def render_bin_bytes(
+    length: int,
+    width: int,
+    height: int,
+    fmt: str = "stl",
+    tolerance: float = STL_TOLERANCE,
+) -> memoryview:
+    """Render a Gridfinity bin to an in-memory file.
+
+    Args:
+        length: Length in gridfinity units (1 unit = 42mm)
+        width: Width in gridfinity units
+        height: Height in gridfinity units (1 unit = 7mm)
+        fmt: Format from EXPORT_FORMATS
+        tolerance: Linear tessellation deflection, relative to edge size
+
+    Returns:
+        File contents in the requested format
+
+    Raises:
+        ValueError: If dimensions are not positive integers or the format
+            is unknown
+    """
+    _check_units(length, width, height)
+    return serialize_shape(_render_bin(length, width, height), [fmt], tolerance)[0]
+
+
+def render_baseplate_bytes(
+    length: int,
+    width: int,
+    fmt: str = "stl",
+    tolerance: float = STL_TOLERANCE,
+) -> memoryview:
+    """Render a Gridfinity baseplate to an in-memory file.
+
+    Args:
+        length: Length in gridfinity units (1 unit = 42mm)
+        width: Width in gridfinity units
+        fmt: Format from EXPORT_FORMATS
+        tolerance: Linear tessellation deflection, relative to edge size
+
+    Returns:
+        File contents in the requested format
+
+    Raises:
+        ValueError: If dimensions are not positive integers or the format
+            is unknown
+    """
+    _check_units(length, width)
+    return serialize_shape(_render_baseplate(length, width), [fmt], tolerance)[0]
+
+
+class PieceCache(NamedTuple):
+    """Rendered pieces from generate_unique_pieces, keyed by their parameters."""
+
+    baseplates: dict[tuple[int, int], Path]  # (width, depth) units -> STL
+    spacers: dict[tuple[float, float], Path | None]  # (width, depth) mm -> STL
+
+
+class OutlineFitResult(NamedTuple):
+    """Result from generate_outline_fit."""
+
+    grid: OutlineGrid
+    baseplate_paths: list[Path]
+    pieces: list[GridRect]  # Grid placement of each piece, same order as paths
+
+
 class DrawerFitResult(NamedTuple):
     """Result from generate_drawer_fit containing paths and calculation metadata."""
 
@@ -42,63 +311,63 @@ def generate_bin(
     width: int,
     height: int,
     output_path: str | Path,
+    tolerance: float = STL_TOLERANCE,
+    formats: Sequence[str] = ("stl",),
 ) -> Path:
     """Generate a Gridfinity bin and export to STL.
 
+    The rendered solid is cached, so re-exporting the same bin at another
+    tolerance or format skips the CAD build.
+
     Args:
         length: Length in gridfinity units (1 unit = 42mm)
         width: Width in gridfinity units
         height: Height in gridfinity units (1 unit = 7mm)
         output_path: Path to write the STL file
+        tolerance: Linear tessellation deflection, relative to edge size
+        formats: Export formats; each is written next to output_path
 
     Returns:
-        Path to the generated STL file
+        Path to the generated file for the first format (the STL by default)
 
     Raises:
         ValueError: If dimensions are not positive integers
     """
-    if length < 1 or width < 1 or height < 1:
-        raise ValueError("All dimensions must be positive integers >= 1")
-
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    box = GridfinityBox(length, width, height)
-    result = box.render()
-    result.val().exportStl(str(output_path))  # pyrefly: ignore[missing-attribute]
-
-    return output_path
+    _check_units(length, width, height)
+    return export_shape(
+        _render_bin(length, width, height), output_path, formats, tolerance
+    )[0]
 
 
 def generate_baseplate(
     length: int,
     width: int,
     output_path: str | Path,
+    tolerance: float = STL_TOLERANCE,
+    formats: Sequence[str] = ("stl",),
 ) -> Path:
     """Generate a Gridfinity baseplate and export to STL.
 
+    The rendered solid is cached, so re-exporting the same baseplate at
+    another tolerance or format skips the CAD build.
+
     Args:
         length: Length in gridfinity units (1 unit = 42mm)
         width: Width in gridfinity units
         output_path: Path to write the STL file
+        tolerance: Linear tessellation deflection, relative to edge size
+        formats: Export formats; each is written next to output_path
 
     Returns:
-        Path to the generated STL file
+        Path to the generated file for the first format (the STL by default)
 
     Raises:
         ValueError: If dimensions are not positive integers
     """
-    if length < 1 or width < 1:
-        raise ValueError("All dimensions must be positive integers >= 1")
-
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    baseplate = GridfinityBaseplate(length, width)
-    result = baseplate.render()
-    result.val().exportStl(str(output_path))  # pyrefly: ignore[missing-attribute]
-
-    return output_path
+    _check_units(length, width)
+    return export_shape(
+        _render_baseplate(length, width), output_path, formats, tolerance
+    )[0]
 
 
 def calculate_baseplate_splits(units_x: int, units_y: int) -> list[tuple[int, int]]:
@@ -155,8 +424,36 @@ def calculate_baseplate_splits(units_x: int, units_y: int) -> list[tuple[int, in
     return splits
 
 
+def split_positions(
+    splits: list[tuple[int, int]], units_x: int
+) -> list[tuple[int, int]]:
+    """Get the grid position of each piece from calculate_baseplate_splits.
+
+    Args:
+        splits: Piece sizes in calculate_baseplate_splits order
+        units_x: Total width in gridfinity units that was split
+
+    Returns:
+        List of (x, y) unit offsets of each piece's front-left corner
+    """
+    positions = []
+    offset_x = 0
+    offset_y = 0
+    for width, depth in splits:
+        positions.append((offset_x, offset_y))
+        offset_x += width
+        # Pieces are laid out row by row
+        if offset_x >= units_x:
+            offset_x = 0
+            offset_y += depth
+    return positions
+
+
 def generate_split_baseplates(
-    splits: list[tuple[int, int]], output_dir: Path, base_name: str
+    splits: list[tuple[int, int]],
+    output_dir: Path,
+    base_name: str,
+    formats: Sequence[str] = ("stl",),
 ) -> list[Path]:
     """Generate multiple baseplate STL files from split calculations.
 
@@ -169,9 +466,10 @@ def generate_split_baseplates(
         output_dir: Directory to write the STL files
         base_name: Base name for the files (e.g., "baseplate" or
             "drawer-fit-530x247mm-baseplate")
+        formats: Export formats for each piece
 
     Returns:
-        List of paths to the generated STL files
+        List of paths to the generated files for the first format
 
     Examples:
         >>> splits = [(5, 5), (5, 5), (2, 5)]
@@ -188,20 +486,85 @@ def generate_split_baseplates(
         output_path = output_dir / f"{base_name}-{i}.stl"
 
         # Generate baseplate with these dimensions
-        baseplate = GridfinityBaseplate(width, depth)
-        result = baseplate.render()
-        result.val().exportStl(str(output_path))  # pyrefly: ignore[missing-attribute]
+        paths = export_shape(_render_baseplate(width, depth), output_path, formats)
 
-        result_paths.append(output_path)
+        result_paths.append(paths[0])
 
     return result_paths
 
 
+def generate_unique_pieces(
+    baseplate_sizes: Iterable[tuple[int, int]],
+    spacer_sizes: Iterable[tuple[float, float]],
+    output_dir: str | Path,
+    workers: int | None = None,
+    workspace: Workspace | None = None,
+) -> PieceCache:
+    """Render each distinct baseplate piece and spacer set once, in parallel.
+
+    Renders run in a process pool since CAD rendering is CPU bound. Files are
+    named baseplate-{w}x{d}.stl and spacers-{w}x{d}mm.stl.
+
+    Args:
+        baseplate_sizes: (width, depth) baseplate sizes in units; duplicates
+            are rendered once
+        spacer_sizes: (width, depth) drawer sizes in millimeters needing
+            spacers; duplicates are rendered once
+        output_dir: Directory to write the STL files
+        workers: Number of worker processes (default: CPU count)
+        workspace: Workspace whose render cache the workers use
+
+    Returns:
+        PieceCache mapping each requested size to its STL path. Spacer entries
+        are None if cqgridfinity decided no spacers were needed.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    unique_baseplates = sorted(set(baseplate_sizes))
+    unique_spacers = sorted(set(spacer_sizes))
+    if not unique_baseplates and not unique_spacers:
+        return PieceCache(baseplates={}, spacers={})
+    workspace = workspace or current_workspace()
+
+    max_workers = min(
+        workers or os.cpu_count() or 1, len(unique_baseplates) + len(unique_spacers)
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        baseplate_futures = {
+            size: pool.submit(
+                _call_in,
+                workspace,
+                generate_baseplate,
+                size[0],
+                size[1],
+                output_dir / f"baseplate-{size[0]}x{size[1]}.stl",
+            )
+            for size in unique_baseplates
+        }
+        spacer_futures = {}
+        for width_mm, depth_mm in unique_spacers:
+            spacer_futures[(width_mm, depth_mm)] = pool.submit(
+                _call_in,
+                workspace,
+                _generate_spacers,
+                width_mm,
+                depth_mm,
+                output_dir / f"spacers-{width_mm:g}x{depth_mm:g}mm.stl",
+            )
+
+        return PieceCache(
+            baseplates={size: f.result() for size, f in baseplate_futures.items()},
+            spacers={size: f.result() for size, f in spacer_futures.items()},
+        )
+
+
 def generate_drawer_fit(
     width_mm: float,
     depth_mm: float,
     baseplate_path: Path,
     spacer_path: Path,
+    formats: Sequence[str] = ("stl",),
 ) -> DrawerFitResult:
     """Generate a complete drawer-fit solution from drawer dimensions.
 
@@ -218,6 +581,7 @@ def generate_drawer_fit(
         depth_mm: Drawer depth (Y dimension) in millimeters
         baseplate_path: Path to write the baseplate STL file
         spacer_path: Path to write the spacer STL file (if needed)
+        formats: Export formats; the result paths are for the first format
 
     Returns:
         DrawerFitResult with paths and calculation metadata
@@ -225,62 +589,478 @@ def generate_drawer_fit(
     Raises:
         ValueError: If either dimension is less than 42mm (minimum for 1x1 baseplate)
     """
-    # Validate minimum dimensions
-    if width_mm < GRIDFINITY_UNIT_MM:
-        raise ValueError(
-            f"Width must be at least {GRIDFINITY_UNIT_MM}mm to fit a 1-unit baseplate"
-        )
-    if depth_mm < GRIDFINITY_UNIT_MM:
-        raise ValueError(
-            f"Depth must be at least {GRIDFINITY_UNIT_MM}mm to fit a 1-unit baseplate"
+    fit = fit_drawer(width_mm, depth_mm)
+
+    # Generate baseplate
+    baseplate_path = Path(baseplate_path)
+    baseplate_path.parent.mkdir(parents=True, exist_ok=True)
+
+    baseplate_path = export_shape(
+        _render_baseplate(fit.units_width, fit.units_depth), baseplate_path, formats
+    )[0]
+
+    spacer_result_path = _generate_spacers(width_mm, depth_mm, spacer_path, formats)
+    return _drawer_fit_result(fit, baseplate_path, spacer_result_path)
+
+
+def generate_split_drawer_fit(
+    width_mm: float,
+    depth_mm: float,
+    output_dir: Path,
+    base_name: str,
+    spacer_path: Path,
+    formats: Sequence[str] = ("stl",),
+) -> tuple[DrawerFitResult, list[Path]]:
+    """Generate a drawer-fit solution with the baseplate split into printable pieces.
+
+    The baseplate is split using calculate_baseplate_splits and each piece is
+    written as {base_name}-1.stl, {base_name}-2.stl, etc. Spacers are generated
+    for the full drawer dimensions, as in generate_drawer_fit.
+
+    Args:
+        width_mm: Drawer width (X dimension) in millimeters
+        depth_mm: Drawer depth (Y dimension) in millimeters
+        output_dir: Directory to write the baseplate piece STL files
+        base_name: Base name for the baseplate pieces
+        spacer_path: Path to write the spacer STL file (if needed)
+        formats: Export formats; returned paths are for the first format
+
+    Returns:
+        Tuple of (DrawerFitResult, piece paths). The result's baseplate_path
+        is the first piece.
+
+    Raises:
+        ValueError: If either dimension is less than 42mm (minimum for 1x1 baseplate)
+    """
+    fit = fit_drawer(width_mm, depth_mm)
+
+    splits = calculate_baseplate_splits(fit.units_width, fit.units_depth)
+    baseplate_paths = generate_split_baseplates(splits, output_dir, base_name, formats)
+
+    spacer_result_path = _generate_spacers(width_mm, depth_mm, spacer_path, formats)
+    result = _drawer_fit_result(fit, baseplate_paths[0], spacer_result_path)
+    return result, baseplate_paths
+
+
+def iter_drawer_fit_files(
+    width_mm: float,
+    depth_mm: float,
+    split_count: int = 0,
+    formats: Sequence[str] = ("stl",),
+) -> Iterator[tuple[str, memoryview]]:
+    """Render a drawer-fit solution to in-memory files, one piece at a time.
+
+    Pieces are named like the files of generate_drawer_fit and
+    generate_split_drawer_fit: baseplate.stl (or baseplate-1.stl,
+    baseplate-2.stl, ... when split) and spacers.stl if spacers are needed.
+    Each piece is rendered only when the iterator reaches it, so callers
+    can stream pieces out without holding the whole set in memory.
+
+    Args:
+        width_mm: Drawer width (X dimension) in millimeters
+        depth_mm: Drawer depth (Y dimension) in millimeters
+        split_count: Number of pieces the baseplate was split into with
+            calculate_baseplate_splits, as recorded in the project config,
+            or 0 if it isn't split
+        formats: Export formats; each piece is yielded once per format
+
+    Yields:
+        (file name, file contents) for each piece and format
+
+    Raises:
+        ValueError: If either dimension is less than 42mm (minimum for 1x1
+            baseplate), the current print bed no longer splits the baseplate
+            into split_count pieces, or a format is unknown
+    """
+    fit = fit_drawer(width_mm, depth_mm)
+
+    if split_count:
+        splits = calculate_baseplate_splits(fit.units_width, fit.units_depth)
+        if len(splits) != split_count:
+            raise ValueError(
+                f"Baseplate was split into {split_count} pieces, but the current "
+                f"print bed splits it into {len(splits)}; generate it again"
+            )
+        pieces = [(f"baseplate-{i}", size) for i, size in enumerate(splits, start=1)]
+    else:
+        pieces = [("baseplate", (fit.units_width, fit.units_depth))]
+
+    for name, (width, depth) in pieces:
+        buffers = serialize_shape(_render_baseplate(width, depth), formats)
+        for fmt, buffer in zip(formats, buffers):
+            yield f"{name}.{fmt}", buffer
+
+    spacers = _render_spacers(width_mm, depth_mm)
+    if spacers is not None:
+        for fmt, buffer in zip(formats, serialize_shape(spacers, formats)):
+            yield f"spacers.{fmt}", buffer
+
+
+def generate_drawer_assembly(
+    result: DrawerFitResult,
+    splits: list[tuple[int, int]],
+    baseplate_paths: list[Path],
+    output_path: str | Path,
+) -> Path:
+    """Combine generated drawer-fit STLs into a single assembly preview.
+
+    Each baseplate piece is read back from disk and translated to its grid
+    position inside the drawer, so no CAD rendering is involved. Spacers are
+    shown as blocks filling the margins around the baseplate, since the spacer
+    STL itself is laid out for printing rather than in its installed position.
+
+    Args:
+        result: DrawerFitResult describing the drawer and its gaps
+        splits: Piece sizes in calculate_baseplate_splits order. Use a
+            single-item list for an unsplit baseplate.
+        baseplate_paths: STL paths for each piece, in the same order as splits
+        output_path: Path to write the assembly STL file
+
+    Returns:
+        Path to the generated assembly STL file
+    """
+    margin_x = result.gap_x_mm / 2
+    margin_y = result.gap_y_mm / 2
+
+    positions = split_positions(splits, result.units_width)
+    parts = _place_pieces(
+        [
+            (path, margin_x + x * GRIDFINITY_UNIT_MM, margin_y + y * GRIDFINITY_UNIT_MM)
+            for path, (x, y) in zip(baseplate_paths, positions)
+        ]
+    )
+
+    if result.spacer_path is not None:
+        drawer_width = result.actual_width_mm + result.gap_x_mm
+        drawer_depth = result.actual_depth_mm + result.gap_y_mm
+        height = GR_BASE_HEIGHT
+
+        if margin_x > MIN_SPACER_GAP_MM:
+            # Left/right spacers run the full drawer depth
+            right_x = drawer_width - margin_x
+            parts.append(box_triangles(0, 0, margin_x, drawer_depth, height))
+            parts.append(box_triangles(right_x, 0, drawer_width, drawer_depth, height))
+
+        if margin_y > MIN_SPACER_GAP_MM:
+            # Front/back spacers fill the space between the left/right spacers
+            start_x = margin_x if margin_x > MIN_SPACER_GAP_MM else 0
+            end_x = drawer_width - start_x
+            back_y = drawer_depth - margin_y
+            parts.append(box_triangles(start_x, 0, end_x, margin_y, height))
+            parts.append(box_triangles(start_x, back_y, end_x, drawer_depth, height))
+
+    return write_stl(output_path, np.concatenate(parts))
+
+
+def generate_outline_fit(
+    grid: OutlineGrid,
+    output_dir: str | Path,
+    base_name: str,
+    workers: int | None = None,
+) -> OutlineFitResult:
+    """Generate baseplate pieces for an irregular drawer outline.
+
+    Each rectangle of the outline grid is split with calculate_baseplate_splits.
+    Identical pieces across all rectangles are rendered once and written as
+    {base_name}-1.stl, {base_name}-2.stl, etc.
+
+    Spacers are not generated, since cqgridfinity spacers only support
+    rectangular drawers.
+
+    Args:
+        grid: Outline grid from polygon_to_outline_grid or rects_to_outline_grid
+        output_dir: Directory to write the STL files
+        base_name: Base name for the baseplate pieces
+        workers: Number of render processes (default: CPU count)
+
+    Returns:
+        OutlineFitResult with the piece paths and their grid placements
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    pieces = outline_pieces(grid.rects)
+    baseplate_paths = []
+    with tempfile.TemporaryDirectory(dir=output_dir) as cache_dir:
+        cache = generate_unique_pieces(
+            {(p.units_width, p.units_depth) for p in pieces},
+            [],
+            cache_dir,
+            workers=workers,
         )
+        for i, piece in enumerate(pieces, start=1):
+            path = output_dir / f"{base_name}-{i}.stl"
+            link_piece(cache.baseplates[(piece.units_width, piece.units_depth)], path)
+            baseplate_paths.append(path)
 
-    # Convert mm to gridfinity units (floor division for conservative fit)
-    units_width = int(width_mm // GRIDFINITY_UNIT_MM)
-    units_depth = int(depth_mm // GRIDFINITY_UNIT_MM)
+    return OutlineFitResult(grid=grid, baseplate_paths=baseplate_paths, pieces=pieces)
 
-    # Calculate actual dimensions
-    actual_width_mm = float(units_width * GRIDFINITY_UNIT_MM)
-    actual_depth_mm = float(units_depth * GRIDFINITY_UNIT_MM)
 
-    # Calculate gaps
-    gap_x_mm = width_mm - actual_width_mm
-    gap_y_mm = depth_mm - actual_depth_mm
+def outline_pieces(rects: Iterable[GridRect]) -> list[GridRect]:
+    """Split each rectangle of an outline grid into printable pieces.
 
-    # Generate baseplate
-    baseplate_path = Path(baseplate_path)
-    baseplate_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        rects: Rectangles from an OutlineGrid
+
+    Returns:
+        Grid placement of each piece, in the order generate_outline_fit
+        numbers them
+    """
+    pieces = []
+    for rect in rects:
+        splits = calculate_baseplate_splits(rect.units_width, rect.units_depth)
+        for (x, y), (width, depth) in zip(
+            split_positions(splits, rect.units_width), splits
+        ):
+            pieces.append(GridRect(rect.x + x, rect.y + y, width, depth))
+    return pieces
+
+
+def generate_outline_assembly(
+    result: OutlineFitResult, output_path: str | Path
+) -> Path:
+    """Combine an outline fit's pieces into a single assembly preview STL.
+
+    Args:
+        result: OutlineFitResult from generate_outline_fit
+        output_path: Path to write the assembly STL file
+
+    Returns:
+        Path to the generated assembly STL file
+    """
+    origin_x, origin_y = result.grid.origin_mm
+    parts = _place_pieces(
+        [
+            (
+                path,
+                origin_x + piece.x * GRIDFINITY_UNIT_MM,
+                origin_y + piece.y * GRIDFINITY_UNIT_MM,
+            )
+            for path, piece in zip(result.baseplate_paths, result.pieces)
+        ]
+    )
+    return write_stl(output_path, np.concatenate(parts))
+
+
+def link_piece(source: Path, destination: Path) -> None:
+    """Hard link a rendered piece to another name, copying if unsupported.
+
+    An existing destination with the same contents is left untouched.
+    """
+    with atomic_output(destination) as temp_path:
+        temp_path.unlink()
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            shutil.copyfile(source, temp_path)
 
-    baseplate = GridfinityBaseplate(units_width, units_depth)
-    result = baseplate.render()
-    result.val().exportStl(str(baseplate_path))  # pyrefly: ignore[missing-attribute]
 
-    # Generate spacers only if gap is large enough
-    # cqgridfinity uses min_margin=4 as threshold (gap per side must exceed 4mm)
-    # Total gap / 2 gives per-side gap; both X and Y must have sufficient margin
-    spacer_result_path: Path | None = None
-    per_side_gap_x = gap_x_mm / 2
-    per_side_gap_y = gap_y_mm / 2
+def prerender_bin(length: int, width: int, height: int) -> None:
+    """Render a bin solid into the BREP cache, for generate_bin to load later.
 
-    if per_side_gap_x > MIN_SPACER_GAP_MM or per_side_gap_y > MIN_SPACER_GAP_MM:
-        spacer_path = Path(spacer_path)
-        spacer_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        length: Length in gridfinity units
+        width: Width in gridfinity units
+        height: Height in gridfinity units
+    """
+    _render_bin(length, width, height)
 
-        spacer = GridfinityDrawerSpacer(dr_width=width_mm, dr_depth=depth_mm)
-        spacer_obj = spacer.render_half_set()
 
-        if spacer_obj is not None:
-            # pyrefly: ignore[missing-attribute]
-            spacer_obj.val().exportStl(str(spacer_path))
-            spacer_result_path = spacer_path
+def prerender_baseplate(length: int, width: int) -> None:
+    """Render a baseplate solid into the BREP cache, for the generators to load.
+
+    Args:
+        length: Length in gridfinity units
+        width: Width in gridfinity units
+    """
+    _render_baseplate(length, width)
+
+
+def prerender_spacers(width_mm: float, depth_mm: float) -> None:
+    """Render a drawer's spacer half-set into the BREP cache, if it needs one.
+
+    Args:
+        width_mm: Drawer width (X dimension) in millimeters
+        depth_mm: Drawer depth (Y dimension) in millimeters
+    """
+    _render_spacers(width_mm, depth_mm)
+
+
+def _mesh(
+    wrapped: TopoDS_Shape, tolerance: float, angular_tolerance: float
+) -> np.ndarray:
+    """Mesh an OCP shape into a read-only array of triangles."""
+    # Drop any earlier mesh so a coarser tolerance takes effect
+    BRepTools.Clean_s(wrapped)
+    BRepMesh_IncrementalMesh(wrapped, tolerance, True, angular_tolerance, True)
+
+    # OCP only hands out nodes and triangles one at a time, so the Python
+    # side does no more than that: locations are applied and faces joined
+    # in NumPy, once per face and once per shape
+    nodes = []
+    faces = []
+    node_count = 0
+    explorer = TopExp_Explorer(wrapped, TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        explorer.Next()
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation_s(face, location)
+        if triangulation is None:
+            continue
+
+        face_nodes = np.array(
+            [
+                triangulation.Node(i).Coord()
+                for i in range(1, triangulation.NbNodes() + 1)
+            ]
+        )
+        if not location.IsIdentity():
+            transform = location.Transformation()
+            matrix = np.array(
+                [[transform.Value(r, c) for c in range(1, 5)] for r in range(1, 4)]
+            )
+            face_nodes = face_nodes @ matrix[:, :3].T + matrix[:, 3]
+        indices = np.array(
+            [
+                triangulation.Triangle(i).Get()
+                for i in range(1, triangulation.NbTriangles() + 1)
+            ]
+        )
+        if face.Orientation() == TopAbs_REVERSED:
+            indices = indices[:, [0, 2, 1]]
+        # Triangle indices are 1-based within the face
+        faces.append(indices + (node_count - 1))
+        nodes.append(face_nodes)
+        node_count += len(face_nodes)
+
+    triangles = (
+        np.concatenate(nodes)[np.concatenate(faces)] if faces else np.zeros((0, 3, 3))
+    )
+    triangles.flags.writeable = False
+    return triangles
+
 
+def _drawer_fit_result(
+    fit: DrawerFit, baseplate_path: Path, spacer_path: Path | None
+) -> DrawerFitResult:
+    """Build a drawer-fit result from the fit and the files written for it."""
     return DrawerFitResult(
         baseplate_path=baseplate_path,
-        spacer_path=spacer_result_path,
-        units_width=units_width,
-        units_depth=units_depth,
-        actual_width_mm=actual_width_mm,
-        actual_depth_mm=actual_depth_mm,
-        gap_x_mm=gap_x_mm,
-        gap_y_mm=gap_y_mm,
+        spacer_path=spacer_path,
+        units_width=fit.units_width,
+        units_depth=fit.units_depth,
+        actual_width_mm=float(fit.units_width * GRIDFINITY_UNIT_MM),
+        actual_depth_mm=float(fit.units_depth * GRIDFINITY_UNIT_MM),
+        gap_x_mm=fit.gap_x_mm,
+        gap_y_mm=fit.gap_y_mm,
+    )
+
+
+def _call_in(workspace: Workspace, function: Callable[..., T], *args: Any) -> T:
+    """Call a function in a worker process, in the caller's workspace."""
+    with use_workspace(workspace):
+        return function(*args)
+
+
+def _check_units(*units: int) -> None:
+    """Check gridfinity unit dimensions are positive integers."""
+    if any(u < 1 for u in units):
+        raise ValueError("All dimensions must be positive integers >= 1")
+
+
+def _step_buffer(solid: cq.Shape) -> memoryview:
+    """Serialize a solid as STEP in millimeters, like cadquery's exportStep."""
+    writer = STEPControl_Writer()
+    Interface_Static.SetIVal_s("write.surfacecurve.mode", 1)
+    Interface_Static.SetIVal_s("write.precision.mode", 0)
+    Interface_Static.SetCVal_s("xstep.cascade.unit", "MM")
+    Interface_Static.SetCVal_s("write.step.unit", "MM")
+    writer.Transfer(solid.wrapped, STEPControl_AsIs)
+    stream = io.BytesIO()
+    writer.WriteStream(stream)
+    return stream.getbuffer()
+
+
+def _brep_buffer(solid: cq.Shape) -> memoryview:
+    """Serialize a solid in OCP's native BREP format."""
+    stream = io.BytesIO()
+    solid.exportBrep(stream)
+    return stream.getbuffer()
+
+
+def _as_shape(shape: cq.Workplane | cq.Shape) -> cq.Shape:
+    """Get the first shape from a rendered workplane, or the shape itself."""
+    value = shape.val() if isinstance(shape, cq.Workplane) else shape
+    if not isinstance(value, cq.Shape):
+        raise TypeError(f"expected a shape, got {type(value).__name__}")
+    return value
+
+
+def _render_bin(length: int, width: int, height: int) -> cq.Shape:
+    """Render a bin solid, reusing the BREP cache."""
+    shape = render_cached(
+        "bin",
+        {"length": length, "width": width, "height": height},
+        GridfinityBox(length, width, height).render,
+    )
+    assert shape is not None
+    return shape
+
+
+def _render_baseplate(length: int, width: int) -> cq.Shape:
+    """Render a baseplate solid, reusing the BREP cache."""
+    shape = render_cached(
+        "baseplate",
+        {"length": length, "width": width},
+        GridfinityBaseplate(length, width).render,
+    )
+    assert shape is not None
+    return shape
+
+
+def _place_pieces(placements: list[tuple[Path, float, float]]) -> list[np.ndarray]:
+    """Read piece STLs and move each one's minimum corner to (x, y, 0)."""
+    parts = []
+    for path, x, y in placements:
+        triangles = read_stl(path)
+        origin = triangles.reshape(-1, 3).min(axis=0)
+        parts.append(translate(triangles, (x - origin[0], y - origin[1], -origin[2])))
+    return parts
+
+
+def _generate_spacers(
+    width_mm: float,
+    depth_mm: float,
+    spacer_path: str | Path,
+    formats: Sequence[str] = ("stl",),
+) -> Path | None:
+    """Generate the spacer half-set STL if the drawer gaps are large enough.
+
+    Args:
+        width_mm: Drawer width (X dimension) in millimeters
+        depth_mm: Drawer depth (Y dimension) in millimeters
+        spacer_path: Path to write the spacer STL file
+        formats: Export formats; the returned path is for the first format
+
+    Returns:
+        Path to the spacer file, or None if no spacers are needed
+    """
+    spacer_obj = _render_spacers(width_mm, depth_mm)
+    if spacer_obj is None:
+        return None
+
+    return export_shape(spacer_obj, spacer_path, formats)[0]
+
+
+def _render_spacers(width_mm: float, depth_mm: float) -> cq.Shape | None:
+    """Render the spacer half-set, or None if the gaps are too small."""
+    # cqgridfinity only makes spacers when a per-side gap exceeds its 4mm margin
+    if not fit_drawer(width_mm, depth_mm).needs_spacers:
+        return None
+
+    return render_cached(
+        "spacers",
+        {"width_mm": width_mm, "depth_mm": depth_mm},
+        GridfinityDrawerSpacer(dr_width=width_mm, dr_depth=depth_mm).render_half_set,
     )
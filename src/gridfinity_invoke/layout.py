@@ -0,0 +1,329 @@
+"""Bin layout solver for packing Gridfinity bins into a drawer grid.
+
+Placements are tracked in an occupancy grid stored as a single integer
+bitset (one bit per grid cell, row-major), so fit checks and placements
+are one AND/OR each regardless of bin size. Cells outside an irregular
+drawer start out occupied, so bins are never placed there.
+"""
+
+from typing import NamedTuple
+
+# Grids up to this many cells are solved exactly; larger grids use greedy placement
+EXACT_SOLVER_MAX_CELLS = 36
+# Search nodes the exact solver may visit before falling back to greedy
+EXACT_SOLVER_NODE_LIMIT = 200_000
+
+
+class BinSpec(NamedTuple):
+    """A requested bin size in gridfinity units."""
+
+    length: int
+    width: int
+    height: int
+
+
+class Placement(NamedTuple):
+    """A bin placed in the drawer grid.
+
+    x/y are the grid cell of the bin's front-left corner. length and width
+    are the footprint as placed, so rotated bins have them swapped.
+    """
+
+    x: int
+    y: int
+    length: int
+    width: int
+    height: int
+    rotated: bool = False
+    fill: bool = False  # True for bins added to fill leftover space
+
+
+class LayoutResult(NamedTuple):
+    """Result from solve_layout."""
+
+    units_width: int
+    units_depth: int
+    placements: list[Placement]
+    unplaced: list[BinSpec]  # Requested bins that did not fit
+    exact: bool  # True if the exact solver produced the placements
+    blocked: frozenset[tuple[int, int]] = frozenset()  # (x, y) cells outside
+
+
+class OccupancyGrid:
+    """Occupancy grid for a drawer, backed by an integer bitset.
+
+    Bit (y * units_width + x) is set when cell (x, y) is occupied.
+    Blocked cells are occupied from the start.
+    """
+
+    def __init__(
+        self,
+        units_width: int,
+        units_depth: int,
+        blocked: frozenset[tuple[int, int]] = frozenset(),
+    ) -> None:
+        self.units_width = units_width
+        self.units_depth = units_depth
+        self.bits = 0
+        for x, y in blocked:
+            self.bits |= 1 << (y * units_width + x)
+        self._full = (1 << (units_width * units_depth)) - 1
+        self._rect_masks: dict[tuple[int, int], int] = {}
+
+    def rect_mask(self, x: int, y: int, length: int, width: int) -> int:
+        """Get the bitmask covering a rectangle anchored at (x, y)."""
+        key = (length, width)
+        mask = self._rect_masks.get(key)
+        if mask is None:
+            row = (1 << length) - 1
+            mask = 0
+            for r in range(width):
+                mask |= row << (r * self.units_width)
+            self._rect_masks[key] = mask
+        return mask << (y * self.units_width + x)
+
+    def fits(self, x: int, y: int, length: int, width: int) -> bool:
+        """Check if a rectangle at (x, y) is inside the grid and unoccupied."""
+        if x + length > self.units_width or y + width > self.units_depth:
+            return False
+        return not self.bits & self.rect_mask(x, y, length, width)
+
+    def place(self, x: int, y: int, length: int, width: int) -> None:
+        """Mark a rectangle at (x, y) as occupied."""
+        self.bits |= self.rect_mask(x, y, length, width)
+
+    def first_free(self) -> tuple[int, int] | None:
+        """Get the first unoccupied cell in row-major order, or None if full."""
+        free = ~self.bits & self._full
+        if not free:
+            return None
+        index = (free & -free).bit_length() - 1
+        return (index % self.units_width, index // self.units_width)
+
+
+def parse_bin_specs(text: str) -> list[BinSpec]:
+    """Parse a bin list such as "2x2x3:4,1x1x3:6" into bin specs.
+
+    Each entry is LENGTHxWIDTHxHEIGHT with an optional ":count" suffix.
+
+    Raises:
+        ValueError: If an entry is malformed or has non-positive values
+    """
+    bins: list[BinSpec] = []
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        size, _, count_str = entry.partition(":")
+        try:
+            length, width, height = (int(v) for v in size.lower().split("x"))
+            count = int(count_str) if count_str else 1
+        except ValueError:
+            raise ValueError(
+                f"Invalid bin '{entry}', expected LENGTHxWIDTHxHEIGHT[:COUNT]"
+            ) from None
+        if min(length, width, height, count) < 1:
+            raise ValueError(f"Invalid bin '{entry}', all values must be >= 1")
+        bins.extend([BinSpec(length, width, height)] * count)
+    return bins
+
+
+def solve_layout(
+    units_width: int,
+    units_depth: int,
+    bins: list[BinSpec],
+    fill_max: tuple[int, int] | None = None,
+    fill_height: int = 3,
+    blocked: frozenset[tuple[int, int]] = frozenset(),
+) -> LayoutResult:
+    """Pack the requested bins into a drawer grid.
+
+    Grids with at most EXACT_SOLVER_MAX_CELLS cells are searched exactly, so
+    every bin is placed whenever a packing exists. Larger grids (or searches
+    exceeding EXACT_SOLVER_NODE_LIMIT) use greedy first-fit placement with
+    bins ordered largest first. Bins may be rotated 90 degrees.
+
+    Args:
+        units_width: Drawer grid width in gridfinity units
+        units_depth: Drawer grid depth in gridfinity units
+        bins: Requested bins
+        fill_max: Maximum (length, width) of filler bins for leftover space,
+            or None to leave leftover space empty
+        fill_height: Height in units for filler bins
+        blocked: (x, y) cells outside the drawer, for irregular drawers laid
+            out on their bounding grid
+
+    Returns:
+        LayoutResult with placements for requested and filler bins
+    """
+    grid = OccupancyGrid(units_width, units_depth, blocked)
+    ordered = sorted(bins, key=lambda b: (b.length * b.width, b), reverse=True)
+
+    placements = None
+    exact = False
+    total_area = sum(b.length * b.width for b in ordered)
+    if units_width * units_depth <= EXACT_SOLVER_MAX_CELLS:
+        if total_area <= units_width * units_depth - len(blocked):
+            placements = _solve_exact(grid, ordered)
+            exact = placements is not None
+
+    if placements is None:
+        grid = OccupancyGrid(units_width, units_depth, blocked)
+        placements, unplaced = _solve_greedy(grid, ordered)
+    else:
+        unplaced = []
+
+    if fill_max is not None:
+        placements.extend(_fill_leftover(grid, fill_max, fill_height))
+
+    return LayoutResult(
+        units_width=units_width,
+        units_depth=units_depth,
+        placements=placements,
+        unplaced=unplaced,
+        exact=exact,
+        blocked=blocked,
+    )
+
+
+def format_layout_map(result: LayoutResult) -> list[str]:
+    """Draw a layout as text rows, back of the drawer first.
+
+    Requested bins are labelled A, B, C, ... and filler bins are '+'.
+    Empty cells are '.' and cells outside the drawer are blank.
+    """
+    labels = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    cells = [["."] * result.units_width for _ in range(result.units_depth)]
+    for x, y in result.blocked:
+        cells[y][x] = " "
+    index = 0
+    for placement in result.placements:
+        if placement.fill:
+            label = "+"
+        else:
+            label = labels[index % len(labels)]
+            index += 1
+        for y in range(placement.y, placement.y + placement.width):
+            for x in range(placement.x, placement.x + placement.length):
+                cells[y][x] = label
+    return ["".join(row) for row in reversed(cells)]
+
+
+def _orientations(bin_spec: BinSpec) -> list[tuple[int, int, bool]]:
+    """Get the distinct (length, width, rotated) footprints for a bin."""
+    if bin_spec.length == bin_spec.width:
+        return [(bin_spec.length, bin_spec.width, False)]
+    return [
+        (bin_spec.length, bin_spec.width, False),
+        (bin_spec.width, bin_spec.length, True),
+    ]
+
+
+def _solve_exact(grid: OccupancyGrid, bins: list[BinSpec]) -> list[Placement] | None:
+    """Depth-first search for a packing that places every bin.
+
+    Identical bins are placed in increasing cell order to avoid exploring
+    permutations of the same packing, and failed (occupancy, bin) states are
+    memoized. Returns None if no packing exists or the node limit is reached.
+    """
+    cells = grid.units_width * grid.units_depth
+    failed: set[tuple[int, int, int]] = set()
+    chosen: list[Placement] = []
+    nodes = 0
+
+    def search(index: int, min_cell: int) -> bool | None:
+        nonlocal nodes
+        if index == len(bins):
+            return True
+        state = (grid.bits, index, min_cell)
+        if state in failed:
+            return False
+        nodes += 1
+        if nodes > EXACT_SOLVER_NODE_LIMIT:
+            return None
+
+        bin_spec = bins[index]
+        same_as_next = index + 1 < len(bins) and bins[index + 1] == bin_spec
+        for cell in range(min_cell, cells):
+            x, y = cell % grid.units_width, cell // grid.units_width
+            for length, width, rotated in _orientations(bin_spec):
+                if not grid.fits(x, y, length, width):
+                    continue
+                mask = grid.rect_mask(x, y, length, width)
+                grid.bits |= mask
+                chosen.append(Placement(x, y, length, width, bin_spec.height, rotated))
+                found = search(index + 1, cell if same_as_next else 0)
+                if found or found is None:
+                    return found
+                grid.bits &= ~mask
+                chosen.pop()
+
+        failed.add(state)
+        return False
+
+    return list(chosen) if search(0, 0) else None
+
+
+def _solve_greedy(
+    grid: OccupancyGrid, bins: list[BinSpec]
+) -> tuple[list[Placement], list[BinSpec]]:
+    """Place each bin at the first free position in row-major order."""
+    placements: list[Placement] = []
+    unplaced: list[BinSpec] = []
+    for bin_spec in bins:
+        position = _first_fit(grid, bin_spec)
+        if position is None:
+            unplaced.append(bin_spec)
+            continue
+        x, y, length, width, rotated = position
+        grid.place(x, y, length, width)
+        placements.append(Placement(x, y, length, width, bin_spec.height, rotated))
+    return placements, unplaced
+
+
+def _first_fit(
+    grid: OccupancyGrid, bin_spec: BinSpec
+) -> tuple[int, int, int, int, bool] | None:
+    """Find the first position where a bin fits in either orientation."""
+    for y in range(grid.units_depth):
+        for x in range(grid.units_width):
+            for length, width, rotated in _orientations(bin_spec):
+                if grid.fits(x, y, length, width):
+                    return (x, y, length, width, rotated)
+    return None
+
+
+def _fill_leftover(
+    grid: OccupancyGrid, fill_max: tuple[int, int], fill_height: int
+) -> list[Placement]:
+    """Fill every free cell with as few filler bins as possible.
+
+    Repeatedly takes the first free cell and places the largest-area
+    rectangle anchored there (up to fill_max in either orientation).
+    """
+    max_length, max_width = fill_max
+    fillers: list[Placement] = []
+    while (cell := grid.first_free()) is not None:
+        x, y = cell
+        best = (1, 1)
+        length = 1
+        while grid.fits(x, y, length, 1):
+            # Largest printable width for this length, in either orientation
+            if length <= min(max_length, max_width):
+                width_limit = max(max_length, max_width)
+            elif length <= max_length:
+                width_limit = max_width
+            elif length <= max_width:
+                width_limit = max_length
+            else:
+                break
+            width = 1
+            while width < width_limit and grid.fits(x, y, length, width + 1):
+                width += 1
+            if length * width > best[0] * best[1]:
+                best = (length, width)
+            length += 1
+        length, width = best
+        grid.place(x, y, length, width)
+        fillers.append(Placement(x, y, length, width, fill_height, fill=True))
+    return fillers
@@ -0,0 +1,225 @@
+"""Project output manifests with integrity verification.
+
+Each project keeps a manifest.json next to its config.json, recording for
+every output file the component parameters that produced it, its size,
+modification time and BLAKE2b content hash, plus the library versions used
+to render it.
+
+Verification compares each file's size and mtime with the manifest first
+and only re-hashes files whose mtime changed, so checking an unchanged
+project costs one stat per file.
+
+Components added with --defer are in the config but not the manifest until
+something renders them; pending_components lists them.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.brep_cache import library_versions
+from gridfinity_invoke.components import parse_component
+from gridfinity_invoke.outputs import component_outputs
+from gridfinity_invoke.projects import (
+    get_project_path,
+    load_project_config,
+    update_project_index,
+)
+from gridfinity_invoke.workspace import Workspace
+
+MANIFEST_NAME = "manifest.json"
+
+
+class VerifyResult(NamedTuple):
+    """Result from verify_manifest, with file names relative to the project."""
+
+    checked: int  # Number of files in the manifest
+    rehashed: list[str]  # Files whose mtime changed, so were hashed again
+    modified: list[str]  # Files whose contents no longer match
+    missing: list[str]
+
+
+def hash_file(path: str | Path) -> str:
+    """Hash a file's contents with BLAKE2b, reading it through mmap.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file contents
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return hashlib.blake2b(data).hexdigest()
+
+
+def load_manifest(project: str, workspace: Workspace | None = None) -> dict[str, Any]:
+    """Load a project's manifest, or an empty one if there is none yet.
+
+    Args:
+        project: Project name
+        workspace: Workspace holding the project
+
+    Returns:
+        Manifest dictionary with "versions" and "files" keys
+    """
+    path = get_project_path(project, workspace) / MANIFEST_NAME
+    try:
+        manifest: dict[str, Any] = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {"versions": library_versions(), "files": {}}
+    return manifest
+
+
+def save_manifest(
+    project: str, manifest: dict[str, Any], workspace: Workspace | None = None
+) -> None:
+    """Save a project's manifest atomically.
+
+    Args:
+        project: Project name
+        manifest: Manifest dictionary
+        workspace: Workspace holding the project
+    """
+    path = get_project_path(project, workspace) / MANIFEST_NAME
+    with atomic_output(path) as temp_path:
+        temp_path.write_text(json.dumps(manifest, indent=2))
+
+
+def record_component(
+    project: str, component: dict[str, Any], workspace: Workspace | None = None
+) -> None:
+    """Record a component's output files in the project manifest.
+
+    Entries the component no longer produces are dropped. Files whose size
+    and mtime match their existing entry keep their hash without re-reading
+    them, since unchanged outputs are never rewritten. The project's size in
+    the project index is refreshed too.
+
+    Args:
+        project: Project name
+        component: Component from the project config
+        workspace: Workspace holding the project
+    """
+    project_path = get_project_path(project, workspace)
+    manifest = load_manifest(project, workspace)
+    manifest["versions"] = library_versions()
+    files = manifest["files"]
+    old_entries = {
+        name: files.pop(name)
+        for name in [n for n, e in files.items() if e["component"] == component["name"]]
+    }
+
+    for name in component_outputs(component):
+        try:
+            stat = (project_path / name).stat()
+        except FileNotFoundError:
+            continue
+        old = old_entries.get(name)
+        if old and (old["size"], old["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            content_hash = old["blake2b"]
+        else:
+            content_hash = hash_file(project_path / name)
+        files[name] = {
+            "component": component["name"],
+            "params": component,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blake2b": content_hash,
+        }
+
+    save_manifest(project, manifest, workspace)
+    update_project_index(project, workspace)
+
+
+def pending_components(
+    project: str, workspace: Workspace | None = None
+) -> list[dict[str, Any]]:
+    """Get the components that haven't been rendered with their current parameters.
+
+    A component is pending if any of its output files isn't in the manifest,
+    or was produced by different parameters, as after adding it with
+    --defer or editing the config by hand. Parameters are compared in their
+    canonical form, so defaulted or unknown keys in the config don't count
+    as changes. Files deleted since they were rendered are reported by
+    verify_manifest instead.
+
+    Args:
+        project: Project name
+        workspace: Workspace holding the project
+
+    Returns:
+        Pending components from the project config, in config order
+
+    Raises:
+        ValueError: If a component in the config is invalid
+    """
+    files = load_manifest(project, workspace)["files"]
+    pending = []
+    for component in load_project_config(project, workspace).get("components", []):
+        parsed = parse_component(component)
+        canonical = parsed.to_dict()
+        if any(
+            _canonical_params(files.get(name, {}).get("params")) != canonical
+            for name in parsed.outputs()
+        ):
+            pending.append(component)
+    return pending
+
+
+def _canonical_params(params: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Get recorded component parameters in canonical form, or None if invalid."""
+    if params is None:
+        return None
+    try:
+        return parse_component(params).to_dict()
+    except (ValueError, KeyError):
+        return None
+
+
+def verify_manifest(project: str, workspace: Workspace | None = None) -> VerifyResult:
+    """Check a project's output files against its manifest.
+
+    A file with the recorded size and mtime is taken as unchanged. A size
+    change means it was modified; only files with the same size but a new
+    mtime are hashed again.
+
+    Args:
+        project: Project name
+        workspace: Workspace holding the project
+
+    Returns:
+        VerifyResult listing rehashed, modified and missing files
+
+    Raises:
+        FileNotFoundError: If the project has no manifest
+    """
+    project_path = get_project_path(project, workspace)
+    manifest = json.loads((project_path / MANIFEST_NAME).read_text())
+
+    rehashed, modified, missing = [], [], []
+    for name, entry in manifest["files"].items():
+        try:
+            stat = os.stat(project_path / name)
+        except FileNotFoundError:
+            missing.append(name)
+            continue
+        if stat.st_size != entry["size"]:
+            modified.append(name)
+        elif stat.st_mtime_ns != entry["mtime_ns"]:
+            rehashed.append(name)
+            if hash_file(project_path / name) != entry["blake2b"]:
+                modified.append(name)
+
+    return VerifyResult(
+        checked=len(manifest["files"]),
+        rehashed=rehashed,
+        modified=modified,
+        missing=missing,
+    )
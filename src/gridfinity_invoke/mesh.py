@@ -0,0 +1,350 @@
+"""Triangle mesh helpers for Gridfinity STL and 3MF files.
+
+Reads and writes binary STL files as NumPy arrays so that existing outputs
+can be combined and repositioned without re-running the CAD kernel. Meshes
+can also be serialized to in-memory buffers for callers that never need a
+file, such as a web front-end.
+
+Meshes are written in a canonical form (rounded coordinates, fixed triangle
+order, fixed headers), so the same triangles always produce the same bytes,
+and files are written atomically, leaving unchanged outputs untouched.
+"""
+
+import io
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+from gridfinity_invoke.atomic import atomic_output
+
+# Export formats, named by their file extension
+EXPORT_FORMATS = ("stl", "step", "3mf", "brep")
+# Formats written from a triangle mesh rather than the exact solid
+MESH_FORMATS = ("stl", "3mf")
+
+# Binary STL layout: 80 byte header, uint32 triangle count, 50 byte records
+STL_HEADER_SIZE = 80
+STL_RECORD_DTYPE = np.dtype(
+    [
+        ("normal", "<f4", (3,)),
+        ("vertices", "<f4", (3, 3)),
+        ("attributes", "<u2"),
+    ]
+)
+STL_HEADER = b"gridfinity-invoke binary STL".ljust(STL_HEADER_SIZE, b" ")
+
+# Vertex coordinates are rounded to this many decimal places (0.1 micron)
+MESH_DECIMALS = 4
+
+# Fixed parts of a 3MF package (an OPC zip with a single model part)
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)  # Earliest zip date, for reproducible files
+THREEMF_MODEL_PATH = "3D/3dmodel.model"
+THREEMF_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" '
+    'ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>"
+)
+THREEMF_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Target="/{THREEMF_MODEL_PATH}" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>"
+)
+
+
+def read_stl(path: str | Path) -> np.ndarray:
+    """Read triangles from a binary STL file.
+
+    Args:
+        path: Path to a binary STL file.
+
+    Returns:
+        Array of shape (n, 3, 3) holding the three vertices of each triangle.
+
+    Raises:
+        ValueError: If the file is not a valid binary STL.
+    """
+    return parse_stl(Path(path).read_bytes(), str(path))
+
+
+def parse_stl(data: bytes | memoryview, source: str = "STL data") -> np.ndarray:
+    """Read triangles from binary STL contents, e.g. from stl_buffer.
+
+    Args:
+        data: Binary STL file contents.
+        source: Name of the data for error messages.
+
+    Returns:
+        Array of shape (n, 3, 3) holding the three vertices of each triangle.
+
+    Raises:
+        ValueError: If the data is not a valid binary STL.
+    """
+    if len(data) < STL_HEADER_SIZE + 4:
+        raise ValueError(f"{source} is too short to be a binary STL file")
+
+    count = int(np.frombuffer(data, dtype="<u4", count=1, offset=STL_HEADER_SIZE)[0])
+    expected_size = STL_HEADER_SIZE + 4 + count * STL_RECORD_DTYPE.itemsize
+    if len(data) != expected_size:
+        raise ValueError(f"{source} is not a binary STL file (size mismatch)")
+
+    records = np.frombuffer(
+        data, dtype=STL_RECORD_DTYPE, count=count, offset=STL_HEADER_SIZE + 4
+    )
+    return records["vertices"].copy()
+
+
+def canonical_mesh(triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Put a triangle soup into a canonical indexed form.
+
+    Coordinates are rounded to MESH_DECIMALS (with -0.0 normalized to 0.0)
+    and shared vertices are merged. Each triangle is rotated to start at its
+    smallest vertex, keeping its winding, and triangles are sorted. Meshes
+    with the same triangles in any order give identical results.
+
+    Args:
+        triangles: Array of shape (n, 3, 3) with the vertices of each triangle.
+
+    Returns:
+        Tuple of (vertices, faces): unique vertices of shape (m, 3) in
+        lexicographic order, and vertex indices of shape (n, 3).
+    """
+    rounded = np.round(np.asarray(triangles, dtype=np.float64), MESH_DECIMALS) + 0.0
+    vertices, inverse = np.unique(rounded.reshape(-1, 3), axis=0, return_inverse=True)
+    faces = inverse.reshape(-1, 3)
+
+    # Pick the lexicographically smallest of the three rotations
+    for shift in (1, 2):
+        rotated = np.roll(inverse.reshape(-1, 3), -shift, axis=1)
+        smaller = (rotated[:, 0] < faces[:, 0]) | (
+            (rotated[:, 0] == faces[:, 0])
+            & (
+                (rotated[:, 1] < faces[:, 1])
+                | ((rotated[:, 1] == faces[:, 1]) & (rotated[:, 2] < faces[:, 2]))
+            )
+        )
+        faces = np.where(smaller[:, None], rotated, faces)
+
+    order = np.lexsort((faces[:, 2], faces[:, 1], faces[:, 0]))
+    return vertices, faces[order]
+
+
+def stl_buffer(triangles: np.ndarray) -> memoryview:
+    """Serialize triangles as a binary STL in canonical form.
+
+    Triangles are ordered and rounded by canonical_mesh, and facet normals
+    are recalculated from the vertex winding order. Records are filled in
+    place in the returned buffer, so the mesh is never copied into bytes.
+
+    Args:
+        triangles: Array of shape (n, 3, 3) with the vertices of each triangle.
+
+    Returns:
+        Buffer with the STL file contents.
+    """
+    vertices, faces = canonical_mesh(np.asarray(triangles).reshape(-1, 3, 3))
+    triangles = vertices[faces].astype("<f4")
+
+    buffer = bytearray(STL_HEADER_SIZE + 4 + len(triangles) * STL_RECORD_DTYPE.itemsize)
+    buffer[:STL_HEADER_SIZE] = STL_HEADER
+    buffer[STL_HEADER_SIZE : STL_HEADER_SIZE + 4] = len(triangles).to_bytes(4, "little")
+    records = np.frombuffer(buffer, dtype=STL_RECORD_DTYPE, offset=STL_HEADER_SIZE + 4)
+    records["vertices"] = triangles
+    records["normal"] = _facet_normals(triangles)
+
+    return memoryview(buffer)
+
+
+def threemf_buffer(triangles: np.ndarray) -> memoryview:
+    """Serialize triangles as a 3MF package with one mesh object in millimeters.
+
+    The mesh is put in canonical form by canonical_mesh, which also merges
+    shared vertices so slicers see a connected mesh. Zip entries carry a
+    fixed timestamp.
+
+    Args:
+        triangles: Array of shape (n, 3, 3) with the vertices of each triangle.
+
+    Returns:
+        Buffer with the 3MF file contents.
+    """
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in (
+            ("[Content_Types].xml", THREEMF_CONTENT_TYPES),
+            ("_rels/.rels", THREEMF_RELS),
+        ):
+            info = zipfile.ZipInfo(name, date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, data)
+        info = zipfile.ZipInfo(THREEMF_MODEL_PATH, date_time=ZIP_TIMESTAMP)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with zf.open(info, "w") as model:
+            write_3mf_model(model, [(None, triangles)])
+
+    return stream.getbuffer()
+
+
+def write_3mf_model(
+    stream: IO[bytes], objects: Iterable[tuple[str | None, np.ndarray]]
+) -> int:
+    """Write a 3MF model part with one mesh object per triangle array.
+
+    Objects are converted and written one at a time, so only one mesh is in
+    memory at once. Each is put in canonical form by canonical_mesh.
+
+    Args:
+        stream: Binary stream for the model part, e.g. from ZipFile.open.
+        objects: (name, triangles) for each object; a None name is omitted.
+
+    Returns:
+        Number of objects written.
+    """
+    stream.write(
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<model unit="millimeter" xml:lang="en-US" '
+        b'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+        b"<resources>"
+    )
+    count = 0
+    for count, (name, triangles) in enumerate(objects, start=1):
+        vertices, faces = canonical_mesh(np.asarray(triangles).reshape(-1, 3, 3))
+        vertex_xml = "".join(
+            f'<vertex x="{x!r}" y="{y!r}" z="{z!r}"/>' for x, y, z in vertices.tolist()
+        )
+        triangle_xml = "".join(
+            f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in faces.tolist()
+        )
+        name_xml = "" if name is None else f" name={quoteattr(name)}"
+        stream.write(
+            f'<object id="{count}"{name_xml} type="model"><mesh>'
+            f"<vertices>{vertex_xml}</vertices>"
+            f"<triangles>{triangle_xml}</triangles>"
+            "</mesh></object>".encode()
+        )
+    items = "".join(f'<item objectid="{i}"/>' for i in range(1, count + 1))
+    stream.write(f"</resources><build>{items}</build></model>".encode())
+    return count
+
+
+def write_buffer(path: str | Path, buffer: memoryview | bytes) -> Path:
+    """Write a serialized file atomically, leaving it untouched if unchanged.
+
+    Args:
+        path: Path to write.
+        buffer: File contents, e.g. from stl_buffer or threemf_buffer.
+
+    Returns:
+        Path to the written file.
+    """
+    path = Path(path)
+    with atomic_output(path) as temp_path:
+        temp_path.write_bytes(buffer)
+    return path
+
+
+def write_stl(path: str | Path, triangles: np.ndarray) -> Path:
+    """Write triangles to a binary STL file in canonical form.
+
+    Args:
+        path: Path to write the STL file.
+        triangles: Array of shape (n, 3, 3) with the vertices of each triangle.
+
+    Returns:
+        Path to the written STL file.
+    """
+    return write_buffer(path, stl_buffer(triangles))
+
+
+def write_3mf(path: str | Path, triangles: np.ndarray) -> Path:
+    """Write triangles to a 3MF file as a single mesh object in millimeters.
+
+    Args:
+        path: Path to write the 3MF file.
+        triangles: Array of shape (n, 3, 3) with the vertices of each triangle.
+
+    Returns:
+        Path to the written 3MF file.
+    """
+    return write_buffer(path, threemf_buffer(triangles))
+
+
+def translate(triangles: np.ndarray, offset: tuple[float, float, float]) -> np.ndarray:
+    """Return a copy of the triangles moved by the given offset.
+
+    Args:
+        triangles: Array of shape (n, 3, 3) with triangle vertices.
+        offset: (x, y, z) translation in millimeters.
+
+    Returns:
+        Translated triangle array.
+    """
+    moved: np.ndarray = triangles + np.asarray(offset, dtype=triangles.dtype)
+    return moved
+
+
+def box_triangles(
+    x_min: float, y_min: float, x_max: float, y_max: float, height: float
+) -> np.ndarray:
+    """Build an axis-aligned box standing on the XY plane.
+
+    Args:
+        x_min: Minimum X coordinate in millimeters.
+        y_min: Minimum Y coordinate in millimeters.
+        x_max: Maximum X coordinate in millimeters.
+        y_max: Maximum Y coordinate in millimeters.
+        height: Box height in millimeters.
+
+    Returns:
+        Array of shape (12, 3, 3) with outward-facing triangles.
+    """
+    corners = np.array(
+        [
+            [x_min, y_min, 0.0],
+            [x_max, y_min, 0.0],
+            [x_max, y_max, 0.0],
+            [x_min, y_max, 0.0],
+            [x_min, y_min, height],
+            [x_max, y_min, height],
+            [x_max, y_max, height],
+            [x_min, y_max, height],
+        ],
+        dtype="<f4",
+    )
+    faces = [
+        (0, 2, 1),  # bottom
+        (0, 3, 2),
+        (4, 5, 6),  # top
+        (4, 6, 7),
+        (0, 1, 5),  # front
+        (0, 5, 4),
+        (1, 2, 6),  # right
+        (1, 6, 5),
+        (2, 3, 7),  # back
+        (2, 7, 6),
+        (3, 0, 4),  # left
+        (3, 4, 7),
+    ]
+    triangles: np.ndarray = corners[np.array(faces)]
+    return triangles
+
+
+def _facet_normals(triangles: np.ndarray) -> np.ndarray:
+    """Calculate unit normals for each triangle, zero for degenerate ones."""
+    normals = np.cross(
+        triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    )
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    unit: np.ndarray = np.divide(
+        normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+    )
+    return unit
@@ -0,0 +1,59 @@
+"""Output files of project components.
+
+Maps each component in a project config to the files gf.load writes for it,
+and renders those files in memory for callers that need a component's
+outputs without writing them to the project directory. Both go through the
+component's typed form (see components.py), so each type lists and renders
+its own files.
+
+Listing outputs doesn't need the CAD libraries, so the generators are only
+imported when rendering; the manifest and cleanup code stay quick to load.
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from gridfinity_invoke.components import parse_component
+
+
+def component_outputs(
+    component: dict[str, Any], formats: Sequence[str] | None = None
+) -> list[str]:
+    """Get the file names a component writes to its project directory.
+
+    Assembly previews are not included, since gf.load only writes them on
+    request. Layout components have no output files.
+
+    Args:
+        component: Component from a project config
+        formats: Formats to list instead of the component's own formats
+
+    Returns:
+        File names relative to the project directory, in the order
+        render_component yields them
+
+    Raises:
+        ValueError: If the component is invalid
+    """
+    return parse_component(component).outputs(formats)
+
+
+def render_component(
+    component: dict[str, Any], formats: Sequence[str] | None = None
+) -> Iterator[tuple[str, memoryview]]:
+    """Render a component's output files in memory, one file at a time.
+
+    Files are named as gf.load would write them in the project directory.
+    Rendered solids come from the BREP cache when available.
+
+    Args:
+        component: Component from a project config
+        formats: Formats to render instead of the component's own formats
+
+    Yields:
+        (file name, file contents) for each output file
+
+    Raises:
+        ValueError: If the component is invalid
+    """
+    return parse_component(component).render(formats)
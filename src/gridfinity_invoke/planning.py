@@ -0,0 +1,567 @@
+"""Drawer-fit planning math for Gridfinity baseplates.
+
+Unit, gap, spacer and split calculations done with NumPy over many drawers
+at once. This module deliberately avoids importing cqgridfinity so that
+planning stays fast and works without the CAD kernel.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from gridfinity_invoke.atomic import atomic_output
+
+# Gridfinity standard constants
+GRIDFINITY_UNIT_MM = 42  # 1 gridfinity unit = 42mm
+MIN_SPACER_GAP_MM = 4  # cqgridfinity threshold for spacer generation
+
+
+class DrawerPlans(NamedTuple):
+    """Drawer-fit plans for many drawers, one array element per drawer.
+
+    Baseplate pieces follow calculate_baseplate_splits: full pieces of
+    max_units_x by max_units_y, plus remainder pieces along the right
+    edge (rem_x wide), the back edge (rem_y deep) and the back-right corner.
+    """
+
+    width_mm: np.ndarray
+    depth_mm: np.ndarray
+    units_width: np.ndarray
+    units_depth: np.ndarray
+    gap_x_mm: np.ndarray  # Total gap in X direction
+    gap_y_mm: np.ndarray  # Total gap in Y direction
+    needs_spacers: np.ndarray  # Either per-side gap exceeds MIN_SPACER_GAP_MM
+    full_x: np.ndarray  # Number of full-width pieces along X
+    full_y: np.ndarray  # Number of full-depth pieces along Y
+    rem_x: np.ndarray  # Width of the remainder column (0 if none)
+    rem_y: np.ndarray  # Depth of the remainder row (0 if none)
+    piece_count: np.ndarray
+    max_units_x: int
+    max_units_y: int
+
+
+def plan_drawers(
+    width_mm: np.ndarray | list[float],
+    depth_mm: np.ndarray | list[float],
+    max_units_x: int,
+    max_units_y: int,
+) -> DrawerPlans:
+    """Calculate drawer-fit plans for many drawers in one vectorized pass.
+
+    Args:
+        width_mm: Drawer widths (X dimension) in millimeters
+        depth_mm: Drawer depths (Y dimension) in millimeters
+        max_units_x: Maximum printable units in X
+        max_units_y: Maximum printable units in Y
+
+    Returns:
+        DrawerPlans with one element per drawer
+
+    Raises:
+        ValueError: If any dimension is less than 42mm (minimum for 1x1 baseplate)
+    """
+    width_mm = np.asarray(width_mm, dtype=np.float64)
+    depth_mm = np.asarray(depth_mm, dtype=np.float64)
+    if np.any(width_mm < GRIDFINITY_UNIT_MM) or np.any(depth_mm < GRIDFINITY_UNIT_MM):
+        raise ValueError(
+            f"Dimensions must be at least {GRIDFINITY_UNIT_MM}mm "
+            "to fit a 1-unit baseplate"
+        )
+
+    # Floor division for conservative fit
+    units_width = (width_mm // GRIDFINITY_UNIT_MM).astype(np.int64)
+    units_depth = (depth_mm // GRIDFINITY_UNIT_MM).astype(np.int64)
+    gap_x_mm = width_mm - units_width * GRIDFINITY_UNIT_MM
+    gap_y_mm = depth_mm - units_depth * GRIDFINITY_UNIT_MM
+    needs_spacers = (gap_x_mm / 2 > MIN_SPACER_GAP_MM) | (
+        gap_y_mm / 2 > MIN_SPACER_GAP_MM
+    )
+
+    full_x, rem_x = np.divmod(units_width, max_units_x)
+    full_y, rem_y = np.divmod(units_depth, max_units_y)
+    piece_count = (full_x + (rem_x > 0)) * (full_y + (rem_y > 0))
+
+    return DrawerPlans(
+        width_mm=width_mm,
+        depth_mm=depth_mm,
+        units_width=units_width,
+        units_depth=units_depth,
+        gap_x_mm=gap_x_mm,
+        gap_y_mm=gap_y_mm,
+        needs_spacers=needs_spacers,
+        full_x=full_x,
+        full_y=full_y,
+        rem_x=rem_x,
+        rem_y=rem_y,
+        piece_count=piece_count,
+        max_units_x=max_units_x,
+        max_units_y=max_units_y,
+    )
+
+
+class DrawerFit(NamedTuple):
+    """Baseplate size and leftover gaps for one rectangular drawer."""
+
+    units_width: int
+    units_depth: int
+    gap_x_mm: float  # Total gap in X direction
+    gap_y_mm: float  # Total gap in Y direction
+    needs_spacers: bool  # Either per-side gap exceeds MIN_SPACER_GAP_MM
+
+
+def fit_drawer(width_mm: float, depth_mm: float) -> DrawerFit:
+    """Fit a baseplate to a single drawer, as plan_drawers does for many.
+
+    Args:
+        width_mm: Drawer width (X dimension) in millimeters
+        depth_mm: Drawer depth (Y dimension) in millimeters
+
+    Returns:
+        DrawerFit with the baseplate size in units and the gaps around it
+
+    Raises:
+        ValueError: If either dimension is less than 42mm (minimum for 1x1 baseplate)
+    """
+    plans = plan_drawers([width_mm], [depth_mm], 1, 1)
+    return DrawerFit(
+        units_width=int(plans.units_width[0]),
+        units_depth=int(plans.units_depth[0]),
+        gap_x_mm=float(plans.gap_x_mm[0]),
+        gap_y_mm=float(plans.gap_y_mm[0]),
+        needs_spacers=bool(plans.needs_spacers[0]),
+    )
+
+
+def drawer_pieces(plans: DrawerPlans, index: int) -> list[tuple[int, int]]:
+    """Get one drawer's baseplate pieces in calculate_baseplate_splits order.
+
+    Args:
+        plans: Plans from plan_drawers
+        index: Index of the drawer in the plans
+
+    Returns:
+        List of (width, depth) tuples for each piece
+    """
+    pieces_x = [plans.max_units_x] * int(plans.full_x[index])
+    if plans.rem_x[index]:
+        pieces_x.append(int(plans.rem_x[index]))
+    pieces_y = [plans.max_units_y] * int(plans.full_y[index])
+    if plans.rem_y[index]:
+        pieces_y.append(int(plans.rem_y[index]))
+    return [(x_size, y_size) for y_size in pieces_y for x_size in pieces_x]
+
+
+def parse_range(text: str) -> np.ndarray:
+    """Parse an inclusive millimeter range such as "100:1000:1".
+
+    Accepts START:STOP:STEP, START:STOP (step 1) or a single value.
+
+    Raises:
+        ValueError: If the range is malformed or empty
+    """
+    try:
+        parts = [float(p) for p in text.split(":")]
+    except ValueError:
+        raise ValueError(f"Invalid range '{text}', expected START:STOP:STEP") from None
+    if len(parts) == 1:
+        return np.array(parts)
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Invalid range '{text}', expected START:STOP:STEP")
+
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) == 3 else 1.0
+    if step <= 0 or stop < start:
+        raise ValueError(f"Invalid range '{text}', expected START <= STOP and STEP > 0")
+
+    # Half a step of slack keeps STOP despite float rounding
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def calculate_fit_table(
+    widths_mm: np.ndarray,
+    depths_mm: np.ndarray,
+    beds: list[tuple[int, int]],
+) -> dict[str, np.ndarray]:
+    """Calculate drawer-fit sizing for every width, depth and bed combination.
+
+    Args:
+        widths_mm: Drawer widths to sweep in millimeters
+        depths_mm: Drawer depths to sweep in millimeters
+        beds: Print bed (width, depth) sizes in millimeters
+
+    Returns:
+        Dictionary of equal-length column arrays, one row per combination.
+        unique_piece_sizes lists the distinct baseplate pieces, e.g. "5x5;2x5".
+
+    Raises:
+        ValueError: If a dimension is below 42mm or a bed is smaller than 1 unit
+    """
+    widths, depths = np.meshgrid(widths_mm, depths_mm, indexing="ij")
+    widths = widths.ravel()
+    depths = depths.ravel()
+
+    columns: dict[str, list[np.ndarray]] = {}
+    for bed_width, bed_depth in beds:
+        max_units_x = bed_width // GRIDFINITY_UNIT_MM
+        max_units_y = bed_depth // GRIDFINITY_UNIT_MM
+        if max_units_x < 1 or max_units_y < 1:
+            raise ValueError(
+                f"Print bed {bed_width}x{bed_depth}mm is smaller than 1 unit"
+            )
+
+        plans = plan_drawers(widths, depths, max_units_x, max_units_y)
+        rows = len(widths)
+        bed_columns = {
+            "bed_width_mm": np.full(rows, bed_width),
+            "bed_depth_mm": np.full(rows, bed_depth),
+            "width_mm": plans.width_mm,
+            "depth_mm": plans.depth_mm,
+            "units_width": plans.units_width,
+            "units_depth": plans.units_depth,
+            "gap_x_mm": np.round(plans.gap_x_mm, 6),
+            "gap_y_mm": np.round(plans.gap_y_mm, 6),
+            "needs_spacers": plans.needs_spacers,
+            "piece_count": plans.piece_count,
+            "unique_piece_sizes": _unique_piece_sizes(plans),
+        }
+        for name, values in bed_columns.items():
+            columns.setdefault(name, []).append(values)
+
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+def write_fit_table(table: dict[str, np.ndarray], path: str | Path) -> Path:
+    """Write a fit table as CSV, or as Parquet if the path ends in .parquet.
+
+    Args:
+        table: Columns from calculate_fit_table
+        path: Output file path
+
+    Returns:
+        Path to the written file
+
+    Raises:
+        ImportError: If Parquet output is requested without pyarrow installed
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Parquet output requires pyarrow (pip install pyarrow)"
+            ) from None
+        with atomic_output(path) as temp_path:
+            pq.write_table(pa.table(table), temp_path)
+        return path
+
+    columns = [_column_strings(values) for values in table.values()]
+    with atomic_output(path) as temp_path, temp_path.open("w", newline="") as f:
+        f.write(",".join(table) + "\n")
+        f.writelines(map("{}\n".format, map(",".join, zip(*columns))))
+    return path
+
+
+def _column_strings(values: np.ndarray) -> list[str]:
+    """Format a column as strings, converting each distinct value only once.
+
+    Sweep columns repeat a small set of values, so this is much faster than
+    formatting row by row.
+    """
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    strings = np.array([str(v) for v in unique_values.tolist()], dtype=object)
+    result: list[str] = strings[inverse.ravel()].tolist()
+    return result
+
+
+def _unique_piece_sizes(plans: DrawerPlans) -> np.ndarray:
+    """Describe each drawer's distinct baseplate piece sizes, e.g. "5x5;2x5".
+
+    Drawers with the same remainders share a description, so strings are only
+    built once per distinct combination.
+    """
+    has_full_x = plans.full_x > 0
+    has_full_y = plans.full_y > 0
+    key = ((plans.rem_x * 4096 + plans.rem_y) * 2 + has_full_x) * 2 + has_full_y
+    _, first_index, inverse = np.unique(key, return_index=True, return_inverse=True)
+
+    descriptions = []
+    for i in first_index:
+        widths = [plans.max_units_x] if has_full_x[i] else []
+        if plans.rem_x[i]:
+            widths.append(int(plans.rem_x[i]))
+        depths = [plans.max_units_y] if has_full_y[i] else []
+        if plans.rem_y[i]:
+            depths.append(int(plans.rem_y[i]))
+        descriptions.append(";".join(f"{w}x{d}" for d in depths for w in widths))
+
+    return np.array(descriptions, dtype=object)[inverse.ravel()]
+
+
+class GridRect(NamedTuple):
+    """An axis-aligned rectangle of grid cells, in gridfinity units."""
+
+    x: int
+    y: int
+    units_width: int
+    units_depth: int
+
+
+class OutlineGrid(NamedTuple):
+    """Gridfinity cells that fit inside an irregular drawer outline."""
+
+    origin_mm: tuple[float, float]  # Drawer position of grid cell (0, 0)
+    cells: np.ndarray  # Boolean array indexed [y, x], True if the cell fits
+    rects: list[GridRect]  # Decomposition of the cells into rectangles
+    outline_area_mm2: float
+
+
+def parse_outline(text: str) -> list[tuple[float, float]]:
+    """Parse a polygon outline such as "0,0;500,0;500,400;0,400".
+
+    Points are X,Y pairs in millimeters separated by semicolons or spaces.
+
+    Raises:
+        ValueError: If the outline is malformed or has fewer than 3 points
+    """
+    points = []
+    for point in text.replace(";", " ").split():
+        try:
+            x, y = (float(v) for v in point.split(","))
+        except ValueError:
+            raise ValueError(f"Invalid outline point '{point}', expected X,Y") from None
+        points.append((x, y))
+    if len(points) < 3:
+        raise ValueError("Outline needs at least 3 points")
+    return points
+
+
+def parse_rects(text: str) -> list[tuple[float, float, float, float]]:
+    """Parse drawer rectangles such as "0,0,500,200;0,200,300,200".
+
+    Each rectangle is X,Y,WIDTH,DEPTH in millimeters, separated by semicolons.
+
+    Raises:
+        ValueError: If a rectangle is malformed or has a non-positive size
+    """
+    rects = []
+    for rect in text.split(";"):
+        if not rect.strip():
+            continue
+        try:
+            x, y, width, depth = (float(v) for v in rect.split(","))
+        except ValueError:
+            raise ValueError(
+                f"Invalid rectangle '{rect}', expected X,Y,WIDTH,DEPTH"
+            ) from None
+        if width <= 0 or depth <= 0:
+            raise ValueError(f"Invalid rectangle '{rect}', size must be positive")
+        rects.append((x, y, width, depth))
+    if not rects:
+        raise ValueError("At least one rectangle is required")
+    return rects
+
+
+def rects_to_outline_grid(
+    rects: list[tuple[float, float, float, float]],
+) -> OutlineGrid:
+    """Fit gridfinity cells into a drawer made of overlapping rectangles."""
+    # Area of the union, via coordinate compression
+    xs = sorted({v for x, _, w, _ in rects for v in (x, x + w)})
+    ys = sorted({v for _, y, _, d in rects for v in (y, y + d)})
+    area = 0.0
+    for x0, x1 in zip(xs, xs[1:]):
+        for y0, y1 in zip(ys, ys[1:]):
+            if _rects_cover(rects, (x0, y0, x1, y1)):
+                area += (x1 - x0) * (y1 - y0)
+
+    return _fit_outline_grid(
+        lambda box: _rects_cover(rects, box),
+        xs,
+        ys,
+        area,
+    )
+
+
+def polygon_to_outline_grid(points: list[tuple[float, float]]) -> OutlineGrid:
+    """Fit gridfinity cells into a drawer with a polygon outline."""
+    edges = list(zip(points, points[1:] + points[:1]))
+    # Shoelace formula
+    area = abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in edges)) / 2
+
+    def covers(box: tuple[float, float, float, float]) -> bool:
+        center = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
+        if not _point_in_polygon(center, edges):
+            return False
+        return not any(_segment_crosses_box(p, q, box) for p, q in edges)
+
+    return _fit_outline_grid(
+        covers, [x for x, _ in points], [y for _, y in points], area
+    )
+
+
+def _fit_outline_grid(
+    covers: Callable[[tuple[float, float, float, float]], bool],
+    xs: list[float],
+    ys: list[float],
+    outline_area_mm2: float,
+) -> OutlineGrid:
+    """Choose the grid alignment that fits the most cells inside an outline.
+
+    Candidate alignments put a grid line on each outline edge coordinate, plus
+    the alignment centered on the outline's bounding box. Ties prefer fewer
+    rectangles, then the centered alignment.
+    """
+    min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+    units_x = int((max_x - min_x) // GRIDFINITY_UNIT_MM)
+    units_y = int((max_y - min_y) // GRIDFINITY_UNIT_MM)
+    if units_x < 1 or units_y < 1:
+        raise ValueError(
+            f"Outline must be at least {GRIDFINITY_UNIT_MM}mm in each direction"
+        )
+
+    centered = (
+        ((max_x - min_x) - units_x * GRIDFINITY_UNIT_MM) / 2,
+        ((max_y - min_y) - units_y * GRIDFINITY_UNIT_MM) / 2,
+    )
+    offsets_x = [centered[0]] + sorted({(x - min_x) % GRIDFINITY_UNIT_MM for x in xs})
+    offsets_y = [centered[1]] + sorted({(y - min_y) % GRIDFINITY_UNIT_MM for y in ys})
+
+    best: OutlineGrid | None = None
+    best_key: tuple[int, int] | None = None
+    for offset_x in offsets_x:
+        for offset_y in offsets_y:
+            origin = (min_x + offset_x, min_y + offset_y)
+            cols = int((max_x - origin[0]) // GRIDFINITY_UNIT_MM)
+            rows = int((max_y - origin[1]) // GRIDFINITY_UNIT_MM)
+            cells = np.zeros((max(rows, 0), max(cols, 0)), dtype=bool)
+            for row in range(rows):
+                for col in range(cols):
+                    x0 = origin[0] + col * GRIDFINITY_UNIT_MM
+                    y0 = origin[1] + row * GRIDFINITY_UNIT_MM
+                    box = (x0, y0, x0 + GRIDFINITY_UNIT_MM, y0 + GRIDFINITY_UNIT_MM)
+                    cells[row, col] = covers(box)
+
+            rects = decompose_cells(cells)
+            key = (int(cells.sum()), -len(rects))
+            if best_key is None or key > best_key:
+                best_key = key
+                best = OutlineGrid(origin, cells, rects, outline_area_mm2)
+
+    assert best is not None
+    if not best.cells.any():
+        raise ValueError("No gridfinity unit fits inside the outline")
+    return best
+
+
+def decompose_cells(cells: np.ndarray) -> list[GridRect]:
+    """Cover grid cells with rectangles, largest first.
+
+    Repeatedly takes the largest rectangle of remaining cells, which yields
+    few rectangles for typical drawer shapes (an L-shape gives two).
+
+    Args:
+        cells: Boolean array indexed [y, x]
+
+    Returns:
+        Non-overlapping rectangles covering every True cell
+    """
+    remaining = cells.copy()
+    rects = []
+    while remaining.any():
+        rect = _largest_rect(remaining)
+        rects.append(rect)
+        remaining[
+            rect.y : rect.y + rect.units_depth, rect.x : rect.x + rect.units_width
+        ] = False
+    return rects
+
+
+def _largest_rect(cells: np.ndarray) -> GridRect:
+    """Find the largest all-True rectangle using the histogram method."""
+    rows, cols = cells.shape
+    heights = np.zeros(cols, dtype=np.int64)
+    best = GridRect(0, 0, 0, 0)
+    for row in range(rows):
+        # Heights of True runs ending at this row
+        heights = np.where(cells[row], heights + 1, 0)
+        stack: list[int] = []
+        for col in range(cols + 1):
+            height = int(heights[col]) if col < cols else 0
+            while stack and heights[stack[-1]] >= height:
+                top = stack.pop()
+                rect_height = int(heights[top])
+                left = stack[-1] + 1 if stack else 0
+                width = col - left
+                if rect_height * width > best.units_width * best.units_depth:
+                    best = GridRect(left, row - rect_height + 1, width, rect_height)
+            stack.append(col)
+    return best
+
+
+def _rects_cover(
+    rects: list[tuple[float, float, float, float]],
+    box: tuple[float, float, float, float],
+) -> bool:
+    """Check if the union of rectangles fully covers a box."""
+    x0, y0, x1, y1 = box
+    # Split the box at every rectangle edge inside it; each piece must be covered
+    xs = sorted(
+        {x0, x1} | {v for x, _, w, _ in rects for v in (x, x + w) if x0 < v < x1}
+    )
+    ys = sorted(
+        {y0, y1} | {v for _, y, _, d in rects for v in (y, y + d) if y0 < v < y1}
+    )
+    for px0, px1 in zip(xs, xs[1:]):
+        for py0, py1 in zip(ys, ys[1:]):
+            if not any(
+                x <= px0 and px1 <= x + w and y <= py0 and py1 <= y + d
+                for x, y, w, d in rects
+            ):
+                return False
+    return True
+
+
+def _point_in_polygon(
+    point: tuple[float, float],
+    edges: list[tuple[tuple[float, float], tuple[float, float]]],
+) -> bool:
+    """Even-odd ray casting test."""
+    x, y = point
+    inside = False
+    for (x0, y0), (x1, y1) in edges:
+        if (y0 > y) != (y1 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+    return inside
+
+
+def _segment_crosses_box(
+    p: tuple[float, float],
+    q: tuple[float, float],
+    box: tuple[float, float, float, float],
+) -> bool:
+    """Check if a segment passes through the open interior of a box.
+
+    Uses Liang-Barsky clipping with strict bounds, so segments that only
+    touch the box boundary do not count.
+    """
+    t_enter, t_exit = 0.0, 1.0
+    for start, delta, low, high in (
+        (p[0], q[0] - p[0], box[0], box[2]),
+        (p[1], q[1] - p[1], box[1], box[3]),
+    ):
+        if delta == 0:
+            if not low < start < high:
+                return False
+            continue
+        t0 = (low - start) / delta
+        t1 = (high - start) / delta
+        t_enter = max(t_enter, min(t0, t1))
+        t_exit = min(t_exit, max(t0, t1))
+    return t_enter < t_exit
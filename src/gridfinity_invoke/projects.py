@@ -1,54 +1,135 @@
 """Project management module for Gridfinity projects.
 
 Handles active project state, project configuration, and component management.
+The active project comes from --project, the GF_PROJECT environment variable
+or the .gridfinity-active file, in that order.
+
+A summary of every project (component count, size on disk and when its
+config last changed) is cached in projects/.index, so listing projects never
+has to open each config.json. The index is updated whenever a config is
+saved; journal appends and edits made by hand are caught by comparing
+config.json and journal mtimes.
+
+Component changes are appended to projects/<name>/journal.jsonl instead of
+rewriting config.json, so each change costs one small write however large
+the project is. Loading a config replays the journal over the config.json
+snapshot; compaction folds it back in. Until then the journal also records
+which components changed, for regeneration to use. Appends and compaction
+hold a lock on the project directory (where the OS has flock), and a line
+left partly written by a crash is dropped by readers and cut off by the
+next append.
+
+Every function works on the given workspace, or the current one (see
+workspace.py).
 """
 
 import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, BinaryIO, NamedTuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
 
-# Project storage directories
+from gridfinity_invoke.atomic import atomic_output
+from gridfinity_invoke.workspace import Workspace, current_workspace
+
+# Project storage directories of the default workspace
 PROJECTS_DIR = Path("projects")
 ACTIVE_FILE = Path(".gridfinity-active")
 
+# Environment variable naming the active project for the current session
+PROJECT_ENV_VAR = "GF_PROJECT"
+
+# Project index, stored in PROJECTS_DIR
+INDEX_NAME = ".index"
+INDEX_VERSION = 1
+
+# Component change journal, stored next to config.json
+JOURNAL_NAME = "journal.jsonl"
+JOURNAL_COMPACT_BYTES = 256 * 1024  # Compact automatically past this size
 
-def get_active_project() -> str | None:
-    """Get the currently active project name.
+
+class ProjectSummary(NamedTuple):
+    """Cached summary of a project from the project index."""
+
+    name: str
+    components: int
+    size: int  # Total bytes of the files in the project directory
+    modified: float | None  # Last config or journal change; None if no config
+
+
+def get_active_project(
+    project: str = "", workspace: Workspace | None = None
+) -> str | None:
+    """Get the project a command should work on.
+
+    An explicitly requested project wins, then the GF_PROJECT environment
+    variable, then the shared .gridfinity-active file. Setting GF_PROJECT
+    (or passing --project) lets parallel sessions work on different projects
+    without overwriting each other's active project.
+
+    Args:
+        project: Project requested explicitly, e.g. with --project.
+        workspace: Workspace whose active file to read.
 
     Returns:
-        Project name if active project exists, None otherwise.
+        Project name if one is requested or active, None otherwise.
     """
+    if project:
+        return project
+    if env_project := os.environ.get(PROJECT_ENV_VAR, "").strip():
+        return env_project
     try:
-        return ACTIVE_FILE.read_text().strip()
+        active_file = (workspace or current_workspace()).active_file
+        return active_file.read_text().strip() or None
     except FileNotFoundError:
         return None
 
 
-def set_active_project(name: str) -> None:
+def set_active_project(name: str, workspace: Workspace | None = None) -> None:
     """Set the active project.
 
+    The active file is replaced atomically, so concurrent sessions never
+    read a partly written name.
+
     Args:
         name: Project name to set as active.
+        workspace: Workspace whose active file to write.
     """
-    ACTIVE_FILE.write_text(name)
+    with atomic_output((workspace or current_workspace()).active_file) as temp_path:
+        temp_path.write_text(name)
 
 
-def get_project_path(name: str) -> Path:
+def get_project_path(name: str, workspace: Workspace | None = None) -> Path:
     """Get the path to a project directory.
 
     Args:
         name: Project name.
+        workspace: Workspace holding the project.
 
     Returns:
         Path to the project directory (projects/<name>/).
     """
-    return PROJECTS_DIR / name
+    return (workspace or current_workspace()).projects_dir / name
 
 
-def load_project_config(name: str) -> dict:
+def load_project_config(
+    name: str, workspace: Workspace | None = None
+) -> dict[str, Any]:
     """Load and parse a project's configuration.
 
+    The journal of component changes, if any, is replayed over the
+    config.json snapshot.
+
     Args:
         name: Project name.
+        workspace: Workspace holding the project.
 
     Returns:
         Parsed configuration dictionary.
@@ -57,47 +138,371 @@ def load_project_config(name: str) -> dict:
         FileNotFoundError: If the project or config doesn't exist.
         json.JSONDecodeError: If the config is invalid JSON.
     """
-    config_path = get_project_path(name) / "config.json"
-    return json.loads(config_path.read_text())
+    config_path = get_project_path(name, workspace) / "config.json"
+    config: dict[str, Any] = json.loads(config_path.read_text())
+    entries = read_journal(name, workspace)
+    if entries:
+        config["components"] = _replay_journal(config.get("components", []), entries)
+    return config
 
 
-def save_project_config(name: str, config: dict) -> None:
+def save_project_config(
+    name: str, config: dict[str, Any], workspace: Workspace | None = None
+) -> None:
     """Save a project configuration to disk.
 
+    The config replaces the snapshot atomically and the journal is cleared,
+    since the config passed in is the whole project.
+
     Args:
         name: Project name.
         config: Configuration dictionary to save.
+        workspace: Workspace holding the project.
     """
-    project_path = get_project_path(name)
+    project_path = get_project_path(name, workspace)
     project_path.mkdir(parents=True, exist_ok=True)
-
-    config_path = project_path / "config.json"
-    config_path.write_text(json.dumps(config, indent=2))
+    with _project_lock(project_path):
+        _write_config(project_path, config)
+    update_project_index(name, workspace)
 
 
-def add_component_to_config(name: str, component: dict) -> None:
+def add_component_to_config(
+    name: str, component: dict[str, Any], workspace: Workspace | None = None
+) -> None:
     """Add or update a component in the project configuration.
 
     If a component with the same name already exists, it is replaced.
-    Otherwise, the new component is appended.
+    Otherwise, the new component is appended. The change is appended to
+    the project journal rather than rewriting config.json.
 
     Args:
         name: Project name.
         component: Component dictionary with at minimum a 'name' key.
+        workspace: Workspace holding the project.
+
+    Raises:
+        FileNotFoundError: If the project or config doesn't exist.
+    """
+    _append_journal(name, {"op": "put", "component": component}, workspace)
+
+
+def remove_component_from_config(
+    name: str, component_name: str, workspace: Workspace | None = None
+) -> None:
+    """Remove a component from the project configuration, if it exists.
+
+    Args:
+        name: Project name.
+        component_name: Name of the component to remove.
+        workspace: Workspace holding the project.
+
+    Raises:
+        FileNotFoundError: If the project or config doesn't exist.
+    """
+    _append_journal(name, {"op": "remove", "name": component_name}, workspace)
+
+
+def read_journal(name: str, workspace: Workspace | None = None) -> list[dict[str, Any]]:
+    """Read a project's component changes since the journal was last compacted.
+
+    Each entry has an "op" of "put" (with the full "component"), "remove"
+    (with its "name") or "touch" (with "names" changed before an automatic
+    compaction), plus the "time" it was made. Lines that aren't valid
+    entries, such as one cut short by a crash, are skipped.
+
+    Args:
+        name: Project name.
+        workspace: Workspace holding the project.
+
+    Returns:
+        Journal entries, oldest first.
+    """
+    journal_path = get_project_path(name, workspace) / JOURNAL_NAME
+    try:
+        lines = journal_path.read_text().splitlines(keepends=True)
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if _is_journal_entry(entry):
+            entries.append(entry)
+    return entries
+
+
+def changed_components(name: str, workspace: Workspace | None = None) -> set[str]:
+    """Get the components added, updated or removed since the last compaction.
+
+    Args:
+        name: Project name.
+        workspace: Workspace holding the project.
+
+    Returns:
+        Names of the changed components.
     """
-    config = load_project_config(name)
-
-    # Find and update existing component or add new one
-    component_name = component["name"]
-    components = config["components"]
-
-    # Check for existing component with same name
-    for i, existing in enumerate(components):
-        if existing["name"] == component_name:
-            components[i] = component
-            save_project_config(name, config)
-            return
-
-    # No duplicate found, append new component
-    components.append(component)
-    save_project_config(name, config)
+    changed = set()
+    for entry in read_journal(name, workspace):
+        if entry["op"] == "put":
+            changed.add(entry["component"]["name"])
+        elif entry["op"] == "remove":
+            changed.add(entry["name"])
+        else:
+            changed.update(entry["names"])
+    return changed
+
+
+def compact_project(
+    name: str, workspace: Workspace | None = None, keep_changes: bool = False
+) -> None:
+    """Fold a project's journal into its config.json snapshot.
+
+    Args:
+        name: Project name.
+        workspace: Workspace holding the project.
+        keep_changes: Keep the changed component names in a fresh journal,
+            so changed_components still reports them.
+    """
+    project_path = get_project_path(name, workspace)
+    # Locked, so no append lands between reading the journal and removing it
+    with _project_lock(project_path):
+        config = load_project_config(name, workspace)
+        changed = changed_components(name, workspace) if keep_changes else set()
+        _write_config(project_path, config)
+        if changed:
+            entry = {"op": "touch", "names": sorted(changed), "time": time.time()}
+            with atomic_output(project_path / JOURNAL_NAME) as temp_path:
+                temp_path.write_text(json.dumps(entry) + "\n")
+    update_project_index(name, workspace)
+
+
+def _write_config(project_path: Path, config: dict[str, Any]) -> None:
+    """Replace a project's config.json and clear its journal; caller holds the lock."""
+    with atomic_output(project_path / "config.json") as temp_path:
+        temp_path.write_text(json.dumps(config, indent=2))
+    (project_path / JOURNAL_NAME).unlink(missing_ok=True)
+
+
+def _append_journal(
+    name: str, entry: dict[str, Any], workspace: Workspace | None
+) -> None:
+    """Append a change to a project's journal, compacting it when it grows large."""
+    project_path = get_project_path(name, workspace)
+    if not (project_path / "config.json").exists():
+        raise FileNotFoundError(f"No config.json for project '{name}'")
+
+    line = json.dumps({**entry, "time": time.time()}) + "\n"
+    with _project_lock(project_path):
+        with open(project_path / JOURNAL_NAME, "a+b") as f:
+            _drop_partial_line(f)
+            f.write(line.encode())
+            size = f.tell()
+    if size > JOURNAL_COMPACT_BYTES:
+        compact_project(name, workspace, keep_changes=True)
+
+
+def _drop_partial_line(f: BinaryIO) -> None:
+    """Cut off a last line left unfinished by a crash, so appends start clean."""
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(position - 4096, 0)
+        f.seek(start)
+        newline = f.read(position - start).rfind(b"\n")
+        if newline >= 0:
+            position = start + newline + 1
+            break
+        position = start
+    if position != end:
+        f.truncate(position)
+    f.seek(0, os.SEEK_END)
+
+
+@contextmanager
+def _project_lock(project_path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a project directory while changing its files."""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(project_path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _is_journal_entry(entry: object) -> bool:
+    """Check a decoded journal line has the fields its op needs."""
+    if not isinstance(entry, dict):
+        return False
+    op = entry.get("op")
+    if op == "put":
+        component = entry.get("component")
+        return isinstance(component, dict) and isinstance(component.get("name"), str)
+    if op == "remove":
+        return isinstance(entry.get("name"), str)
+    if op == "touch":
+        names = entry.get("names")
+        return isinstance(names, list) and all(isinstance(n, str) for n in names)
+    return False
+
+
+def _replay_journal(
+    components: list[dict[str, Any]], entries: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Apply journal entries to a component list.
+
+    A put replaces the first component with its name in place, or appends
+    it; a remove drops every component with the name. Positions are kept per
+    name, so each entry costs the same however many components there are.
+    """
+    slots: list[dict[str, Any] | None] = list(components)
+    positions: dict[str, list[int]] = {}
+    for i, component in enumerate(components):
+        positions.setdefault(component["name"], []).append(i)
+
+    for entry in entries:
+        if entry["op"] == "put":
+            component = entry["component"]
+            indexes = positions.get(component["name"])
+            if indexes:
+                slots[indexes[0]] = component
+            else:
+                positions[component["name"]] = [len(slots)]
+                slots.append(component)
+        elif entry["op"] == "remove":
+            for i in positions.pop(entry["name"], []):
+                slots[i] = None
+    return [component for component in slots if component is not None]
+
+
+def update_project_index(name: str, workspace: Workspace | None = None) -> None:
+    """Refresh a project's entry in the project index.
+
+    The index is only a cache, so failing to write it is not an error; the
+    next listing rebuilds whatever is out of date.
+
+    Args:
+        name: Project name.
+        workspace: Workspace holding the project.
+    """
+    workspace = workspace or current_workspace()
+    index = _read_index(workspace)
+    index["projects"][name] = _summarize_project(name, workspace)
+    _write_index(index, workspace)
+
+
+def list_project_summaries(
+    check_configs: bool = True, workspace: Workspace | None = None
+) -> list[ProjectSummary]:
+    """List every project from the project index, bringing it up to date.
+
+    Project directories are listed once to pick up added and removed
+    projects. With check_configs, each config.json and journal is also
+    stat'ed and only projects whose mtimes changed are read again.
+
+    Args:
+        check_configs: Check config mtimes; not needed when only names are shown.
+        workspace: Workspace whose projects to list.
+
+    Returns:
+        Project summaries sorted by name.
+    """
+    workspace = workspace or current_workspace()
+    try:
+        with os.scandir(workspace.projects_dir) as entries:
+            names = {
+                entry.name
+                for entry in entries
+                if entry.is_dir() and not entry.name.startswith(".")
+            }
+    except FileNotFoundError:
+        return []
+
+    index = _read_index(workspace)
+    indexed = index["projects"]
+    changed = False
+    for name in indexed.keys() - names:
+        del indexed[name]
+        changed = True
+    for name in names:
+        entry = indexed.get(name)
+        if entry is None or (
+            check_configs
+            and _project_mtime_ns(name, workspace) != entry["config_mtime_ns"]
+        ):
+            indexed[name] = _summarize_project(name, workspace)
+            changed = True
+    if changed:
+        _write_index(index, workspace)
+
+    return [
+        ProjectSummary(
+            name=name,
+            components=entry["components"],
+            size=entry["size"],
+            modified=(
+                entry["config_mtime_ns"] / 1e9
+                if entry["config_mtime_ns"] is not None
+                else None
+            ),
+        )
+        for name, entry in sorted(indexed.items())
+    ]
+
+
+def _project_mtime_ns(name: str, workspace: Workspace) -> int | None:
+    """Get when a project's config or journal last changed, or None if no config."""
+    project_path = get_project_path(name, workspace)
+    try:
+        mtime_ns = (project_path / "config.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    try:
+        return max(mtime_ns, (project_path / JOURNAL_NAME).stat().st_mtime_ns)
+    except FileNotFoundError:
+        return mtime_ns
+
+
+def _summarize_project(name: str, workspace: Workspace) -> dict[str, Any]:
+    """Build a project's index entry from its config and directory."""
+    config_mtime_ns = _project_mtime_ns(name, workspace)
+    try:
+        config = load_project_config(name, workspace)
+        components = len(config.get("components", []))
+    except (FileNotFoundError, json.JSONDecodeError):
+        components = 0
+
+    size = 0
+    try:
+        with os.scandir(get_project_path(name, workspace)) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    size += entry.stat(follow_symlinks=False).st_size
+    except FileNotFoundError:
+        pass
+
+    return {"components": components, "size": size, "config_mtime_ns": config_mtime_ns}
+
+
+def _read_index(workspace: Workspace) -> dict[str, Any]:
+    """Read the project index, or start an empty one if it is missing or stale."""
+    try:
+        index = json.loads((workspace.projects_dir / INDEX_NAME).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        index = None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        index = {"version": INDEX_VERSION, "projects": {}}
+    return index
+
+
+def _write_index(index: dict[str, Any], workspace: Workspace) -> None:
+    """Write the project index atomically, ignoring failures."""
+    try:
+        with atomic_output(workspace.projects_dir / INDEX_NAME) as temp_path:
+            temp_path.write_text(json.dumps(index, indent=2, sort_keys=True))
+    except OSError:
+        pass
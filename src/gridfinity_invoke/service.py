@@ -0,0 +1,311 @@
+"""Local HTTP service that generates components on request.
+
+POST /jobs with a component spec, as in a project config ("name" defaults to
+"part"), queues a render and returns the job's id and status.
+GET /jobs/<id> reports its status and files; add ?wait=SECONDS to wait for
+it to finish. GET /jobs/<id>/files/<name> downloads a finished file, streamed
+in chunks, and takes ?wait too.
+
+Renders run in a process pool behind a bounded queue; when the queue is full,
+POST gets 503. A request identical to one already queued or running joins
+that job instead of rendering again. Finished results are kept in an
+in-memory artifact cache, bounded by total size, that is checked before any
+worker, so repeated requests are answered at once; the workers themselves
+render through the BREP cache.
+
+The service has no authentication and listens on localhost by default.
+"""
+
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+from gridfinity_invoke.components import parse_component
+from gridfinity_invoke.outputs import render_component
+from gridfinity_invoke.workspace import Workspace, current_workspace, use_workspace
+
+DEFAULT_PORT = 8765
+QUEUE_SIZE = 64  # Jobs queued or running at once
+ARTIFACT_CACHE_BYTES = 256 * 1024 * 1024  # Finished results kept in memory
+JOB_HISTORY = 1024  # Finished jobs kept for status and download
+DEFAULT_NAME = "part"  # Component name when a spec has none
+
+MAX_REQUEST_BYTES = 64 * 1024
+MAX_WAIT_SECONDS = 300.0
+STREAM_CHUNK_SIZE = 64 * 1024
+CONTENT_TYPES = {
+    "stl": "model/stl",
+    "3mf": "model/3mf",
+    "step": "model/step",
+    "brep": "application/octet-stream",
+}
+
+
+class Job:
+    """A requested render and, once it finishes, its files or error."""
+
+    def __init__(self, job_id: str, spec: dict[str, Any]) -> None:
+        self.id = job_id
+        self.spec = spec
+        self.files: list[tuple[str, bytes]] = []
+        self.error: str | None = None
+        self.future: Future[list[tuple[str, bytes]]] | None = None
+        self.finished = threading.Event()
+
+    @property
+    def status(self) -> str:
+        """queued, running, done or failed."""
+        if self.finished.is_set():
+            return "failed" if self.error is not None else "done"
+        if self.future is not None and self.future.running():
+            return "running"
+        return "queued"
+
+    def finish(self, files: list[tuple[str, bytes]], error: str | None) -> None:
+        """Store the job's result and wake anyone waiting for it."""
+        self.files = files
+        self.error = error
+        self.finished.set()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Describe the job for API responses."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "spec": self.spec,
+            "files": [
+                {
+                    "name": name,
+                    "size": len(data),
+                    "url": f"/jobs/{self.id}/files/{quote(name)}",
+                }
+                for name, data in self.files
+            ],
+            "error": self.error,
+        }
+
+
+class GenerationService:
+    """Job queue rendering component specs in a process pool."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = QUEUE_SIZE,
+        workspace: Workspace | None = None,
+    ) -> None:
+        self.workspace = workspace or current_workspace()
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._in_flight: dict[str, Job] = {}
+        self._artifacts: OrderedDict[str, list[tuple[str, bytes]]] = OrderedDict()
+        self._artifact_bytes = 0
+
+        # Workers are forked, so start them before any server thread exists
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._pool.submit(int).result()
+
+    def submit(self, spec: object) -> Job | None:
+        """Queue a render, or join an identical job already queued or running.
+
+        Args:
+            spec: Component spec as in a project config; "name" is optional
+
+        Returns:
+            The job, already finished if its result was cached, or None if
+            the queue is full
+
+        Raises:
+            ValueError: If the spec is not a valid component with output files
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("Component spec must be a JSON object")
+        component = parse_component({"name": DEFAULT_NAME, **spec})
+        spec = component.to_dict()
+        if not component.outputs():
+            raise ValueError(f"Component type '{component.TYPE}' has no files")
+        key = json.dumps(spec, sort_keys=True)
+
+        with self._lock:
+            if key in self._in_flight:
+                return self._in_flight[key]
+
+            job = Job(uuid.uuid4().hex, spec)
+            if key in self._artifacts:
+                self._artifacts.move_to_end(key)
+                job.finish(self._artifacts[key], None)
+                self._add_job(job)
+                return job
+
+            if len(self._in_flight) >= self.queue_size:
+                return None
+            self._in_flight[key] = job
+            self._add_job(job)
+            future = self._pool.submit(_render, self.workspace, spec)
+            job.future = future
+
+        future.add_done_callback(lambda future: self._finish(key, job, future))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Get a job by id, or None if it is unknown or was forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def close(self) -> None:
+        """Cancel queued renders and stop the workers."""
+        self._pool.shutdown(cancel_futures=True)
+
+    def _add_job(self, job: Job) -> None:
+        """Track a job, forgetting the oldest finished ones past JOB_HISTORY."""
+        self._jobs[job.id] = job
+        if len(self._jobs) > JOB_HISTORY:
+            for old in [j for j in self._jobs.values() if j.finished.is_set()]:
+                del self._jobs[old.id]
+                if len(self._jobs) <= JOB_HISTORY:
+                    break
+
+    def _finish(
+        self, key: str, job: Job, future: Future[list[tuple[str, bytes]]]
+    ) -> None:
+        """Record a finished render and cache its files."""
+        try:
+            files = future.result()
+            error = None
+        except Exception as e:
+            files = []
+            error = str(e) or type(e).__name__
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if error is None:
+                self._artifacts[key] = files
+                self._artifact_bytes += _files_size(files)
+                while self._artifact_bytes > ARTIFACT_CACHE_BYTES:
+                    _, old = self._artifacts.popitem(last=False)
+                    self._artifact_bytes -= _files_size(old)
+        job.finish(files, error)
+
+
+class GenerationServer(ThreadingHTTPServer):
+    """HTTP server exposing a GenerationService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: GenerationService) -> None:
+        super().__init__(address, _RequestHandler)
+        self.service = service
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handles the /jobs API."""
+
+    @property
+    def service(self) -> GenerationService:
+        """The service of the server handling this request."""
+        assert isinstance(self.server, GenerationServer)
+        return self.server.service
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Content-Length must be a byte count"})
+            return
+        if length > MAX_REQUEST_BYTES:
+            self._send_json(413, {"error": "Request too large"})
+            return
+        try:
+            spec = json.loads(self.rfile.read(length))
+            job = self.service.submit(spec)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        if job is None:
+            self._send_json(503, {"error": "Job queue is full"}, {"Retry-After": "5"})
+            return
+
+        status = 200 if job.finished.is_set() else 202
+        self._send_json(status, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if len(parts) not in (2, 4) or parts[0] != "jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        if len(parts) == 4 and parts[2] != "files":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job '{parts[1]}'"})
+            return
+        try:
+            wait = float(parse_qs(url.query).get("wait", ["0"])[0])
+        except ValueError:
+            self._send_json(400, {"error": "wait must be a number of seconds"})
+            return
+        job.finished.wait(min(max(wait, 0.0), MAX_WAIT_SECONDS))
+
+        if len(parts) == 2:
+            self._send_json(200, job.to_dict())
+            return
+        if not job.finished.is_set() or job.error is not None:
+            self._send_json(409, job.to_dict())
+            return
+        files = dict(job.files)
+        name = unquote(parts[3])
+        if name not in files:
+            self._send_json(404, {"error": f"No file '{name}' in job"})
+            return
+        self._send_file(name, files[name])
+
+    def _send_json(
+        self, status: int, body: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_file(self, name: str, data: bytes) -> None:
+        extension = name.rsplit(".", 1)[-1]
+        self.send_response(200)
+        self.send_header(
+            "Content-Type", CONTENT_TYPES.get(extension, "application/octet-stream")
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Content-Disposition", f'attachment; filename="{name}"')
+        self.end_headers()
+        view = memoryview(data)
+        for start in range(0, len(view), STREAM_CHUNK_SIZE):
+            self.wfile.write(view[start : start + STREAM_CHUNK_SIZE])
+
+
+def _files_size(files: list[tuple[str, bytes]]) -> int:
+    """Get the total size of a result's files."""
+    return sum(len(data) for _, data in files)
+
+
+def _render(workspace: Workspace, spec: dict[str, Any]) -> list[tuple[str, bytes]]:
+    """Render a component's files in a worker process."""
+    with use_workspace(workspace):
+        return [(name, bytes(buffer)) for name, buffer in render_component(spec)]
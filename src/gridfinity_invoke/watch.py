@@ -0,0 +1,364 @@
+"""Watch a project and re-render components as its config changes.
+
+The project's config.json and journal and the printer config are watched
+with inotify on Linux, or by polling their stat signatures elsewhere. Each
+burst of saves is debounced, the new config is diffed against the last one
+and only added or changed components are queued for rendering.
+
+Renders run one at a time in a single background process that stays warm
+(CAD libraries imported once) between changes. Queued renders of components
+that change again are dropped, and a render already in flight for one is
+cancelled by restarting the process.
+"""
+
+import ctypes
+import ctypes.util
+import multiprocessing
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from gridfinity_invoke.components import (
+    Component,
+    DrawerFitComponent,
+    OutlineFitComponent,
+    load_components,
+)
+from gridfinity_invoke.config import get_print_bed_dimensions
+from gridfinity_invoke.manifest import record_component
+from gridfinity_invoke.projects import JOURNAL_NAME, get_project_path
+from gridfinity_invoke.workspace import Workspace, current_workspace, use_workspace
+
+# Quiet time after a change before the config is re-read
+DEBOUNCE_SECONDS = 0.3
+# Interval between stat checks when inotify isn't available
+POLL_INTERVAL_SECONDS = 0.5
+
+# inotify events that mean a file was written, replaced or removed
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_INOTIFY_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """Waits for any of a set of files to change.
+
+    With inotify the files' directories are watched, so editors that save
+    by writing a new file and renaming it over the old one are still seen.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        self.paths = [Path(path) for path in paths]
+        self.poll_interval = poll_interval
+        self._fd: int | None = None
+        self._watches: dict[int, set[str]] = {}
+        if use_inotify:
+            self._start_inotify()
+        self._signature = self._stat_signature()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are reported by inotify rather than polling."""
+        return self._fd is not None
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a change.
+
+        Returns:
+            True if a watched file changed
+        """
+        if self._fd is not None:
+            return self._wait_inotify(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            signature = self._stat_signature()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.poll_interval, remaining))
+
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _start_inotify(self) -> None:
+        """Watch the files' directories with inotify, if the OS has it."""
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        directories: dict[Path, set[str]] = {}
+        for path in self.paths:
+            directories.setdefault(path.parent, set()).add(path.name)
+        for directory, names in directories.items():
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), _INOTIFY_MASK)
+            if wd < 0:
+                os.close(fd)
+                return
+            self._watches[wd] = names
+        self._fd = fd
+
+    def _wait_inotify(self, timeout: float) -> bool:
+        """Wait for inotify events naming a watched file."""
+        assert self._fd is not None
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = max(deadline - time.monotonic(), 0)
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        """Drain pending inotify events, checking if any name a watched file."""
+        assert self._fd is not None
+        changed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                start = offset + _INOTIFY_EVENT.size
+                name = data[start : start + length].rstrip(b"\0").decode()
+                if name in self._watches.get(wd, ()):
+                    changed = True
+                offset = start + length
+
+    def _stat_signature(self) -> list[tuple[int, int, int] | None]:
+        """Get the mtime, size and inode of each watched file."""
+        signature: list[tuple[int, int, int] | None] = []
+        for path in self.paths:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return signature
+
+
+def diff_components(
+    old: Iterable[Component], new: Iterable[Component], printer_changed: bool = False
+) -> tuple[list[Component], list[str]]:
+    """Find the components to re-render after a config change.
+
+    Args:
+        old: Components before the change
+        new: Components after the change
+        printer_changed: The print bed size changed, which changes how
+            drawer-fit baseplates are split
+
+    Returns:
+        (added or changed components in config order, names of removed ones)
+    """
+    old_by_name = {component.name: component for component in old}
+    new_list = list(new)
+    changed = [
+        component
+        for component in new_list
+        if old_by_name.get(component.name) != component
+        or (
+            printer_changed
+            and isinstance(component, DrawerFitComponent | OutlineFitComponent)
+        )
+    ]
+    new_names = {component.name for component in new_list}
+    removed = [name for name in old_by_name if name not in new_names]
+    return changed, removed
+
+
+def watch_project(
+    project: str,
+    report: Callable[[str, bool], None],
+    stop: threading.Event | None = None,
+    preview: bool = False,
+    workspace: Workspace | None = None,
+    use_inotify: bool = True,
+) -> None:
+    """Re-render a project's components whenever its config changes.
+
+    Runs until stop is set (or the caller is interrupted). Renders that
+    finish are recorded in the project manifest.
+
+    Args:
+        project: Project name
+        report: Called with (message, is_error) for progress messages
+        stop: Set to stop watching
+        preview: Also write drawer-fit assembly previews
+        workspace: Workspace holding the project
+        use_inotify: Use inotify when available, rather than polling
+
+    Raises:
+        FileNotFoundError: If the project or its config doesn't exist
+        ValueError: If the config is invalid when watching starts
+    """
+    workspace = workspace or current_workspace()
+    stop = stop or threading.Event()
+    project_path = get_project_path(project, workspace)
+    components = load_components(project, workspace)
+    bed = get_print_bed_dimensions(workspace)
+
+    watcher = FileWatcher(
+        [
+            project_path / "config.json",
+            project_path / JOURNAL_NAME,
+            workspace.config_file,
+        ],
+        use_inotify=use_inotify,
+    )
+    renderer = _Renderer(workspace, project_path, preview)
+    backlog: list[Component] = []
+    running: Component | None = None
+    method = "inotify" if watcher.uses_inotify else "polling"
+    report(f"Watching {project} ({len(components)} component(s), {method})", False)
+
+    try:
+        while not stop.is_set():
+            if watcher.wait(0.1):
+                while watcher.wait(DEBOUNCE_SECONDS):
+                    pass
+                try:
+                    new_components = load_components(project, workspace)
+                except (ValueError, OSError) as e:
+                    report(f"Invalid config, waiting for the next save: {e}", True)
+                    continue
+                new_bed = get_print_bed_dimensions(workspace)
+                changed, removed = diff_components(
+                    components, new_components, new_bed != bed
+                )
+                components, bed = new_components, new_bed
+                for name in removed:
+                    report(f"Removed {name}", False)
+
+                superseded = {c.name for c in changed} | set(removed)
+                backlog = [c for c in backlog if c.name not in superseded]
+                if running is not None and running.name in superseded:
+                    report(f"Cancelled stale render of {running.name}", False)
+                    renderer.restart()
+                    running = None
+                backlog.extend(changed)
+
+            if running is not None:
+                error = renderer.result()
+                if error is not None:
+                    if error:
+                        report(f"Failed to render {running.name}: {error}", True)
+                    else:
+                        record_component(project, running.to_dict(), workspace)
+                        report(f"Rendered {running.name}", False)
+                    running = None
+
+            if running is None and backlog:
+                running = backlog.pop(0)
+                report(f"Rendering {running.name}...", False)
+                renderer.submit(running)
+    finally:
+        watcher.close()
+        renderer.close()
+
+
+class _Renderer:
+    """A warm background process that renders one component at a time."""
+
+    def __init__(self, workspace: Workspace, project_path: Path, preview: bool) -> None:
+        self._args = (workspace, project_path, preview)
+        self._context = multiprocessing.get_context()
+        self._start()
+
+    def submit(self, component: Component) -> None:
+        """Start rendering a component; only one may be in flight."""
+        self._jobs.put(component.to_dict())
+
+    def result(self) -> str | None:
+        """Get the in-flight render's result: "" on success, an error message
+        on failure, or None if it hasn't finished."""
+        try:
+            result: str = self._results.get_nowait()
+            return result
+        except queue.Empty:
+            if not self._process.is_alive():
+                self._start()
+                return "render process exited"
+            return None
+
+    def restart(self) -> None:
+        """Cancel the in-flight render by replacing the process."""
+        self._process.terminate()
+        self._process.join()
+        self._start()
+
+    def close(self) -> None:
+        """Stop the process."""
+        self._process.terminate()
+        self._process.join()
+
+    def _start(self) -> None:
+        # Not a daemon: drawer-fit renders start a process pool of their own
+        self._jobs = self._context.Queue()
+        self._results = self._context.Queue()
+        self._process = self._context.Process(
+            target=_render_worker,
+            args=(self._jobs, self._results, *self._args),
+        )
+        self._process.start()
+
+
+def _render_worker(
+    jobs: "multiprocessing.Queue[dict[str, Any]]",
+    results: "multiprocessing.Queue[str]",
+    workspace: Workspace,
+    project_path: Path,
+    preview: bool,
+) -> None:
+    """Render components from the jobs queue, reporting each result."""
+    from gridfinity_invoke.components import parse_component
+
+    with use_workspace(workspace):
+        while True:
+            data = jobs.get()
+            try:
+                parse_component(data).generate(project_path, preview)
+            except Exception as e:
+                results.put(str(e) or type(e).__name__)
+            else:
+                results.put("")
@@ -0,0 +1,109 @@
+"""Workspaces: the printer config, projects and render cache of one folder.
+
+By default the library works in the current directory, at the paths given by
+config.CONFIG_FILE, projects.PROJECTS_DIR, projects.ACTIVE_FILE and
+brep_cache.BREP_CACHE_DIR. A Workspace(root) holds the same files under any
+other folder, so one process can serve several workspaces at once.
+
+Project, manifest and printer config functions take a workspace argument.
+Generators find theirs with current_workspace(), which a caller sets for the
+current thread or async task with use_workspace().
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+
+class Workspace:
+    """Printer config, project storage and render cache under one root.
+
+    The printer config read from config_file is cached on the workspace
+    (printer_config_cache) and re-read only when the file's mtime or size
+    changes; see config.load_printer_config.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        config_file: Path | None = None,
+        projects_dir: Path | None = None,
+        active_file: Path | None = None,
+        brep_cache_dir: Path | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.config_file = config_file or self.root / ".gf-config"
+        self.projects_dir = projects_dir or self.root / "projects"
+        self.active_file = active_file or self.root / ".gridfinity-active"
+        self.brep_cache_dir = brep_cache_dir or self.root / ".gf-cache" / "brep"
+        # ((mtime_ns, size), config) of the last printer config read
+        self.printer_config_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+
+    def __repr__(self) -> str:
+        return f"Workspace({str(self.root)!r})"
+
+
+_current_workspace: ContextVar[Workspace | None] = ContextVar(
+    "gridfinity_workspace", default=None
+)
+_default_workspaces: dict[tuple[Path, Path, Path, Path], Workspace] = {}
+
+
+def default_workspace() -> Workspace:
+    """Get the workspace described by the module-level paths.
+
+    The paths are read on every call, so code (and tests) that reassign
+    them keep working; one Workspace is kept per set of paths so its printer
+    config cache survives between calls.
+
+    Returns:
+        Workspace in the current directory
+    """
+    from gridfinity_invoke import brep_cache, config, projects
+
+    paths = (
+        config.CONFIG_FILE,
+        projects.PROJECTS_DIR,
+        projects.ACTIVE_FILE,
+        brep_cache.BREP_CACHE_DIR,
+    )
+    workspace = _default_workspaces.get(paths)
+    if workspace is None:
+        workspace = Workspace(
+            ".",
+            config_file=paths[0],
+            projects_dir=paths[1],
+            active_file=paths[2],
+            brep_cache_dir=paths[3],
+        )
+        _default_workspaces[paths] = workspace
+    return workspace
+
+
+def current_workspace() -> Workspace:
+    """Get the workspace set by use_workspace, or the default workspace.
+
+    Returns:
+        Workspace for the current thread or async task
+    """
+    return _current_workspace.get() or default_workspace()
+
+
+@contextmanager
+def use_workspace(workspace: Workspace) -> Iterator[Workspace]:
+    """Make a workspace current for the calling thread or async task.
+
+    Args:
+        workspace: Workspace for generators and functions called without one
+
+    Yields:
+        The workspace
+    """
+    token = _current_workspace.set(workspace)
+    try:
+        yield workspace
+    finally:
+        _current_workspace.reset(token)
@@ -29,3 +29,22 @@ def subprocess_lock() -> None:
     tests by file and reduce parallel subprocess spawning.
     """
     pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_brep_cache(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Keep rendered-solid checkpoints out of the working directory."""
+    from gridfinity_invoke import brep_cache
+
+    cache_dir = tmp_path_factory.mktemp("brep-cache")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(brep_cache, "BREP_CACHE_DIR", cache_dir)
+        yield cache_dir
+
+
+@pytest.fixture(autouse=True)
+def no_session_project(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep a GF_PROJECT set in the calling shell from leaking into tests."""
+    from gridfinity_invoke.projects import PROJECT_ENV_VAR
+
+    monkeypatch.delenv(PROJECT_ENV_VAR, raising=False)
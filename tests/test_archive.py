@@ -0,0 +1,139 @@
+"""Tests for project archive export."""
+
+import io
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke import projects
+from gridfinity_invoke.archive import write_project_3mf, write_project_zip
+from gridfinity_invoke.generators import generate_baseplate
+from gridfinity_invoke.mesh import THREEMF_MODEL_PATH
+from gridfinity_invoke.outputs import component_outputs, render_component
+
+PLATE = {"name": "plate", "type": "baseplate", "length": 1, "width": 1}
+BIN = {"name": "cup", "type": "bin", "length": 1, "width": 1, "height": 2}
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a project whose baseplate is on disk and whose bin is missing."""
+    monkeypatch.setattr(projects, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(projects, "ACTIVE_FILE", tmp_path / ".gridfinity-active")
+    projects.save_project_config("shop", {"name": "shop", "components": [PLATE, BIN]})
+    project_path = projects.get_project_path("shop")
+    generate_baseplate(1, 1, project_path / "plate.stl")
+    return project_path
+
+
+def test_component_outputs_match_load_file_names() -> None:
+    """Test expected file names for split, unsplit and outline drawer-fits."""
+    drawer = {"name": "d", "type": "drawer-fit", "width_mm": 200, "depth_mm": 170}
+    split = {**drawer, "split_count": 2, "formats": ["stl", "step"]}
+    outline = {
+        "name": "l",
+        "type": "drawer-fit",
+        "rects": "0,0,168,84;0,84,84,84",
+        "split_count": 2,
+    }
+    layout = {"name": "x", "type": "layout", "units_width": 4, "units_depth": 2}
+
+    assert component_outputs(drawer) == ["d-baseplate.stl", "d-spacers.stl"]
+    assert component_outputs(split)[:3] == [
+        "d-baseplate-1.stl",
+        "d-baseplate-1.step",
+        "d-baseplate-2.stl",
+    ]
+    assert component_outputs(outline) == ["l-baseplate-1.stl", "l-baseplate-2.stl"]
+    assert component_outputs(layout) == []
+
+
+def test_render_component_keeps_the_recorded_split() -> None:
+    """Test a split drawer renders the pieces its config and manifest name."""
+    # 7x2 units split on the default 225mm bed into 5x2 and 2x2, no spacers
+    drawer = {
+        "name": "d",
+        "type": "drawer-fit",
+        "width_mm": 300,
+        "depth_mm": 90,
+        "split_count": 2,
+    }
+
+    assert [name for name, _ in render_component(drawer)] == component_outputs(drawer)
+    with pytest.raises(ValueError, match="split into 3 pieces"):
+        list(render_component({**drawer, "split_count": 3}))
+
+
+def test_zip_copies_files_and_renders_missing(project: Path) -> None:
+    """Test the zip holds disk files as-is, renders missing ones and a manifest."""
+    config = projects.load_project_config("shop")
+    stream = io.BytesIO()
+
+    entries = write_project_zip("shop", project, config, stream)
+
+    assert [(e.name, e.rendered) for e in entries] == [
+        ("plate.stl", False),
+        ("cup.stl", True),
+    ]
+    assert not (project / "cup.stl").exists()
+    with zipfile.ZipFile(stream) as zf:
+        assert zf.namelist() == [
+            "shop/plate.stl",
+            "shop/cup.stl",
+            "shop/config.json",
+            "shop/manifest.json",
+        ]
+        assert zf.read("shop/plate.stl") == (project / "plate.stl").read_bytes()
+        manifest = json.loads(zf.read("shop/manifest.json"))
+    assert manifest["files"][1] == {
+        "name": "cup.stl",
+        "component": "cup",
+        "rendered": True,
+        "size": entries[1].size,
+    }
+
+
+def test_3mf_has_one_object_per_mesh(project: Path) -> None:
+    """Test a 3MF archive holds each STL as a named object plus metadata."""
+    config = projects.load_project_config("shop")
+    stream = io.BytesIO()
+
+    write_project_3mf("shop", project, config, stream)
+
+    with zipfile.ZipFile(stream) as zf:
+        model = zf.read(THREEMF_MODEL_PATH).decode()
+        assert json.loads(zf.read("Metadata/config.json")) == config
+    assert model.count("<object ") == 2
+    assert 'name="plate"' in model and 'name="cup"' in model
+    assert model.count("<item ") == 2
+
+
+def test_export_archive_task_streams_to_stdout(
+    project: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Test gf.export-archive --output - writes the zip to stdout."""
+    from invoke_collections.gf import export_archive
+
+    export_archive(MockContext(), "shop", output="-")
+
+    captured = capsysbinary.readouterr()
+    with zipfile.ZipFile(io.BytesIO(captured.out)) as zf:
+        assert "shop/manifest.json" in zf.namelist()
+    assert b"Archived 2 file(s)" in captured.err
+
+
+def test_export_archive_task_rejects_unknown_format(
+    project: Path, tmp_path: Path
+) -> None:
+    """Test an unknown archive format fails without leaving a file behind."""
+    from invoke_collections.gf import export_archive
+
+    output = tmp_path / "out" / "shop.tar"
+    with pytest.raises(SystemExit) as exc_info:
+        export_archive(MockContext(), "shop", output=str(output), format="tar")
+
+    assert exc_info.value.code == 1
+    assert list(output.parent.iterdir()) == []
@@ -0,0 +1,96 @@
+"""Tests for atomic output writing."""
+
+import os
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+from gridfinity_invoke.atomic import atomic_output, same_contents
+from gridfinity_invoke.generators import export_shape, link_piece
+
+
+def _age(path: Path) -> int:
+    """Set a file's mtime an hour into the past and return it."""
+    mtime = path.stat().st_mtime_ns - 3600 * 10**9
+    os.utime(path, ns=(mtime, mtime))
+    return mtime
+
+
+def test_unchanged_output_keeps_mtime(tmp_path: Path) -> None:
+    """Test rewriting identical contents leaves the file untouched."""
+    path = tmp_path / "bin.stl"
+    path.write_bytes(b"solid")
+    mtime = _age(path)
+
+    with atomic_output(path) as temp_path:
+        temp_path.write_bytes(b"solid")
+
+    assert path.stat().st_mtime_ns == mtime
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_changed_output_is_replaced(tmp_path: Path) -> None:
+    """Test new contents replace the file with normal permissions."""
+    path = tmp_path / "out" / "bin.stl"
+
+    with atomic_output(path) as temp_path:
+        assert temp_path.parent == path.parent
+        temp_path.write_bytes(b"first")
+    with atomic_output(path) as temp_path:
+        temp_path.write_bytes(b"second")
+
+    assert path.read_bytes() == b"second"
+    assert path.stat().st_mode & 0o777 != 0o600
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_failed_write_leaves_original(tmp_path: Path) -> None:
+    """Test an exception keeps the old file and removes the temporary file."""
+    path = tmp_path / "bin.stl"
+    path.write_bytes(b"original")
+
+    with pytest.raises(RuntimeError), atomic_output(path) as temp_path:
+        temp_path.write_bytes(b"trunc")
+        raise RuntimeError("interrupted")
+
+    assert path.read_bytes() == b"original"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_same_contents_compares_bytes(tmp_path: Path) -> None:
+    """Test files of equal size but different bytes are not the same."""
+    a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+    a.write_bytes(b"abc")
+    b.write_bytes(b"abd")
+    c.write_bytes(b"abc")
+
+    assert not same_contents(a, b)
+    assert same_contents(a, c)
+
+
+def test_reexport_skips_unchanged_files(tmp_path: Path) -> None:
+    """Test exporting the same shape twice keeps STL and BREP mtimes."""
+    box = cq.Workplane("XY").box(10, 20, 5)
+    stl_path, brep_path = export_shape(box, tmp_path / "box.stl", ["stl", "brep"])
+    mtimes = [_age(stl_path), _age(brep_path)]
+
+    export_shape(box, tmp_path / "box.stl", ["stl", "brep"])
+
+    assert [stl_path.stat().st_mtime_ns, brep_path.stat().st_mtime_ns] == mtimes
+
+
+def test_link_piece_keeps_identical_destination(tmp_path: Path) -> None:
+    """Test linking over an identical copy leaves it alone."""
+    source = tmp_path / "source.stl"
+    source.write_bytes(b"piece")
+    destination = tmp_path / "piece.stl"
+    destination.write_bytes(b"piece")
+    mtime = _age(destination)
+
+    link_piece(source, destination)
+    assert destination.stat().st_mtime_ns == mtime
+
+    source.write_bytes(b"changed")
+    link_piece(source, destination)
+    assert destination.read_bytes() == b"changed"
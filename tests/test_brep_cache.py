@@ -0,0 +1,121 @@
+"""Tests for the rendered-solid checkpoint cache."""
+
+from collections import OrderedDict
+from pathlib import Path
+
+import cadquery as cq
+import pytest
+
+from gridfinity_invoke import brep_cache
+from gridfinity_invoke.brep_cache import cache_key, render_cached
+from gridfinity_invoke.generators import generate_bin
+from gridfinity_invoke.mesh import read_stl
+
+
+def test_cache_key_depends_on_params_and_versions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test keys change with parameters and library versions."""
+    key = cache_key("bin", {"length": 2, "width": 2, "height": 3})
+
+    assert key == cache_key("bin", {"height": 3, "width": 2, "length": 2})
+    assert key != cache_key("bin", {"length": 2, "width": 2, "height": 4})
+    assert key != cache_key("baseplate", {"length": 2, "width": 2, "height": 3})
+
+    # Versions are looked up once per process
+    monkeypatch.setattr(brep_cache, "version", lambda package: "99.0")
+    assert key == cache_key("bin", {"length": 2, "width": 2, "height": 3})
+    brep_cache.library_versions.cache_clear()
+    try:
+        assert key != cache_key("bin", {"length": 2, "width": 2, "height": 3})
+    finally:
+        brep_cache.library_versions.cache_clear()
+
+
+def test_render_cached_renders_once(isolated_brep_cache: Path) -> None:
+    """Test a second lookup loads the BREP instead of rendering again."""
+    calls = []
+
+    def render() -> cq.Workplane:
+        calls.append(1)
+        return cq.Workplane("XY").box(10, 20, 5)
+
+    first = render_cached("box", {"size": 1}, render)
+    second = render_cached("box", {"size": 1}, render)
+
+    assert len(calls) == 1
+    assert len(list(isolated_brep_cache.glob("*.brep"))) == 1
+    assert first is not None and second is not None
+    assert second.Volume() == pytest.approx(first.Volume())
+
+
+def test_render_cached_replaces_unreadable_entry(isolated_brep_cache: Path) -> None:
+    """Test a corrupt cache entry is re-rendered and overwritten."""
+    path = isolated_brep_cache / f"{cache_key('box', {})}.brep"
+    path.write_text("not a brep")
+
+    shape = render_cached("box", {}, lambda: cq.Workplane("XY").box(1, 1, 1))
+
+    assert shape is not None
+    assert shape.Volume() == pytest.approx(1.0)
+    assert path.stat().st_size > len("not a brep")
+
+
+def test_prune_cache_drops_least_recently_used(isolated_brep_cache: Path) -> None:
+    """Test pruning deletes the oldest entries first and spares the kept one."""
+    import os
+
+    paths = [isolated_brep_cache / f"{name}.brep" for name in "abcd"]
+    for age, path in enumerate(paths):
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 - age, 1000 - age))
+
+    # d is the oldest, but kept; c and b go to get under 250 bytes
+    assert brep_cache.prune_cache(isolated_brep_cache, 250, keep=paths[3]) == 200
+    assert [p.exists() for p in paths] == [True, False, False, True]
+
+
+def test_render_cached_does_not_cache_none(isolated_brep_cache: Path) -> None:
+    """Test renders with nothing to produce are not cached."""
+    assert render_cached("spacers", {}, lambda: None) is None
+    assert not list(isolated_brep_cache.iterdir())
+
+
+def test_generate_bin_reexports_at_new_tolerance(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a bin re-exported at another tolerance reuses the cached solid."""
+    generate_bin(1, 1, 2, tmp_path / "draft.stl", tolerance=0.1)
+
+    def fail_render(self: object) -> None:
+        raise AssertionError("bin was rendered again")
+
+    monkeypatch.setattr("cqgridfinity.GridfinityBox.render", fail_render)
+    generate_bin(1, 1, 2, tmp_path / "fine.stl", tolerance=1e-3)
+
+    assert len(read_stl(tmp_path / "fine.stl")) > len(read_stl(tmp_path / "draft.stl"))
+
+
+def test_memory_cache_keeps_recent_solids(
+    isolated_brep_cache: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test solids stay in memory when enabled, least recently used out first."""
+    monkeypatch.setattr(brep_cache, "MEMORY_CACHE_SIZE", 2)
+    monkeypatch.setattr(brep_cache, "_memory_cache", OrderedDict())
+
+    def box(size: float) -> cq.Shape:
+        return render_cached(
+            "box", {"size": size}, lambda: cq.Workplane().box(size, 1, 1)
+        )
+
+    first = box(1)
+    assert box(1) is first
+    box(2)
+    assert box(1) is first  # Used last, so box 2 is the oldest
+    box(3)
+
+    assert len(brep_cache._memory_cache) == 2
+    assert box(1) is first
+    assert box(2) is not None  # Reloaded from disk
+    brep_cache.clear_memory_cache()
+    assert box(1) is not first
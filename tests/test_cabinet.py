@@ -0,0 +1,95 @@
+"""Tests for cabinet-scale drawer-fit planning and generation."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+import gridfinity_invoke.config as config
+from gridfinity_invoke.cabinet import (
+    DrawerMeasurement,
+    generate_cabinet,
+    read_drawer_csv,
+)
+from gridfinity_invoke.generators import calculate_baseplate_splits
+from gridfinity_invoke.planning import drawer_pieces, plan_drawers
+
+
+@pytest.fixture(autouse=True)
+def temp_config_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Set up a temporary config directory for tests (default 225mm bed)."""
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / ".gf-config")
+    return tmp_path
+
+
+def test_vectorized_plans_match_scalar_splits() -> None:
+    """Test vectorized planning agrees with calculate_baseplate_splits."""
+    widths = [100.0, 300.0, 530.0, 210.0, 1008.0]
+    depths = [100.0, 247.0, 247.0, 420.0, 43.0]
+
+    plans = plan_drawers(widths, depths, 5, 5)
+
+    for i, (width, depth) in enumerate(zip(widths, depths)):
+        splits = calculate_baseplate_splits(int(width // 42), int(depth // 42))
+        assert drawer_pieces(plans, i) == splits
+        assert plans.piece_count[i] == len(splits)
+    assert list(plans.needs_spacers) == [True, True, True, False, False]
+
+
+def test_read_drawer_csv_names_unnamed_drawers(tmp_path: Path) -> None:
+    """Test CSV parsing with optional names."""
+    csv_path = tmp_path / "drawers.csv"
+    csv_path.write_text("name,width,depth\ntop,500,400\n,300,250\n")
+
+    drawers = read_drawer_csv(csv_path)
+
+    assert drawers == [
+        DrawerMeasurement("top", 500.0, 400.0),
+        DrawerMeasurement("drawer-2", 300.0, 250.0),
+    ]
+
+
+@pytest.mark.parametrize("name", ["../x", "a/b", "a\\b", ".hidden", "pieces"])
+def test_read_drawer_csv_rejects_unsafe_names(tmp_path: Path, name: str) -> None:
+    """Test names that would escape or clash in the output folder are refused."""
+    csv_path = tmp_path / "drawers.csv"
+    csv_path.write_text(f"name,width,depth\n{name},500,400\n")
+
+    with pytest.raises(ValueError, match="Line 2"):
+        read_drawer_csv(csv_path)
+
+
+def test_generate_cabinet_dedupes_pieces_and_writes_print_list(
+    tmp_path: Path,
+) -> None:
+    """Test identical pieces are rendered once and counted in the print list."""
+    drawers = [
+        DrawerMeasurement("a", 200.0, 100.0),  # 4x2, spacers
+        DrawerMeasurement("b", 200.0, 100.0),  # identical to a
+        DrawerMeasurement("c", 260.0, 86.0),  # 6x2 -> 5x2 + 1x2, no spacers
+    ]
+    output_dir = tmp_path / "cabinet"
+
+    result = generate_cabinet(drawers, output_dir, (5, 5), workers=2)
+
+    rendered = sorted(p.name for p in (output_dir / "pieces").iterdir())
+    assert rendered == [
+        "baseplate-1x2.stl",
+        "baseplate-4x2.stl",
+        "baseplate-5x2.stl",
+        "spacers-200x100mm.stl",
+    ]
+    assert (output_dir / "a" / "a-baseplate.stl").exists()
+    assert (output_dir / "a" / "a-spacers.stl").exists()
+    assert (output_dir / "c" / "c-baseplate-1.stl").exists()
+    assert (output_dir / "c" / "c-baseplate-2.stl").exists()
+    assert not (output_dir / "c" / "c-spacers.stl").exists()
+
+    with result.print_list_path.open() as f:
+        rows = {row["file"]: int(row["quantity"]) for row in csv.DictReader(f)}
+    assert rows == {
+        "pieces/baseplate-1x2.stl": 1,
+        "pieces/baseplate-4x2.stl": 2,
+        "pieces/baseplate-5x2.stl": 1,
+        "pieces/spacers-200x100mm.stl": 4,
+    }
@@ -0,0 +1,122 @@
+"""Tests for orphaned project output cleanup and gf.gc."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke import projects
+from gridfinity_invoke.cleanup import (
+    TEMP_FILE_GRACE_SECONDS,
+    expected_files,
+    find_orphans,
+    remove_orphans,
+)
+from gridfinity_invoke.manifest import load_manifest, record_component
+from gridfinity_invoke.workspace import Workspace, use_workspace
+
+DRAWER = {"name": "drawer", "type": "drawer-fit", "width_mm": 200, "depth_mm": 170}
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a project with current drawer-fit files and stale leftovers."""
+    monkeypatch.setattr(projects, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(projects, "ACTIVE_FILE", tmp_path / ".gridfinity-active")
+    projects.save_project_config("shop", {"name": "shop", "components": [DRAWER]})
+    project_path = projects.get_project_path("shop")
+    for name in [
+        "drawer-baseplate.stl",
+        "drawer-spacers.stl",
+        "drawer-assembly.stl",
+        "drawer-baseplate-1.stl",  # Left over from when the drawer was split
+        "old-bin.stl",  # Left over from a renamed component
+    ]:
+        (project_path / name).write_bytes(b"x" * 100)
+    (project_path / "notes").mkdir()
+    return project_path
+
+
+def test_expected_files_include_pieces_spacers_and_metadata() -> None:
+    """Test the expected set covers split pieces, spacers and project files."""
+    split = {**DRAWER, "split_count": 2}
+
+    assert expected_files({"components": [split]}) == {
+        "config.json",
+        "journal.jsonl",
+        "manifest.json",
+        "drawer-baseplate-1.stl",
+        "drawer-baseplate-2.stl",
+        "drawer-spacers.stl",
+        "drawer-assembly.stl",
+    }
+
+
+def test_find_orphans_lists_only_stale_files(project: Path) -> None:
+    """Test only files no component produces are orphans; folders are kept."""
+    orphans = find_orphans("shop")
+
+    assert [(o.path.name, o.size) for o in orphans] == [
+        ("drawer-baseplate-1.stl", 100),
+        ("old-bin.stl", 100),
+    ]
+
+
+def test_find_orphans_skips_temp_files_of_writes_in_progress(project: Path) -> None:
+    """Test a fresh atomic-write temp file is kept until it goes stale."""
+    temp = project / ".drawer-baseplate.stl.k2j4h1.stl"
+    temp.write_bytes(b"x" * 10)
+
+    assert temp not in [o.path for o in find_orphans("shop")]
+
+    stale = time.time() - TEMP_FILE_GRACE_SECONDS - 60
+    os.utime(temp, (stale, stale))
+    assert temp in [o.path for o in find_orphans("shop")]
+
+
+def test_remove_orphans_deletes_and_prunes_manifest(project: Path) -> None:
+    """Test deleting orphans reports bytes and drops their manifest entries."""
+    old_bin = {"name": "old-bin", "type": "bin", "length": 1, "width": 1, "height": 1}
+    record_component("shop", old_bin)
+
+    reclaimed = remove_orphans("shop", find_orphans("shop"))
+
+    assert reclaimed == 200
+    assert not (project / "old-bin.stl").exists()
+    assert (project / "drawer-baseplate.stl").exists()
+    assert "old-bin.stl" not in load_manifest("shop")["files"]
+
+
+def test_gc_task_lists_then_deletes(
+    project: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test gf.gc only lists by default and deletes with --delete."""
+    from invoke_collections.gf import gc
+
+    gc(MockContext(), project="shop")
+    assert "2 orphaned file(s), 200 B" in capsys.readouterr().out
+    assert (project / "old-bin.stl").exists()
+
+    gc(MockContext(), all=True, delete=True)
+    assert "reclaimed 200 B" in capsys.readouterr().out
+    assert find_orphans("shop") == []
+
+
+def test_gc_all_cleans_the_current_workspace(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test gf.gc --all sweeps the projects of the workspace in use."""
+    from invoke_collections.gf import gc
+
+    workspace = Workspace(tmp_path / "elsewhere")
+    projects.save_project_config("shop", {"name": "shop", "components": []}, workspace)
+    stale = projects.get_project_path("shop", workspace) / "old-bin.stl"
+    stale.write_bytes(b"x" * 100)
+
+    with use_workspace(workspace):
+        gc(MockContext(), all=True, delete=True)
+
+    assert "reclaimed 100 B" in capsys.readouterr().out
+    assert not stale.exists()
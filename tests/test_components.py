@@ -0,0 +1,150 @@
+"""Tests for the typed component model."""
+
+from pathlib import Path
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke import projects
+from gridfinity_invoke.components import (
+    BinComponent,
+    DrawerFitComponent,
+    LayoutComponent,
+    OutlineFitComponent,
+    load_components,
+    parse_component,
+)
+
+CONFIGS = [
+    {"name": "cup", "type": "bin", "length": 2, "width": 1, "height": 3},
+    {
+        "name": "plate",
+        "type": "baseplate",
+        "length": 4,
+        "width": 4,
+        "tolerance": 0.01,
+        "formats": ["stl", "step"],
+    },
+    {
+        "name": "drawer",
+        "type": "drawer-fit",
+        "width_mm": 500.0,
+        "depth_mm": 400.0,
+        "units_width": 11,
+        "units_depth": 9,
+        "split_count": 4,
+    },
+    {
+        "name": "corner",
+        "type": "drawer-fit",
+        "rects": "0,0,500,200;0,200,300,200",
+        "rects_units": [[0, 0, 11, 4], [0, 4, 7, 5]],
+        "split_count": 3,
+    },
+    {
+        "name": "tools",
+        "type": "layout",
+        "drawer": "drawer",
+        "units_width": 11,
+        "units_depth": 9,
+        "placements": [
+            {
+                "x": 0,
+                "y": 0,
+                "length": 2,
+                "width": 2,
+                "height": 3,
+                "rotated": False,
+                "fill": False,
+            }
+        ],
+    },
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: c["type"])
+def test_components_round_trip_to_the_same_config(config: dict) -> None:
+    """Test each component type serializes back to the config it came from."""
+    assert parse_component(config).to_dict() == config
+
+
+def test_drawer_fit_type_dispatches_on_outline() -> None:
+    """Test drawer-fits with an outline or rects get their own typed form."""
+    assert isinstance(parse_component(CONFIGS[2]), DrawerFitComponent)
+    assert isinstance(parse_component(CONFIGS[3]), OutlineFitComponent)
+    assert isinstance(parse_component(CONFIGS[4]), LayoutComponent)
+
+
+def test_components_are_hashable_values() -> None:
+    """Test equal components hash equally, so they work as cache keys."""
+    first = parse_component(CONFIGS[0])
+    second = parse_component(dict(CONFIGS[0]))
+
+    assert first == second == BinComponent("cup", 2, 1, 3)
+    assert len({first, second}) == 1
+    assert not hasattr(first, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "config, message",
+    [
+        ({"type": "bin"}, "without a name"),
+        ({"name": "x", "type": "shelf"}, "unknown type 'shelf'"),
+        ({"name": "x", "type": ["bin"]}, r"unknown type \['bin'\]"),
+        ({"name": "x", "type": "bin", "length": 1, "width": 1}, "missing 'height'"),
+        (
+            {"name": "x", "type": "baseplate", "length": 0, "width": 1},
+            "'length' must be a positive integer",
+        ),
+        (
+            {
+                "name": "x",
+                "type": "bin",
+                "length": 1,
+                "width": 1,
+                "height": 1,
+                "formats": ["obj"],
+            },
+            "'formats' must be a list",
+        ),
+        (
+            {
+                "name": "x",
+                "type": "drawer-fit",
+                "outline": "0,0;1,0",
+                "rects": "",
+                "split_count": 1,
+            },
+            "exactly one of",
+        ),
+    ],
+)
+def test_invalid_components_are_rejected(config: dict, message: str) -> None:
+    """Test validation names the component and the problem."""
+    with pytest.raises(ValueError, match=message):
+        parse_component(config)
+
+
+def test_load_validates_config_once_before_generating(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test gf.load rejects an invalid config before writing any files."""
+    from invoke_collections.gf import load
+
+    monkeypatch.setattr(projects, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(projects, "ACTIVE_FILE", tmp_path / ".gridfinity-active")
+    bad = {"name": "bad", "type": "bin", "length": 1, "width": 1, "height": -1}
+    projects.save_project_config(
+        "shop", {"name": "shop", "components": [CONFIGS[0], bad]}
+    )
+
+    with pytest.raises(SystemExit) as exc_info:
+        load(MockContext(), project="shop")
+
+    assert exc_info.value.code == 1
+    assert "Component 'bad': 'height'" in capsys.readouterr().out
+    assert not (tmp_path / "projects" / "shop" / "cup.stl").exists()
+    with pytest.raises(ValueError, match="Component 'bad'"):
+        load_components("shop")
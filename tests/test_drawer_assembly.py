@@ -0,0 +1,54 @@
+"""Tests for drawer-fit assembly preview generation."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import gridfinity_invoke.config as config
+from gridfinity_invoke.generators import (
+    calculate_baseplate_splits,
+    generate_drawer_assembly,
+    generate_split_drawer_fit,
+)
+from gridfinity_invoke.mesh import box_triangles, canonical_mesh, read_stl, write_stl
+
+
+@pytest.fixture(autouse=True)
+def temp_config_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Set up a temporary config directory for tests (default 225mm bed)."""
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / ".gf-config")
+    return tmp_path
+
+
+def test_stl_round_trip_preserves_triangles(tmp_path: Path) -> None:
+    """Test that triangles written to STL are read back in canonical form."""
+    triangles = box_triangles(0, 0, 10, 20, 5)
+
+    path = write_stl(tmp_path / "box.stl", triangles)
+
+    assert path.stat().st_size == 84 + 50 * 12
+    vertices, faces = canonical_mesh(triangles)
+    np.testing.assert_array_equal(read_stl(path), vertices[faces])
+
+
+def test_assembly_places_split_pieces_and_spacers(tmp_path: Path) -> None:
+    """Test assembly spans the full drawer with split pieces side by side."""
+    # 320mm -> 7 units (split 5 + 2), 100mm -> 2 units; 13mm X margin per side
+    result, paths = generate_split_drawer_fit(
+        320.0, 100.0, tmp_path, "drawer-baseplate", tmp_path / "drawer-spacers.stl"
+    )
+    splits = calculate_baseplate_splits(result.units_width, result.units_depth)
+    assert splits == [(5, 2), (2, 2)]
+
+    assembly_path = generate_drawer_assembly(
+        result, splits, paths, tmp_path / "drawer-assembly.stl"
+    )
+
+    vertices = read_stl(assembly_path).reshape(-1, 3)
+    piece_triangles = sum(len(read_stl(path)) for path in paths)
+    assert len(vertices) // 3 > piece_triangles  # spacer blocks were added
+    np.testing.assert_allclose(vertices[:, 0].min(), 0.0, atol=1e-3)
+    np.testing.assert_allclose(vertices[:, 0].max(), 320.0, atol=1e-3)
+    np.testing.assert_allclose(vertices[:, 1].min(), 0.0, atol=1e-3)
+    np.testing.assert_allclose(vertices[:, 1].max(), 100.0, atol=1e-3)
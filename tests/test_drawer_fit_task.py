@@ -9,6 +9,7 @@ import pytest
 from invoke import MockContext
 
 from gridfinity_invoke import config, projects
+from gridfinity_invoke.mesh import ZIP_TIMESTAMP
 
 
 @pytest.fixture
@@ -168,3 +169,46 @@ def test_drawer_fit_fails_for_negative_dimensions(
 
     captured = capsys.readouterr()
     assert "positive" in captured.out.lower() or "42" in captured.out.lower()
+
+
+def test_drawer_fit_writes_assembly_preview(temp_output_dir: Path) -> None:
+    """Test task writes an assembly preview STL when --preview is set."""
+    from invoke_collections.gf import drawer_fit
+
+    ctx = MockContext()
+    output_path = str(temp_output_dir / "drawer-fit")
+
+    drawer_fit(ctx, width=200.0, depth=200.0, output=output_path, preview=True)
+
+    assembly_path = temp_output_dir / "drawer-fit-assembly.stl"
+    assert assembly_path.exists()
+    assert assembly_path.stat().st_size > 0
+
+
+def test_drawer_fit_streams_tar_to_stdout(
+    temp_output_dir: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Test --output - streams the pieces as a reproducible tar on stdout."""
+    import calendar
+    import io
+    import tarfile
+
+    from invoke_collections.gf import drawer_fit
+
+    drawer_fit(MockContext(), width=200.0, depth=200.0, output="-")
+
+    captured = capsysbinary.readouterr()
+    with tarfile.open(fileobj=io.BytesIO(captured.out)) as tar:
+        assert tar.getnames() == ["baseplate.stl", "spacers.stl"]
+        assert {member.mtime for member in tar.getmembers()} == {
+            calendar.timegm(ZIP_TIMESTAMP)
+        }
+        baseplate = tar.extractfile("baseplate.stl")
+        assert baseplate is not None
+        assert len(baseplate.read()) > 84
+    assert b"Streamed spacers.stl" in captured.err
+    assert list(temp_output_dir.glob("*.stl")) == []
+
+    # Streaming the same drawer again gives the same bytes
+    drawer_fit(MockContext(), width=200.0, depth=200.0, output="-")
+    assert capsysbinary.readouterr().out == captured.out
@@ -0,0 +1,148 @@
+"""Tests for L-shaped and multi-rectangle drawer-fit generation."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from invoke import MockContext
+
+import gridfinity_invoke.config as config
+from gridfinity_invoke import projects
+from gridfinity_invoke.generators import generate_outline_assembly, generate_outline_fit
+from gridfinity_invoke.mesh import read_stl
+from gridfinity_invoke.planning import (
+    GridRect,
+    decompose_cells,
+    parse_outline,
+    parse_rects,
+    polygon_to_outline_grid,
+    rects_to_outline_grid,
+)
+
+L_OUTLINE = "0,0;500,0;500,200;300,200;300,400;0,400"
+
+
+@pytest.fixture(autouse=True)
+def temp_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Isolate config and project state (225mm bed, no active project)."""
+    config_file = tmp_path / ".gf-config"
+    config_file.write_text(
+        json.dumps({"print_bed_width_mm": 225, "print_bed_depth_mm": 225})
+    )
+    monkeypatch.setattr(config, "CONFIG_FILE", config_file)
+    monkeypatch.setattr(projects, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(projects, "ACTIVE_FILE", tmp_path / ".gridfinity-active")
+    return tmp_path
+
+
+def test_l_shaped_outline_decomposes_into_two_rects() -> None:
+    """Test an L-shaped polygon gives two rectangles covering every cell."""
+    grid = polygon_to_outline_grid(parse_outline(L_OUTLINE))
+
+    assert len(grid.rects) == 2
+    assert sum(r.units_width * r.units_depth for r in grid.rects) == grid.cells.sum()
+    assert grid.outline_area_mm2 == 500 * 200 + 300 * 200
+    # The 300mm arm holds 7 units and the 500mm arm 11 units
+    assert grid.cells.sum(axis=1).max() == 11
+    assert grid.cells.sum(axis=1).min() == 7
+
+
+def test_rects_match_equivalent_polygon() -> None:
+    """Test a rectangle list fits the same cells as the matching polygon."""
+    from_rects = rects_to_outline_grid(parse_rects("0,0,500,200;0,200,300,200"))
+    from_polygon = polygon_to_outline_grid(parse_outline(L_OUTLINE))
+
+    assert from_rects.cells.sum() == from_polygon.cells.sum()
+    assert len(from_rects.rects) == len(from_polygon.rects)
+
+
+def test_decompose_cells_covers_without_overlap() -> None:
+    """Test decomposition rectangles tile exactly the True cells."""
+    cells = np.array(
+        [
+            [1, 1, 1, 1],
+            [1, 1, 0, 0],
+            [1, 1, 0, 1],
+        ],
+        dtype=bool,
+    )
+
+    rects = decompose_cells(cells)
+
+    covered = np.zeros_like(cells, dtype=int)
+    for r in rects:
+        covered[r.y : r.y + r.units_depth, r.x : r.x + r.units_width] += 1
+    np.testing.assert_array_equal(covered, cells.astype(int))
+    assert rects[0] == GridRect(0, 0, 2, 3)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["0,0;100,0", "0,0;100;100,100", "a,b;1,1;2,2"],
+)
+def test_parse_outline_rejects_bad_input(text: str) -> None:
+    """Test malformed outlines raise ValueError."""
+    with pytest.raises(ValueError):
+        parse_outline(text)
+
+
+def test_outline_too_small_raises() -> None:
+    """Test an outline with no room for a 1x1 unit raises ValueError."""
+    with pytest.raises(ValueError, match="at least 42mm"):
+        polygon_to_outline_grid(parse_outline("0,0;40,0;40,200;0,200"))
+
+
+def test_outline_fit_splits_each_rect_and_assembles(tmp_path: Path) -> None:
+    """Test each rectangle is split for the bed and pieces are placed."""
+    # 7x2 units along the front and a 2x5 arm on the left
+    grid = rects_to_outline_grid(parse_rects("0,0,300,100;0,100,100,200"))
+    assert grid.rects == [GridRect(0, 0, 7, 2), GridRect(0, 2, 2, 5)]
+
+    output_dir = tmp_path / "out"
+    result = generate_outline_fit(grid, output_dir, "drawer-baseplate")
+
+    assert [(p.units_width, p.units_depth) for p in result.pieces] == [
+        (5, 2),
+        (2, 2),
+        (2, 5),
+    ]
+    assert [p.name for p in result.baseplate_paths] == [
+        "drawer-baseplate-1.stl",
+        "drawer-baseplate-2.stl",
+        "drawer-baseplate-3.stl",
+    ]
+    assert all(p.exists() for p in result.baseplate_paths)
+    # The render cache directory is cleaned up
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        p.name for p in result.baseplate_paths
+    ]
+
+    assembly = read_stl(generate_outline_assembly(result, output_dir / "a.stl"))
+    vertices = assembly.reshape(-1, 3)
+    np.testing.assert_allclose(vertices[:, 0].min(), 3.0, atol=1e-3)
+    np.testing.assert_allclose(vertices[:, 0].max(), 3.0 + 7 * 42, atol=1e-3)
+    np.testing.assert_allclose(vertices[:, 1].max(), 3.0 + 7 * 42, atol=1e-3)
+
+
+def test_drawer_fit_task_accepts_outline(tmp_path: Path) -> None:
+    """Test gf.drawer-fit with --outline writes the pieces for each rectangle."""
+    from invoke_collections.gf import drawer_fit
+
+    drawer_fit(
+        MockContext(),
+        output=str(tmp_path / "out" / "drawer"),
+        outline="0,0;130,0;130,50;50,50;50,130;0,130",
+    )
+
+    names = sorted(p.name for p in (tmp_path / "out").iterdir())
+    assert names == ["drawer-baseplate-1.stl", "drawer-baseplate-2.stl"]
+
+
+def test_drawer_fit_task_rejects_outline_and_rects(tmp_path: Path) -> None:
+    """Test gf.drawer-fit fails when both --outline and --rects are given."""
+    from invoke_collections.gf import drawer_fit
+
+    with pytest.raises(SystemExit) as exc_info:
+        drawer_fit(MockContext(), outline=L_OUTLINE, rects="0,0,100,100")
+    assert exc_info.value.code == 1
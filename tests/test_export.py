@@ -0,0 +1,174 @@
+"""Tests for the STL export layer in generators."""
+
+import io
+import zipfile
+from pathlib import Path
+
+import cadquery as cq
+import numpy as np
+import pytest
+
+from gridfinity_invoke.generators import (
+    export_shape,
+    export_stl,
+    generate_bin,
+    parse_formats,
+    render_baseplate_bytes,
+    render_bin_bytes,
+    serialize_shape,
+    tessellate,
+)
+from gridfinity_invoke.mesh import canonical_mesh, read_stl, write_3mf, write_stl
+
+
+def _signed_volume(triangles: np.ndarray) -> float:
+    """Volume enclosed by a triangle mesh, positive if it winds outward."""
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    return float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6)
+
+
+def test_tessellate_box_is_closed_and_outward() -> None:
+    """Test a box meshes to 12 outward-facing triangles with its volume."""
+    box = cq.Workplane("XY").box(10, 20, 5)
+
+    triangles = tessellate(box)
+
+    assert triangles.shape == (12, 3, 3)
+    np.testing.assert_allclose(_signed_volume(triangles), 1000.0, rtol=1e-6)
+
+
+def test_tessellate_tolerance_controls_detail() -> None:
+    """Test finer tolerances give more triangles on curved faces."""
+    cylinder = cq.Workplane("XY").cylinder(10, 20)
+
+    fine = tessellate(cylinder, tolerance=1e-3, angular_tolerance=0.1)
+    coarse = tessellate(cylinder, tolerance=0.5, angular_tolerance=1.0)
+
+    assert len(fine) > len(coarse)
+    assert _signed_volume(fine) > 0
+
+
+def test_export_stl_writes_binary_stl(tmp_path: Path) -> None:
+    """Test export_stl writes a binary STL that reads back the same mesh."""
+    box = cq.Workplane("XY").box(10, 20, 5)
+
+    path = export_stl(box, tmp_path / "nested" / "box.stl")
+
+    assert path.stat().st_size == 84 + 50 * 12
+    vertices, faces = canonical_mesh(tessellate(box))
+    np.testing.assert_allclose(read_stl(path), vertices[faces], atol=1e-6)
+
+
+def test_parse_formats_normalizes_and_dedupes() -> None:
+    """Test format lists are lowercased, deduplicated and validated."""
+    assert parse_formats("STL, step,.3mf,stl") == ["stl", "step", "3mf"]
+
+    with pytest.raises(ValueError, match="Unknown format 'obj'"):
+        parse_formats("stl,obj")
+    with pytest.raises(ValueError, match="At least one format"):
+        parse_formats(" , ")
+
+
+def test_export_shape_writes_every_format(tmp_path: Path) -> None:
+    """Test one shape is written once per requested format."""
+    box = cq.Workplane("XY").box(10, 20, 5)
+
+    paths = export_shape(box, tmp_path / "box.stl", ["step", "stl", "3mf", "brep"])
+
+    assert [p.name for p in paths] == ["box.step", "box.stl", "box.3mf", "box.brep"]
+    assert cq.importers.importStep(str(paths[0])).val().Volume() == pytest.approx(
+        1000.0
+    )
+    assert len(read_stl(paths[1])) == 12
+    assert cq.Shape.importBrep(str(paths[3])).Volume() == pytest.approx(1000.0)
+
+
+def test_write_3mf_merges_shared_vertices(tmp_path: Path) -> None:
+    """Test a 3MF box has 8 vertices, 12 triangles and the package parts."""
+    triangles = tessellate(cq.Workplane("XY").box(10, 20, 5))
+
+    path = write_3mf(tmp_path / "box.3mf", triangles)
+
+    with zipfile.ZipFile(path) as zf:
+        assert sorted(zf.namelist()) == [
+            "3D/3dmodel.model",
+            "[Content_Types].xml",
+            "_rels/.rels",
+        ]
+        model = zf.read("3D/3dmodel.model").decode()
+    assert model.count("<vertex ") == 8
+    assert model.count("<triangle ") == 12
+    assert 'unit="millimeter"' in model
+
+
+def test_generate_bin_returns_first_format(tmp_path: Path) -> None:
+    """Test generators return the path of the first requested format."""
+    path = generate_bin(1, 1, 2, tmp_path / "bin.stl", formats=["3mf", "step"])
+
+    assert path == tmp_path / "bin.3mf"
+    assert (tmp_path / "bin.step").exists()
+    assert not (tmp_path / "bin.stl").exists()
+
+
+def test_canonical_mesh_ignores_triangle_order_and_rotation() -> None:
+    """Test reordered and rotated triangles give the same canonical mesh."""
+    triangles = tessellate(cq.Workplane("XY").cylinder(10, 20))
+    shuffled = np.roll(triangles[::-1], 1, axis=1)
+
+    vertices, faces = canonical_mesh(triangles)
+    other_vertices, other_faces = canonical_mesh(shuffled)
+
+    np.testing.assert_array_equal(vertices, other_vertices)
+    np.testing.assert_array_equal(faces, other_faces)
+
+
+def test_mesh_writers_are_byte_reproducible(tmp_path: Path) -> None:
+    """Test STL and 3MF bytes depend only on the triangles, not their order."""
+    triangles = tessellate(cq.Workplane("XY").cylinder(10, 20))
+    # Float noise below the rounding step must not change the output
+    shuffled = np.roll(triangles[::-1], 2, axis=1) + 1e-7
+
+    assert (
+        write_stl(tmp_path / "a.stl", triangles).read_bytes()
+        == write_stl(tmp_path / "b.stl", shuffled).read_bytes()
+    )
+    assert (
+        write_3mf(tmp_path / "a.3mf", triangles).read_bytes()
+        == write_3mf(tmp_path / "b.3mf", shuffled).read_bytes()
+    )
+
+
+def test_generate_bin_is_byte_reproducible(tmp_path: Path) -> None:
+    """Test regenerating a bin gives identical bytes, including the first run."""
+    first = generate_bin(1, 1, 2, tmp_path / "first.stl").read_bytes()
+    second = generate_bin(1, 1, 2, tmp_path / "second.stl").read_bytes()
+
+    assert first == second
+
+
+def test_render_bin_bytes_matches_file(tmp_path: Path) -> None:
+    """Test the in-memory API returns the same bytes the file API writes."""
+    buffer = render_bin_bytes(1, 1, 2)
+
+    assert isinstance(buffer, memoryview)
+    path = generate_bin(1, 1, 2, tmp_path / "bin.stl")
+    assert buffer == path.read_bytes()
+
+
+def test_serialize_shape_step_and_brep_load_back() -> None:
+    """Test STEP and BREP buffers are complete files without touching disk."""
+    box = cq.Workplane("XY").box(10, 20, 5)
+
+    step, brep = serialize_shape(box, ["step", "brep"])
+
+    assert bytes(step[:13]) == b"ISO-10303-21;"
+    with io.BytesIO(brep) as stream:
+        assert cq.Shape.importBrep(stream).Volume() == pytest.approx(1000.0)
+
+
+def test_render_bytes_rejects_bad_input() -> None:
+    """Test the in-memory API validates dimensions and formats."""
+    with pytest.raises(ValueError, match="positive integers"):
+        render_baseplate_bytes(0, 1)
+    with pytest.raises(ValueError, match="Unknown export format 'obj'"):
+        render_baseplate_bytes(1, 1, "obj")
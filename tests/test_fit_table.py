@@ -0,0 +1,96 @@
+"""Tests for the vectorized drawer-fit sizing table."""
+
+import csv
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke.planning import calculate_fit_table, fit_drawer, parse_range
+
+
+def test_parse_range_includes_stop() -> None:
+    """Test ranges are inclusive of the stop value."""
+    assert parse_range("100:103:1").tolist() == [100.0, 101.0, 102.0, 103.0]
+    assert parse_range("100:101:0.5").tolist() == [100.0, 100.5, 101.0]
+    assert parse_range("250").tolist() == [250.0]
+
+    with pytest.raises(ValueError):
+        parse_range("300:100:1")
+
+
+def test_fit_table_rows_match_drawer_fit_math() -> None:
+    """Test table values for known drawers on two bed sizes."""
+    table = calculate_fit_table(
+        parse_range("200"), parse_range("530"), [(225, 225), (256, 256)]
+    )
+
+    assert table["units_width"].tolist() == [4, 4]
+    assert table["units_depth"].tolist() == [12, 12]
+    assert table["gap_x_mm"].tolist() == [32.0, 32.0]
+    assert table["gap_y_mm"].tolist() == [26.0, 26.0]
+    assert table["needs_spacers"].tolist() == [True, True]
+    # 225mm bed -> 5 units: 4x5 + 4x5 + 4x2; 256mm bed -> 6 units: 4x6 + 4x6
+    assert table["piece_count"].tolist() == [3, 2]
+    assert table["unique_piece_sizes"].tolist() == ["4x5;4x2", "4x6"]
+
+
+def test_fit_drawer_matches_the_table() -> None:
+    """Test a single drawer gets the same fit as its row in the table."""
+    assert fit_drawer(200, 530) == (4, 12, 32.0, 26.0, True)
+    assert fit_drawer(170, 84).needs_spacers is False
+    with pytest.raises(ValueError, match="42mm"):
+        fit_drawer(41, 100)
+
+
+def test_fit_table_handles_a_million_combinations_quickly() -> None:
+    """Test a 1000x1000 sweep is calculated in a couple of seconds."""
+    widths = parse_range("100:1099:1")
+    depths = parse_range("100:1099:1")
+
+    start = time.perf_counter()
+    table = calculate_fit_table(widths, depths, [(225, 225)])
+    elapsed = time.perf_counter() - start
+
+    assert len(table["width_mm"]) == 1_000_000
+    assert elapsed < 2.0
+
+
+def test_planning_does_not_import_cadquery() -> None:
+    """Test the planning module works without loading the CAD kernel."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, gridfinity_invoke.planning; "
+            "assert 'cadquery' not in sys.modules; "
+            "assert 'cqgridfinity' not in sys.modules",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_fit_table_task_writes_csv(tmp_path: Path) -> None:
+    """Test gf.fit-table writes one CSV row per combination."""
+    from invoke_collections.gf import fit_table
+
+    output = tmp_path / "table.csv"
+
+    fit_table(
+        MockContext(),
+        widths="100:109:1",
+        depths="200:204:2",
+        beds="225x225",
+        output=str(output),
+    )
+
+    with output.open() as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10 * 3
+    assert rows[0]["width_mm"] == "100.0"
+    assert rows[0]["unique_piece_sizes"] == "2x4"
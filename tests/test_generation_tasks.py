@@ -1,6 +1,7 @@
 """Tests for project-aware bin and baseplate generation tasks."""
 
 import tempfile
+import time
 from pathlib import Path
 from unittest.mock import patch
 
@@ -8,6 +9,7 @@ import pytest
 from invoke import MockContext
 
 from gridfinity_invoke import projects
+from gridfinity_invoke.atomic import atomic_output
 
 
 @pytest.fixture
@@ -187,3 +189,159 @@ def test_component_name_deduplication_in_config(temp_project_dir: Path) -> None:
     assert component["length"] == 2
     assert component["width"] == 2
     assert component["height"] == 2
+
+
+def test_bin_records_custom_tolerance_in_config(temp_project_dir: Path) -> None:
+    """Test a non-default --tolerance is saved so load re-exports with it."""
+    from invoke_collections.gf import bin, new_project
+
+    ctx = MockContext()
+    new_project(ctx, name="draft-project")
+
+    with patch("invoke_collections.gf.prompt_with_default", return_value="draft"):
+        bin(ctx, length=1, width=1, height=2, tolerance=0.1)
+
+    config = projects.load_project_config("draft-project")
+    assert config["components"][0]["tolerance"] == 0.1
+
+
+def test_baseplate_records_formats_and_writes_each(temp_project_dir: Path) -> None:
+    """Test --formats writes every format and is saved for gf.load."""
+    from invoke_collections.gf import baseplate, new_project
+
+    ctx = MockContext()
+    new_project(ctx, name="step-project")
+
+    with patch("invoke_collections.gf.prompt_with_default", return_value="plate"):
+        baseplate(ctx, length=1, width=1, formats="stl,step")
+
+    project_dir = temp_project_dir / "projects" / "step-project"
+    assert (project_dir / "plate.stl").exists()
+    assert (project_dir / "plate.step").exists()
+    config = projects.load_project_config("step-project")
+    assert config["components"][0]["formats"] == ["stl", "step"]
+
+
+def test_bin_streams_to_stdout_without_project(
+    temp_project_dir: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Test --output - writes only the STL to stdout and skips the project."""
+    from invoke_collections.gf import bin, new_project
+
+    from gridfinity_invoke.generators import render_bin_bytes
+
+    ctx = MockContext()
+    new_project(ctx, name="stream-project")
+    capsysbinary.readouterr()
+
+    bin(ctx, length=1, width=1, height=2, output="-")
+
+    captured = capsysbinary.readouterr()
+    assert captured.out == render_bin_bytes(1, 1, 2)
+    assert b"Streamed" in captured.err
+    assert projects.load_project_config("stream-project")["components"] == []
+
+
+def test_baseplate_stream_rejects_multiple_formats(temp_project_dir: Path) -> None:
+    """Test streaming to stdout fails when more than one format is requested."""
+    from invoke_collections.gf import baseplate
+
+    with pytest.raises(SystemExit) as exc_info:
+        baseplate(MockContext(), length=1, width=1, output="-", formats="stl,3mf")
+    assert exc_info.value.code == 1
+
+
+def test_bin_project_option_and_env_override_active_file(
+    temp_project_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --project and GF_PROJECT pick the project without the active file."""
+    from invoke_collections.gf import bin, new_project
+
+    ctx = MockContext()
+    new_project(ctx, name="first")
+    new_project(ctx, name="second")  # Now the active project
+
+    with patch("invoke_collections.gf.prompt_with_default", return_value="a"):
+        bin(ctx, length=1, width=1, height=2, project="first")
+    monkeypatch.setenv(projects.PROJECT_ENV_VAR, "first")
+    with patch("invoke_collections.gf.prompt_with_default", return_value="b"):
+        bin(ctx, length=1, width=1, height=2)
+
+    names = [c["name"] for c in projects.load_project_config("first")["components"]]
+    assert names == ["a", "b"]
+    assert projects.load_project_config("second")["components"] == []
+    assert projects.ACTIVE_FILE.read_text() == "second"
+
+
+def test_bin_rejects_unknown_project(temp_project_dir: Path) -> None:
+    """Test --project naming a missing project exits before generating."""
+    from invoke_collections.gf import bin
+
+    with pytest.raises(SystemExit) as exc_info:
+        bin(MockContext(), length=1, width=1, height=2, project="missing")
+
+    assert exc_info.value.code == 1
+
+
+def test_bin_renders_while_the_name_prompt_waits(
+    temp_project_dir: Path, isolated_brep_cache: Path
+) -> None:
+    """Test the bin solid is rendered into the BREP cache during the prompt."""
+    from invoke_collections.gf import bin, new_project
+
+    new_project(MockContext(), name="shop")
+
+    def slow_prompt(label: str, default: str) -> str:
+        deadline = time.monotonic() + 60
+        while not list(isolated_brep_cache.glob("*.brep")):
+            assert time.monotonic() < deadline, "nothing rendered during the prompt"
+            time.sleep(0.05)
+        return "cup"
+
+    with patch("invoke_collections.gf.prompt_with_default", side_effect=slow_prompt):
+        bin(MockContext(), length=1, width=1, height=2)
+
+    assert (temp_project_dir / "projects" / "shop" / "cup.stl").exists()
+    assert len(list(isolated_brep_cache.glob("*.brep"))) == 1
+
+
+def test_finish_renders_stops_variants_that_are_not_wanted() -> None:
+    """Test renders ruled out by the prompts are stopped, not waited for."""
+    from invoke_collections.gf import _finish_renders, _render_ahead
+
+    renders = _render_ahead(
+        [("whole", time.sleep, (60,)), ("pieces", time.sleep, (0,))]
+    )
+    start = time.monotonic()
+    _finish_renders(renders, ["pieces"])
+
+    assert time.monotonic() - start < 30
+    exit_codes = {group: process.exitcode for group, process in renders}
+    assert exit_codes["pieces"] == 0
+    assert exit_codes["whole"] != 0
+
+
+def _save_slowly(path: Path) -> None:
+    """Start saving a file and hang before it is finished."""
+    with atomic_output(path) as temp_path:
+        temp_path.write_bytes(b"partial")
+        time.sleep(60)
+
+
+def test_finish_renders_removes_partial_files_of_stopped_renders(
+    isolated_brep_cache: Path,
+) -> None:
+    """Test a render stopped mid-save leaves no temporary file in the cache."""
+    from invoke_collections.gf import _finish_renders, _render_ahead
+
+    renders = _render_ahead(
+        [("whole", _save_slowly, (isolated_brep_cache / "a.brep",))]
+    )
+    deadline = time.monotonic() + 30
+    while not list(isolated_brep_cache.glob(".*")):
+        assert time.monotonic() < deadline, "render never started saving"
+        time.sleep(0.05)
+
+    _finish_renders(renders, [])
+
+    assert list(isolated_brep_cache.iterdir()) == []
@@ -0,0 +1,157 @@
+"""Tests for the bin layout solver and gf.layout task."""
+
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke import config, projects
+from gridfinity_invoke.layout import (
+    BinSpec,
+    OccupancyGrid,
+    parse_bin_specs,
+    solve_layout,
+)
+
+
+@pytest.fixture
+def temp_project_dir():
+    """Create a temporary directory for project tests."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        active_file = tmpdir_path / ".gridfinity-active"
+        projects_dir = tmpdir_path / "projects"
+        config_file = tmpdir_path / ".gf-config"
+        with patch.object(projects, "PROJECTS_DIR", projects_dir):
+            with patch.object(projects, "ACTIVE_FILE", active_file):
+                with patch.object(config, "CONFIG_FILE", config_file):
+                    yield tmpdir_path
+
+
+def _covered_cells(result) -> list[tuple[int, int]]:
+    """List every grid cell covered by the layout's placements."""
+    return [
+        (x, y)
+        for p in result.placements
+        for x in range(p.x, p.x + p.length)
+        for y in range(p.y, p.y + p.width)
+    ]
+
+
+def test_parse_bin_specs_expands_counts() -> None:
+    """Test bin list parsing with and without counts."""
+    bins = parse_bin_specs("2x2x3:2, 1x3x6")
+
+    assert bins == [BinSpec(2, 2, 3), BinSpec(2, 2, 3), BinSpec(1, 3, 6)]
+
+    with pytest.raises(ValueError):
+        parse_bin_specs("2x2")
+
+
+def test_occupancy_grid_fits_and_places() -> None:
+    """Test occupancy grid bounds and overlap checks."""
+    grid = OccupancyGrid(4, 3)
+
+    assert grid.fits(0, 0, 4, 3)
+    assert not grid.fits(1, 0, 4, 1)
+
+    grid.place(0, 0, 2, 2)
+
+    assert not grid.fits(1, 1, 2, 2)
+    assert grid.fits(2, 0, 2, 3)
+    assert grid.first_free() == (2, 0)
+
+
+def test_exact_solver_uses_rotation_to_pack_tight_grid() -> None:
+    """Test a packing that only exists with rotated bins is found exactly."""
+    # Four 2x3 bins tile a 5x5 grid only as a pinwheel of rotated bins
+    result = solve_layout(5, 5, parse_bin_specs("2x3x3:4"))
+
+    assert result.exact
+    assert result.unplaced == []
+    assert any(p.rotated for p in result.placements)
+    cells = _covered_cells(result)
+    assert len(cells) == len(set(cells)) == 24
+
+
+def test_large_grid_solves_quickly_and_fill_covers_leftover() -> None:
+    """Test a 12x10 drawer with 30 bins solves in under a second."""
+    bins = parse_bin_specs("3x2x3:4,2x2x3:6,2x1x3:8,1x1x3:10,1x3x6:2")
+    assert len(bins) == 30
+
+    start = time.perf_counter()
+    result = solve_layout(12, 10, bins, fill_max=(5, 5))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert result.unplaced == []
+    cells = _covered_cells(result)
+    assert len(cells) == len(set(cells)) == 120
+    assert all(p.length <= 5 and p.width <= 5 for p in result.placements if p.fill)
+
+
+def test_layout_task_stores_placements_in_project(temp_project_dir: Path) -> None:
+    """Test gf.layout saves placements for a drawer-fit component."""
+    from invoke_collections.gf import layout, new_project
+
+    ctx = MockContext()
+    new_project(ctx, name="layout-project")
+    projects.add_component_to_config(
+        "layout-project",
+        {
+            "name": "drawer",
+            "type": "drawer-fit",
+            "width_mm": 200.0,
+            "depth_mm": 150.0,
+            "units_width": 4,
+            "units_depth": 3,
+        },
+    )
+
+    with patch("invoke_collections.gf.prompt_with_default", return_value="plan"):
+        layout(ctx, bins="2x2x3:2,1x1x3", drawer="drawer")
+
+    components = projects.load_project_config("layout-project")["components"]
+    saved = components[-1]
+    assert saved["type"] == "layout"
+    assert saved["drawer"] == "drawer"
+    requested = [p for p in saved["placements"] if not p["fill"]]
+    assert len(requested) == 3
+    covered = sum(p["length"] * p["width"] for p in saved["placements"])
+    assert covered == 12
+
+
+def test_layout_task_keeps_bins_inside_outline_drawer(temp_project_dir: Path) -> None:
+    """Test gf.layout on an L-shaped drawer only uses cells inside it."""
+    from invoke_collections.gf import layout, new_project
+
+    ctx = MockContext()
+    new_project(ctx, name="layout-project")
+    projects.add_component_to_config(
+        "layout-project",
+        {
+            "name": "corner",
+            "type": "drawer-fit",
+            "rects": "0,0,168,84;0,84,84,84",
+            "rects_units": [[0, 0, 4, 2], [0, 2, 2, 2]],
+            "split_count": 1,
+        },
+    )
+
+    with patch("invoke_collections.gf.prompt_with_default", return_value="plan"):
+        layout(ctx, bins="2x2x3:3", drawer="corner")
+
+    saved = projects.load_project_config("layout-project")["components"][-1]
+    assert (saved["units_width"], saved["units_depth"]) == (4, 4)
+    assert len(saved["placements"]) == 3
+    cells = {
+        (x, y)
+        for p in saved["placements"]
+        for x in range(p["x"], p["x"] + p["length"])
+        for y in range(p["y"], p["y"] + p["width"])
+    }
+    assert all(x < 2 for x, y in cells if y >= 2)
+    assert len(cells) == 12
@@ -0,0 +1,183 @@
+"""Tests for project output manifests and gf.verify."""
+
+import hashlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from invoke import MockContext
+
+from gridfinity_invoke import projects
+from gridfinity_invoke.manifest import (
+    hash_file,
+    load_manifest,
+    pending_components,
+    record_component,
+    verify_manifest,
+)
+
+PLATE = {"name": "plate", "type": "baseplate", "length": 1, "width": 1}
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a project with a baseplate component and fake STL output."""
+    monkeypatch.setattr(projects, "PROJECTS_DIR", tmp_path / "projects")
+    monkeypatch.setattr(projects, "ACTIVE_FILE", tmp_path / ".gridfinity-active")
+    projects.save_project_config("shop", {"name": "shop", "components": [PLATE]})
+    project_path = projects.get_project_path("shop")
+    (project_path / "plate.stl").write_bytes(b"solid plate")
+    return project_path
+
+
+def test_hash_file_matches_blake2b(tmp_path: Path) -> None:
+    """Test mmap hashing matches hashlib, including empty files."""
+    data, empty = tmp_path / "data", tmp_path / "empty"
+    data.write_bytes(b"gridfinity" * 1000)
+    empty.write_bytes(b"")
+
+    assert hash_file(data) == hashlib.blake2b(data.read_bytes()).hexdigest()
+    assert hash_file(empty) == hashlib.blake2b().hexdigest()
+
+
+def test_record_component_writes_entry(project: Path) -> None:
+    """Test recording stores params, size, mtime, hash and versions."""
+    record_component("shop", PLATE)
+
+    manifest = load_manifest("shop")
+    entry = manifest["files"]["plate.stl"]
+    assert entry["params"] == PLATE
+    assert entry["size"] == 11
+    assert entry["mtime_ns"] == (project / "plate.stl").stat().st_mtime_ns
+    assert entry["blake2b"] == hash_file(project / "plate.stl")
+    assert "cqgridfinity" in manifest["versions"]
+
+
+def test_record_component_drops_stale_outputs(project: Path) -> None:
+    """Test files a component no longer produces leave the manifest."""
+    (project / "plate.step").write_text("step")
+    record_component("shop", {**PLATE, "formats": ["stl", "step"]})
+
+    record_component("shop", PLATE)
+
+    assert list(load_manifest("shop")["files"]) == ["plate.stl"]
+
+
+def test_verify_unchanged_project_skips_hashing(project: Path) -> None:
+    """Test files with their recorded size and mtime are not re-hashed."""
+    record_component("shop", PLATE)
+
+    result = verify_manifest("shop")
+
+    assert result.checked == 1
+    assert result.rehashed == result.modified == result.missing == []
+
+
+def test_verify_rehashes_touched_and_flags_changes(project: Path) -> None:
+    """Test a touched file is re-hashed, and edits and deletions reported."""
+    path = project / "plate.stl"
+    record_component("shop", PLATE)
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+    touched = verify_manifest("shop")
+    path.write_bytes(b"solid PLATE")
+    edited = verify_manifest("shop")
+    path.unlink()
+    deleted = verify_manifest("shop")
+
+    assert (touched.rehashed, touched.modified) == (["plate.stl"], [])
+    assert edited.modified == ["plate.stl"]
+    assert deleted.missing == ["plate.stl"]
+
+
+def test_verify_task_fails_on_modified_file(
+    project: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test gf.verify exits non-zero and names modified files."""
+    from invoke_collections.gf import verify
+
+    record_component("shop", PLATE)
+    verify(MockContext(), project="shop")
+    assert "All 1 file(s) match" in capsys.readouterr().out
+
+    (project / "plate.stl").write_bytes(b"tampered")
+    with pytest.raises(SystemExit) as exc_info:
+        verify(MockContext(), project="shop")
+    assert exc_info.value.code == 1
+    assert "Modified: plate.stl" in capsys.readouterr().out
+
+
+def test_load_records_manifest(project: Path) -> None:
+    """Test gf.load records every regenerated output in the manifest."""
+    from invoke_collections.gf import load
+
+    load(MockContext(), project="shop")
+
+    entry = load_manifest("shop")["files"]["plate.stl"]
+    assert entry["blake2b"] == hash_file(project / "plate.stl")
+    assert verify_manifest("shop").modified == []
+
+
+def test_pending_components_need_rendering_with_current_params(project: Path) -> None:
+    """Test components are pending until recorded with their current params."""
+    assert pending_components("shop") == [PLATE]
+
+    record_component("shop", PLATE)
+    assert pending_components("shop") == []
+
+    projects.add_component_to_config("shop", {**PLATE, "width": 2})
+    assert pending_components("shop") == [{**PLATE, "width": 2}]
+
+
+def test_pending_components_ignore_non_canonical_config_keys(project: Path) -> None:
+    """Test a hand-edited entry isn't pending once rendered as gf.load records it."""
+    from gridfinity_invoke.components import parse_component
+
+    edited = {**PLATE, "name": "edited", "formats": ["stl"], "note": "by hand"}
+    projects.add_component_to_config("shop", edited)
+    (project / "edited.stl").write_bytes(b"solid edited")
+    record_component("shop", PLATE)
+    record_component("shop", parse_component(edited).to_dict())
+
+    assert pending_components("shop") == []
+
+
+def test_deferred_components_render_with_gf_render(
+    project: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test --defer only records the component and gf.render renders it."""
+    from invoke_collections.gf import bin, render
+
+    record_component("shop", PLATE)
+    with patch("invoke_collections.gf.prompt_with_default", return_value="cup"):
+        bin(MockContext(), length=1, width=1, height=2, project="shop", defer=True)
+
+    cup = {"name": "cup", "type": "bin", "length": 1, "width": 1, "height": 2}
+    assert not (project / "cup.stl").exists()
+    assert pending_components("shop") == [cup]
+
+    render(MockContext(), project="shop", jobs=2)
+
+    assert "Rendered bin: cup" in capsys.readouterr().out
+    assert (project / "cup.stl").exists()
+    assert pending_components("shop") == []
+    assert verify_manifest("shop").missing == []
+
+
+def test_manifest_and_cleanup_do_not_import_cadquery() -> None:
+    """Test gf.verify and gf.gc work without loading the CAD kernel."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, gridfinity_invoke.manifest, gridfinity_invoke.cleanup; "
+            "assert 'cadquery' not in sys.modules",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
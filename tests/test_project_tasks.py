@@ -151,3 +151,71 @@ def test_list_projects_shows_no_projects_when_empty(
 
     captured = capsys.readouterr()
     assert "No projects found" in captured.out
+
+
+def test_list_projects_long_sort_filter_and_json(
+    temp_project_dir: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test list-projects --long, --sort, --filter and --json options."""
+    from invoke_collections.gf import list_projects
+
+    projects.save_project_config(
+        "kitchen-big", {"name": "kitchen-big", "components": [{}, {}, {}]}
+    )
+    projects.save_project_config(
+        "kitchen-small", {"name": "kitchen-small", "components": []}
+    )
+    projects.save_project_config("garage", {"name": "garage", "components": [{}]})
+    projects.set_active_project("garage")
+    ctx = MockContext()
+
+    list_projects(ctx, long=True, sort="components")
+    lines = [
+        line for line in capsys.readouterr().out.splitlines() if "component" in line
+    ]
+    assert [line.split()[0] for line in lines] == ["kitchen-big", "*", "kitchen-small"]
+    assert "3 component(s)" in lines[0]
+    assert lines[1].endswith("(active)")
+
+    list_projects(ctx, filter="kitchen-*", json=True)
+    listed = json.loads(capsys.readouterr().out)
+    assert [(p["name"], p["components"], p["active"]) for p in listed] == [
+        ("kitchen-big", 3, False),
+        ("kitchen-small", 0, False),
+    ]
+
+
+def test_list_projects_rejects_unknown_sort_key(temp_project_dir: Path) -> None:
+    """Test list-projects exits with an error for an unknown --sort key."""
+    from invoke_collections.gf import list_projects
+
+    with pytest.raises(SystemExit) as exc_info:
+        list_projects(MockContext(), sort="colour")
+
+    assert exc_info.value.code == 1
+
+
+def test_load_changed_regenerates_only_journaled_components(
+    temp_project_dir: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test load --changed skips components unchanged since the last load."""
+    from invoke_collections.gf import load
+
+    projects.save_project_config("shop", {"name": "shop", "components": []})
+    bin_component = {"name": "cup", "type": "bin", "length": 1, "width": 1, "height": 2}
+    projects.add_component_to_config("shop", bin_component)
+    ctx = MockContext()
+
+    load(ctx, project="shop", changed=True)
+    assert "Generating bin: cup" in capsys.readouterr().out
+    assert projects.changed_components("shop") == set()
+
+    projects.add_component_to_config(
+        "shop", {"name": "plate", "type": "baseplate", "length": 1, "width": 1}
+    )
+    load(ctx, project="shop", changed=True)
+
+    output = capsys.readouterr().out
+    assert "Regenerating 1 component(s)" in output
+    assert "Generating baseplate: plate" in output
+    assert "cup" not in output
@@ -120,3 +120,163 @@ def test_add_component_to_config_adds_new_and_updates_duplicates(
     bin_component = next(c for c in config["components"] if c["name"] == "bin-1")
     assert bin_component["length"] == 3
     assert bin_component["height"] == 4
+
+
+def test_project_index_tracks_saved_configs(temp_project_dir: Path) -> None:
+    """Test saving configs and journal changes keep projects/.index up to date."""
+    projects.save_project_config("alpha", {"name": "alpha", "components": []})
+
+    index = json.loads((temp_project_dir / "projects" / ".index").read_text())
+    assert index["projects"]["alpha"]["components"] == 0
+
+    # Journal appends are picked up by their mtime when listing
+    projects.add_component_to_config("alpha", {"name": "bin-1", "type": "bin"})
+    summaries = projects.list_project_summaries()
+    assert [(s.name, s.components) for s in summaries] == [("alpha", 1)]
+    project_dir = temp_project_dir / "projects" / "alpha"
+    assert summaries[0].size == sum(
+        len((project_dir / name).read_bytes())
+        for name in ("config.json", "journal.jsonl")
+    )
+
+
+def test_project_index_catches_hand_edits_and_removals(
+    temp_project_dir: Path,
+) -> None:
+    """Test listing re-reads configs edited by hand and drops deleted projects."""
+    import os
+    import shutil
+
+    projects.save_project_config("alpha", {"name": "alpha", "components": []})
+    projects.save_project_config("beta", {"name": "beta", "components": []})
+
+    config_path = projects.get_project_path("alpha") / "config.json"
+    config_path.write_text(json.dumps({"name": "alpha", "components": [{}, {}]}))
+    os.utime(config_path, ns=(0, 1_000_000_000))
+    shutil.rmtree(projects.get_project_path("beta"))
+
+    # Without config checks only added and removed projects are picked up
+    assert [(s.name, s.components) for s in projects.list_project_summaries(False)] == [
+        ("alpha", 0)
+    ]
+    summaries = projects.list_project_summaries()
+    assert [(s.name, s.components, s.modified) for s in summaries] == [
+        ("alpha", 2, 1.0)
+    ]
+
+
+def test_active_project_precedence(
+    temp_project_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test --project beats GF_PROJECT, which beats the active file."""
+    projects.set_active_project("from-file")
+    assert projects.get_active_project() == "from-file"
+
+    monkeypatch.setenv(projects.PROJECT_ENV_VAR, "from-env")
+    assert projects.get_active_project() == "from-env"
+    assert projects.get_active_project("from-option") == "from-option"
+
+    # The active file is replaced, not rewritten in place
+    assert list(temp_project_dir.iterdir()) == [temp_project_dir / ".gridfinity-active"]
+
+
+def test_component_changes_are_journaled_and_compacted(
+    temp_project_dir: Path,
+) -> None:
+    """Test changes append to the journal and compaction folds them in."""
+    projects.save_project_config("shop", {"name": "shop", "components": []})
+    config_path = projects.get_project_path("shop") / "config.json"
+    snapshot = config_path.read_bytes()
+
+    projects.add_component_to_config("shop", {"name": "a", "length": 1})
+    projects.add_component_to_config("shop", {"name": "b", "length": 1})
+    projects.add_component_to_config("shop", {"name": "a", "length": 2})
+    projects.remove_component_from_config("shop", "b")
+
+    assert config_path.read_bytes() == snapshot
+    assert [e["op"] for e in projects.read_journal("shop")] == [
+        "put",
+        "put",
+        "put",
+        "remove",
+    ]
+    assert projects.load_project_config("shop")["components"] == [
+        {"name": "a", "length": 2}
+    ]
+    assert projects.changed_components("shop") == {"a", "b"}
+
+    projects.compact_project("shop")
+
+    assert json.loads(config_path.read_text())["components"] == [
+        {"name": "a", "length": 2}
+    ]
+    assert projects.read_journal("shop") == []
+    assert projects.changed_components("shop") == set()
+
+
+def test_journal_auto_compaction_keeps_changed_set(
+    temp_project_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a large journal is compacted without losing what changed."""
+    monkeypatch.setattr(projects, "JOURNAL_COMPACT_BYTES", 200)
+    projects.save_project_config("shop", {"name": "shop", "components": []})
+
+    for i in range(5):
+        projects.add_component_to_config("shop", {"name": f"bin-{i}"})
+
+    config_path = projects.get_project_path("shop") / "config.json"
+    assert len(json.loads(config_path.read_text())["components"]) >= 3
+    assert len(projects.load_project_config("shop")["components"]) == 5
+    assert projects.changed_components("shop") == {f"bin-{i}" for i in range(5)}
+
+
+def test_journal_ignores_partial_last_line(temp_project_dir: Path) -> None:
+    """Test an append cut short by a crash doesn't break loading."""
+    projects.save_project_config("shop", {"name": "shop", "components": []})
+    projects.add_component_to_config("shop", {"name": "a"})
+    journal_path = projects.get_project_path("shop") / projects.JOURNAL_NAME
+    with journal_path.open("a") as f:
+        f.write('{"op": "put", "comp')
+
+    assert projects.load_project_config("shop")["components"] == [{"name": "a"}]
+
+    # The next append cuts off the partial line rather than joining onto it
+    projects.add_component_to_config("shop", {"name": "b"})
+    with journal_path.open("a") as f:
+        f.write('not json\n{"op": "put"}\n{"op": "remove", "name": 1}\n')
+    projects.remove_component_from_config("shop", "missing")
+
+    assert projects.load_project_config("shop")["components"] == [
+        {"name": "a"},
+        {"name": "b"},
+    ]
+    assert len(projects.read_journal("shop")) == 3
+
+
+def test_journal_appends_during_compaction_are_kept(temp_project_dir: Path) -> None:
+    """Test components added while another session compacts aren't lost."""
+    import threading
+
+    projects.save_project_config("shop", {"name": "shop", "components": []})
+    names = [f"c{i}" for i in range(40)]
+
+    def add(names: list[str]) -> None:
+        for name in names:
+            projects.add_component_to_config("shop", {"name": name})
+
+    threads = [threading.Thread(target=add, args=(names[i::2],)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for _ in range(10):
+        projects.compact_project("shop")
+    for thread in threads:
+        thread.join()
+
+    components = projects.load_project_config("shop")["components"]
+    assert sorted(c["name"] for c in components) == sorted(names)
+
+
+def test_add_component_requires_existing_project(temp_project_dir: Path) -> None:
+    """Test adding a component to a missing project raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        projects.add_component_to_config("missing", {"name": "a"})
@@ -0,0 +1,127 @@
+"""Tests for the HTTP generation service."""
+
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from urllib.parse import urlsplit
+
+import pytest
+
+from gridfinity_invoke.generators import STL_TOLERANCE, render_bin_bytes
+from gridfinity_invoke.service import GenerationServer, GenerationService
+
+CUP = {"type": "bin", "length": 1, "width": 1, "height": 2}
+
+
+@pytest.fixture
+def service() -> Iterator[GenerationService]:
+    """A service with one worker, closed after the test."""
+    service = GenerationService(workers=1)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def base_url(service: GenerationService) -> Iterator[str]:
+    """Serve the service on a free local port for the test."""
+    server = GenerationServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _request(url: str, body: object = None) -> tuple[int, dict, bytes]:
+    """Send a GET, or a POST of body as JSON, returning (status, headers, body)."""
+    data = None if body is None else json.dumps(body).encode()
+    request = urllib.request.Request(
+        url, data=data, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_service_queues_renders_and_serves_their_files(base_url: str) -> None:
+    """Test a posted spec is rendered, downloadable and cached afterwards."""
+    status, headers, body = _request(f"{base_url}/jobs", CUP)
+    assert status == 202
+    job = json.loads(body)
+    assert headers["Location"] == f"/jobs/{job['id']}"
+    assert job["spec"]["name"] == "part"
+
+    status, _, body = _request(f"{base_url}/jobs/{job['id']}?wait=120")
+    assert status == 200
+    job = json.loads(body)
+    assert job["status"] == "done"
+    assert [f["name"] for f in job["files"]] == ["part.stl"]
+
+    status, headers, data = _request(f"{base_url}{job['files'][0]['url']}")
+    assert status == 200
+    assert headers["Content-Type"] == "model/stl"
+    assert data == render_bin_bytes(1, 1, 2, "stl", STL_TOLERANCE)
+
+    # The same spec again is answered from the artifact cache
+    status, _, body = _request(f"{base_url}/jobs", {**CUP, "name": "part"})
+    assert status == 200
+    assert json.loads(body)["status"] == "done"
+
+    status, _, body = _request(f"{base_url}/jobs", {**CUP, "length": 0})
+    assert status == 400
+    assert "error" in json.loads(body)
+    assert _request(f"{base_url}/jobs/nonsense")[0] == 404
+
+
+def test_service_coalesces_identical_jobs_and_bounds_its_queue() -> None:
+    """Test identical in-flight specs share a job and a full queue rejects."""
+    service = GenerationService(workers=1, queue_size=1)
+    try:
+        job = service.submit(CUP)
+        assert job is not None
+        assert service.submit({**CUP, "name": "part"}) is job
+        assert service.submit({**CUP, "height": 3}) is None
+
+        assert job.finished.wait(120)
+        assert job.status == "done"
+        assert service.submit({**CUP, "height": 3}) is not None
+    finally:
+        service.close()
+
+
+def test_service_quotes_file_urls(base_url: str) -> None:
+    """Test files whose names need escaping download from their listed URL."""
+    status, _, body = _request(f"{base_url}/jobs", {**CUP, "name": "my cup#1"})
+    job = json.loads(body)
+    status, _, body = _request(f"{base_url}/jobs/{job['id']}?wait=120")
+    url = json.loads(body)["files"][0]["url"]
+    assert url.endswith("/files/my%20cup%231.stl")
+
+    status, headers, data = _request(f"{base_url}{url}")
+    assert status == 200
+    assert headers["Content-Disposition"] == 'attachment; filename="my cup#1.stl"'
+
+
+@pytest.mark.parametrize(
+    ("length", "status"), [(None, 400), ("ten", 400), ("-1", 400), ("65537", 413)]
+)
+def test_service_checks_content_length(
+    base_url: str, length: str | None, status: int
+) -> None:
+    """Test a POST without a usable Content-Length is rejected before reading."""
+    address = urlsplit(base_url)
+    connection = http.client.HTTPConnection(address.hostname, address.port)
+    connection.putrequest("POST", "/jobs")
+    if length is not None:
+        connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == status
+    assert "error" in json.loads(response.read())
+    connection.close()
@@ -0,0 +1,58 @@
+"""Tests for the interactive gf shell."""
+
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from gridfinity_invoke import brep_cache, generators
+
+
+def test_shell_completes_task_names_and_options() -> None:
+    """Test tab completion of task names, options and help topics."""
+    from invoke_collections.gf import gf
+    from invoke_collections.shell import GfShell
+
+    shell = GfShell(gf)
+
+    assert shell.completenames("drawer") == ["drawer-fit"]
+    assert "shell" not in shell.completenames("")
+    assert shell.completedefault("--t", "bin --t", 4, 7) == ["--tolerance="]
+    assert shell.completedefault("--de", "gf.bin --de", 7, 11) == ["--defer"]
+    assert shell.complete_help("list", "help list", 5, 9) == ["list-projects"]
+
+
+def test_shell_runs_tasks_in_one_process_with_solids_in_memory(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test repeated commands reuse the solid and its mesh from memory."""
+    from invoke_collections.gf import gf
+    from invoke_collections.shell import GfShell
+
+    output = tmp_path / "cup.stl"
+    command = f"bin --length=1 --width=1 --height=2 --output={output}"
+    commands = "\n".join(
+        [
+            command,
+            command,
+            f"{command} --tolerance=0.01",
+            "gf.nonsense",
+            "bin --length=0 --width=1 --height=1",
+            "exit",
+        ]
+    )
+    shell = GfShell(gf, stdin=io.StringIO(commands + "\n"))
+    shell.use_rawinput = False
+
+    with patch.object(generators, "_mesh", wraps=generators._mesh) as mesh:
+        shell.cmdloop()
+
+    # Meshed once at each tolerance; the repeat reused the first mesh
+    assert mesh.call_count == 2
+    assert output.exists()
+    out = capsys.readouterr().out
+    assert "Unknown task 'nonsense'" in out
+    assert "All dimensions must be positive" in out
+    assert brep_cache.MEMORY_CACHE_SIZE == 0
+    assert not brep_cache._memory_cache
@@ -0,0 +1,125 @@
+"""Tests for watch mode."""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from gridfinity_invoke import config, projects
+from gridfinity_invoke.components import parse_component
+from gridfinity_invoke.manifest import load_manifest
+from gridfinity_invoke.outputs import component_outputs
+from gridfinity_invoke.watch import FileWatcher, diff_components, watch_project
+from gridfinity_invoke.workspace import Workspace, use_workspace
+
+CUP = {"name": "cup", "type": "bin", "length": 1, "width": 1, "height": 2}
+PLATE = {"name": "plate", "type": "baseplate", "length": 1, "width": 1}
+DRAWER = {
+    "name": "drawer",
+    "type": "drawer-fit",
+    "width_mm": 200.0,
+    "depth_mm": 150.0,
+    "units_width": 4,
+    "units_depth": 3,
+    "split_count": 1,
+}
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 60) -> None:
+    """Wait for a condition, failing the test if it doesn't become true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.05)
+
+
+def test_diff_finds_added_changed_and_removed_components() -> None:
+    """Test only added or changed components are re-rendered."""
+    old = [parse_component(c) for c in (CUP, PLATE, DRAWER)]
+    new = [
+        parse_component({**CUP, "height": 3}),
+        parse_component(DRAWER),
+        parse_component({**PLATE, "name": "plate-2"}),
+    ]
+
+    changed, removed = diff_components(old, new)
+    assert [c.name for c in changed] == ["cup", "plate-2"]
+    assert removed == ["plate"]
+
+    # A new print bed size changes how drawer-fits are split
+    changed, removed = diff_components(old, old, printer_changed=True)
+    assert [c.name for c in changed] == ["drawer"]
+    assert removed == []
+
+
+@pytest.mark.parametrize("use_inotify", [True, False], ids=["inotify", "polling"])
+def test_file_watcher_sees_writes_and_replacements(
+    tmp_path: Path, use_inotify: bool
+) -> None:
+    """Test edits in place and atomic replacements are both reported."""
+    watched = tmp_path / "config.json"
+    watched.write_text("{}")
+    watcher = FileWatcher([watched], poll_interval=0.01, use_inotify=use_inotify)
+    try:
+        assert not watcher.wait(0.05)
+
+        (tmp_path / "other.json").write_text("{}")
+        assert not watcher.wait(0.05)
+
+        watched.write_text('{"a": 1}')
+        assert watcher.wait(1)
+        while watcher.wait(0.05):
+            pass
+
+        replacement = tmp_path / "config.json.tmp"
+        replacement.write_text('{"a": 2, "b": 3}')
+        replacement.replace(watched)
+        assert watcher.wait(1)
+    finally:
+        watcher.close()
+
+
+def test_watch_renders_only_changed_components(tmp_path: Path) -> None:
+    """Test a running watch re-renders what changed and records it."""
+    workspace = Workspace(tmp_path)
+    config.save_printer_config(
+        {"print_bed_width_mm": 256, "print_bed_depth_mm": 256}, workspace
+    )
+    projects.save_project_config(
+        "shop", {"name": "shop", "components": [CUP]}, workspace
+    )
+    project_path = projects.get_project_path("shop", workspace)
+    messages: list[str] = []
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch_project,
+        args=("shop", lambda message, error: messages.append(message), stop),
+        kwargs={"workspace": workspace},
+    )
+    thread.start()
+    try:
+        _wait_for(lambda: any(m.startswith("Watching shop") for m in messages))
+
+        # Replace the config by hand, as an editor would
+        config_path = project_path / "config.json"
+        config_path.write_text(json.dumps({"name": "shop", "components": [CUP]}))
+        projects.add_component_to_config("shop", PLATE, workspace)
+        projects.add_component_to_config("shop", DRAWER, workspace)
+        _wait_for(lambda: "Rendered drawer" in messages, timeout=120)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert "Rendered plate" in messages
+    assert (project_path / "plate.stl").exists()
+    with use_workspace(workspace):
+        assert all((project_path / n).exists() for n in component_outputs(DRAWER))
+    assert not (project_path / "cup.stl").exists()
+    assert not any("cup" in m for m in messages)
+    components = {
+        e["component"] for e in load_manifest("shop", workspace)["files"].values()
+    }
+    assert components == {"plate", "drawer"}
@@ -0,0 +1,121 @@
+"""Tests for workspaces independent of the current directory."""
+
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import cadquery as cq
+
+from gridfinity_invoke import config, projects
+from gridfinity_invoke.brep_cache import render_cached
+from gridfinity_invoke.generators import get_max_units
+from gridfinity_invoke.workspace import Workspace, current_workspace, use_workspace
+
+
+def test_workspaces_keep_projects_apart(tmp_path: Path) -> None:
+    """Test two workspaces in one process have separate projects."""
+    first = Workspace(tmp_path / "first")
+    second = Workspace(tmp_path / "second")
+
+    projects.save_project_config("shop", {"name": "shop", "components": []}, first)
+    projects.add_component_to_config("shop", {"name": "cup"}, first)
+    projects.set_active_project("shop", first)
+
+    assert (tmp_path / "first" / "projects" / "shop" / "config.json").exists()
+    assert [s.name for s in projects.list_project_summaries(workspace=first)] == [
+        "shop"
+    ]
+    assert projects.list_project_summaries(workspace=second) == []
+    assert projects.get_active_project(workspace=first) == "shop"
+    assert projects.get_active_project(workspace=second) is None
+
+
+def test_printer_config_is_cached_until_the_file_changes(tmp_path: Path) -> None:
+    """Test .gf-config is only re-read when its mtime or size changes."""
+    workspace = Workspace(tmp_path)
+    config.save_printer_config(
+        {"print_bed_width_mm": 256, "print_bed_depth_mm": 256}, workspace
+    )
+    assert config.get_print_bed_dimensions(workspace) == (256, 256)
+
+    # Same size and mtime: the cached config is used
+    stat = workspace.config_file.stat()
+    workspace.config_file.write_text(
+        json.dumps({"print_bed_width_mm": 300, "print_bed_depth_mm": 300}, indent=2)
+    )
+    os.utime(workspace.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert config.get_print_bed_dimensions(workspace) == (256, 256)
+
+    os.utime(workspace.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert config.get_print_bed_dimensions(workspace) == (300, 300)
+
+
+def test_use_workspace_is_per_thread(tmp_path: Path) -> None:
+    """Test generators see the workspace set in their own thread."""
+    small = Workspace(tmp_path / "small")
+    large = Workspace(tmp_path / "large")
+    config.save_printer_config(
+        {"print_bed_width_mm": 100, "print_bed_depth_mm": 100}, small
+    )
+    config.save_printer_config(
+        {"print_bed_width_mm": 400, "print_bed_depth_mm": 400}, large
+    )
+
+    def max_units(workspace: Workspace) -> tuple[int, int]:
+        with use_workspace(workspace):
+            return get_max_units()
+
+    with ThreadPoolExecutor(2) as pool:
+        assert list(pool.map(max_units, [small, large] * 4)) == [(2, 2), (9, 9)] * 4
+    assert current_workspace() is not small
+
+
+def test_render_cache_lives_in_the_current_workspace(tmp_path: Path) -> None:
+    """Test rendered solids are checkpointed in the workspace's cache."""
+    workspace = Workspace(tmp_path)
+
+    with use_workspace(workspace):
+        render_cached("box", {"size": 1}, lambda: cq.Workplane().box(1, 1, 1))
+
+    assert len(list(workspace.brep_cache_dir.glob("*.brep"))) == 1
+
+
+def test_piece_workers_use_the_callers_workspace(tmp_path: Path) -> None:
+    """Test pieces rendered by spawned workers land in the workspace's cache."""
+    workspace = Workspace(tmp_path / "workspace")
+    script = (
+        "import multiprocessing, sys\n"
+        "from pathlib import Path\n"
+        "from gridfinity_invoke.generators import generate_unique_pieces\n"
+        "from gridfinity_invoke.workspace import Workspace, use_workspace\n"
+        "if __name__ == '__main__':\n"
+        "    multiprocessing.set_start_method('spawn')\n"
+        "    with use_workspace(Workspace(Path(sys.argv[1]))):\n"
+        "        generate_unique_pieces([(1, 1)], [], Path(sys.argv[2]), workers=1)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(workspace.root), str(tmp_path / "out")],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert len(list(workspace.brep_cache_dir.glob("*.brep"))) == 1
+
+
+def test_workspace_does_not_import_cadquery() -> None:
+    """Test resolving the current workspace works without the CAD kernel."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, gridfinity_invoke.workspace as workspace; "
+            "workspace.current_workspace(); "
+            "assert 'cadquery' not in sys.modules",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr